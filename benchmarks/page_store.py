@@ -0,0 +1,102 @@
+"""
+
+Compare loading pages from JSON and from a binary page store.
+
+Usage, from the root of the repository:
+
+    python -m benchmarks.page_store [page_count] [words_per_page]
+
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, List
+
+from letxbe.page_store import PageStore, write_page_store
+from letxbe.type.page import Page
+
+
+def _make_pages(page_count: int, words_per_page: int) -> List[Page]:
+    words_per_line = 10
+    pages = []
+    for page_idx in range(page_count):
+        lines = []
+        for line_idx in range(words_per_page // words_per_line):
+            y = line_idx / (words_per_page // words_per_line + 1)
+            words = [
+                {
+                    "word-caption": f"word{page_idx}_{line_idx}_{word_idx}",
+                    "bbox": {
+                        "x0": word_idx / 11,
+                        "x1": (word_idx + 1) / 11,
+                        "y0": y,
+                        "y1": y,
+                    },
+                    "confidence": 90.0,
+                }
+                for word_idx in range(words_per_line)
+            ]
+            lines.append(
+                {
+                    "line-caption": " ".join(word["word-caption"] for word in words),
+                    "bbox": {"x0": 0, "x1": 1, "y0": y, "y1": y},
+                    "confidence": 90.0,
+                    "words": words,
+                }
+            )
+        pages.append(
+            Page(file_uri=f"page_{page_idx}.png", page_idx=page_idx, line_list=lines)
+        )
+    return pages
+
+
+def _timed(name: str, function: Callable[[], object]) -> None:
+    start = time.perf_counter()
+    function()
+    print(f"{name:<40} {time.perf_counter() - start:8.3f} s")
+
+
+def main(page_count: int = 200, words_per_page: int = 2000) -> None:
+    pages = _make_pages(page_count, words_per_page)
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "pages.json")
+        store_path = os.path.join(directory, "pages.lxb")
+
+        with open(json_path, "w") as file:
+            json.dump([page.dict(by_alias=True) for page in pages], file)
+        write_page_store(store_path, pages)
+        print(f"JSON size:  {os.path.getsize(json_path) / 1e6:8.1f} MB")
+        print(f"Store size: {os.path.getsize(store_path) / 1e6:8.1f} MB")
+
+        def _json_page() -> Page:
+            with open(json_path) as file:
+                return Page(**json.load(file)[page_count // 2])
+
+        def _store_page() -> Page:
+            with PageStore(store_path) as store:
+                return store[page_count // 2]
+
+        def _store_words() -> List[str]:
+            with PageStore(store_path) as store:
+                return store.word_captions(page_count // 2, 100, 110)
+
+        _timed("JSON: one page", _json_page)
+        _timed("store: one page", _store_page)
+        _timed("store: 10 words of one page", _store_words)
+        with open(json_path) as file:
+            _timed(
+                "JSON: all pages", lambda: [Page(**page) for page in json.load(file)]
+            )
+        with PageStore(store_path) as store:
+            _timed("store: all pages", lambda: [store[i] for i in range(len(store))])
+            _timed(
+                "store: all pages as PageArray",
+                lambda: [store.page_array(i) for i in range(len(store))],
+            )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
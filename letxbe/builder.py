@@ -0,0 +1,325 @@
+"""
+
+Build a `Prediction` from columnar model outputs, e.g. NumPy arrays of values and scores.
+
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from letxbe.type.clue import BBoxInPageClue, ClueType, PageClue, WordClue
+from letxbe.type.label import (
+    LabelPrediction,
+    LabelType,
+    Prediction,
+    PredictionResultType,
+    PredictionValueType,
+)
+from letxbe.type.page import BBOX_SCALE, BBox
+from letxbe.utils import ShortUniqueIdGenerator
+
+
+def _values_to_list(key: str, values: npt.ArrayLike) -> list:
+    """Validate a column of values and convert it to a list of `ValueType`.
+
+    Floating NaN values are converted to None.
+
+    Args:
+        key (str): Key of the field, used in error messages.
+        values (ArrayLike): 1-D column of values.
+
+    Returns:
+        list: The values as python objects.
+
+    Raises:
+        ValueError: The column is not 1-D or contains unsupported types.
+    """
+    array = np.asarray(values)
+    if array.ndim != 1:
+        raise ValueError(f"Values of field '{key}' must be a 1-D array.")
+
+    if array.dtype.kind in "biuU":
+        return list(array.tolist())
+
+    if array.dtype.kind == "f":
+        as_list = array.astype(object)
+        as_list[np.isnan(array)] = None
+        return list(as_list.tolist())
+
+    if array.dtype.kind == "O":
+        objects = list(array.tolist())
+        types = {type(value) for value in objects}
+        if not types <= {bool, int, float, str, type(None)}:
+            raise ValueError(f"Values of field '{key}' have unsupported types {types}.")
+        return objects
+
+    raise ValueError(f"Values of field '{key}' have unsupported dtype {array.dtype}.")
+
+
+def _scores_to_list(key: str, scores: npt.ArrayLike, size: int) -> list:
+    """Validate a column of scores and convert it to a list of floats.
+
+    Scores must be between 0 and 100, as in `LabelPrediction.score`. NaN values
+    are converted to None.
+
+    Args:
+        key (str): Key of the field, used in error messages.
+        scores (ArrayLike): 1-D column of scores.
+        size (int): Expected number of scores.
+
+    Returns:
+        list: The scores as python floats or None.
+
+    Raises:
+        ValueError: The column has the wrong shape or a score is out of range.
+    """
+    array = np.asarray(scores, dtype=float)
+    if array.shape != (size,):
+        raise ValueError(f"Scores of field '{key}' must have shape ({size},).")
+
+    missing = np.isnan(array)
+    if np.any((array[~missing] < 0) | (array[~missing] > 100)):
+        raise ValueError(f"Scores of field '{key}' must be between 0 and 100.")
+
+    as_list = array.astype(object)
+    as_list[missing] = None
+    return list(as_list.tolist())
+
+
+def _index_column(
+    key: str, name: str, column: Optional[npt.ArrayLike], size: int
+) -> Optional[List[int]]:
+    """Validate a column of clue indexes and convert it to a list of ints.
+
+    Args:
+        key (str): Key of the field, used in error messages.
+        name (str): Name of the column, used in error messages.
+        column (ArrayLike, optional): 1-D column of integers.
+        size (int): Expected number of indexes.
+
+    Returns:
+        List[int] or None: The indexes, or None if `column` is None.
+
+    Raises:
+        ValueError: The column has the wrong shape or is not made of integers.
+    """
+    if column is None:
+        return None
+
+    array = np.asarray(column)
+    if array.shape != (size,) or (size > 0 and array.dtype.kind not in "iu"):
+        raise ValueError(
+            f"Column '{name}' of field '{key}' must be {size} integers, "
+            f"got shape {array.shape} and dtype {array.dtype}."
+        )
+    return list(array.tolist())
+
+
+def _bbox_column(
+    key: str, column: Optional[npt.ArrayLike], size: int
+) -> Optional[List[BBox]]:
+    """Validate an (N, 4) array of `(x0, y0, x1, y1)` coordinates and convert it to
+    a list of `BBox`.
+
+    Args:
+        key (str): Key of the field, used in error messages.
+        column (ArrayLike, optional): Coordinates following `BBox.to_tuple` order.
+        size (int): Expected number of boxes.
+
+    Returns:
+        List[BBox] or None: The boxes, or None if `column` is None.
+
+    Raises:
+        ValueError: The column has the wrong shape or a coordinate is out of range.
+    """
+    if column is None:
+        return None
+
+    array = np.asarray(column, dtype=float)
+    if array.shape != (size, 4):
+        raise ValueError(
+            f"Column 'clue_bbox' of field '{key}' must have shape ({size}, 4)."
+        )
+
+    if np.any((array < 0) | (array > BBOX_SCALE)):
+        raise ValueError(
+            f"Column 'clue_bbox' of field '{key}' must be between 0 and {BBOX_SCALE}."
+        )
+
+    return [
+        BBox.construct(x0=x0, y0=y0, x1=x1, y1=y1) for x0, y0, x1, y1 in array.tolist()
+    ]
+
+
+class PredictionBuilder:
+    """Build a `Prediction` from columnar model outputs.
+
+    Each field is given as columns (values, scores and optional clue coordinates)
+    that are validated once per column. Labels are then created without running
+    pydantic validation on each of them, and their lids are generated in bulk.
+
+    Example:
+
+        ::
+
+            builder = PredictionBuilder(model_version="v1.0")
+            builder.add_field("first names", np.array(["Bohr", "Einstein"]), np.array([12.0, 99.5]))
+            builder.add_field("date", np.array([1579474800]), np.array([87.0]), multiple=False)
+            prediction = builder.build()
+    """
+
+    def __init__(
+        self,
+        model_version: Optional[str] = None,
+        score: Optional[float] = None,
+        comment: str = "",
+    ):
+        """
+        Args:
+            model_version (str, optional): Version of the model, see `Prediction`.
+            score (float, optional): Overall prediction score (from 0 to 100).
+            comment (str): Comment related to the prediction.
+        """
+        self.__prediction = Prediction(
+            model_version=model_version, score=score, comment=comment
+        )
+        self.__result: Dict[str, PredictionValueType] = {}
+        # lids are unique within the built prediction
+        self.__lids = ShortUniqueIdGenerator()
+
+    def add_field(
+        self,
+        key: str,
+        values: npt.ArrayLike,
+        scores: Optional[npt.ArrayLike] = None,
+        multiple: bool = True,
+        model_version: Optional[str] = None,
+        clue_page_idx: Optional[npt.ArrayLike] = None,
+        clue_line_idx: Optional[npt.ArrayLike] = None,
+        clue_word_idx: Optional[npt.ArrayLike] = None,
+        clue_bbox: Optional[npt.ArrayLike] = None,
+    ) -> "PredictionBuilder":
+        """Add a field to the prediction, one `LabelPrediction` per value.
+
+        Clues are created when `clue_page_idx` is given, one per value, and values
+        with a negative `clue_page_idx` get no clue. The type of clue depends on
+        the given columns: a `WordClue` with line and word indexes, else a
+        `BBoxInPageClue` with boxes, else a `PageClue`.
+
+        Args:
+            key (str): Key of the field in `Prediction.result`.
+            values (ArrayLike): 1-D column of values.
+            scores (ArrayLike, optional): 1-D column of scores between 0 and 100,
+                NaN meaning no score.
+            multiple (bool): If True, the field holds a list of labels, else it must
+                contain a single value stored as a single label.
+            model_version (str, optional): Version of the model used for the field.
+            clue_page_idx (ArrayLike, optional): 1-D column of page indexes.
+            clue_line_idx (ArrayLike, optional): 1-D column of line indexes.
+            clue_word_idx (ArrayLike, optional): 1-D column of word indexes.
+            clue_bbox (ArrayLike, optional): (N, 4) array of `(x0, y0, x1, y1)`.
+
+        Returns:
+            PredictionBuilder: The builder itself, to chain calls.
+
+        Raises:
+            ValueError: A column is not valid or the field already exists.
+        """
+        if key in self.__result:
+            raise ValueError(f"Field '{key}' has already been added.")
+
+        value_list = _values_to_list(key, values)
+        size = len(value_list)
+        if not multiple and size != 1:
+            raise ValueError(f"Field '{key}' is not multiple but has {size} values.")
+
+        score_list = (
+            [None] * size if scores is None else _scores_to_list(key, scores, size)
+        )
+        clue_lists = self._build_clues(
+            key, size, clue_page_idx, clue_line_idx, clue_word_idx, clue_bbox
+        )
+        lids = self.__lids.generate(size)
+
+        labels = [
+            LabelPrediction.construct(
+                label_type=LabelType.PREDICTION,
+                lid=lid,
+                value=value,
+                clues=clues,
+                score=score,
+                model_version=model_version,
+            )
+            for lid, value, clues, score in zip(
+                lids, value_list, clue_lists, score_list
+            )
+        ]
+
+        self.__result[key] = labels if multiple else labels[0]
+        return self
+
+    @staticmethod
+    def _build_clues(
+        key: str,
+        size: int,
+        clue_page_idx: Optional[npt.ArrayLike],
+        clue_line_idx: Optional[npt.ArrayLike],
+        clue_word_idx: Optional[npt.ArrayLike],
+        clue_bbox: Optional[npt.ArrayLike],
+    ) -> List[List[ClueType]]:
+        """Create the list of clues of each value of a field.
+
+        See `PredictionBuilder.add_field` for a description of the arguments.
+
+        Returns:
+            List[List[ClueType]]: For each value, an empty list or a single clue.
+        """
+        page_idx = _index_column(key, "clue_page_idx", clue_page_idx, size)
+        if page_idx is None:
+            if any(c is not None for c in (clue_line_idx, clue_word_idx, clue_bbox)):
+                raise ValueError(f"Clues of field '{key}' require 'clue_page_idx'.")
+            return [[] for _ in range(size)]
+
+        line_idx = _index_column(key, "clue_line_idx", clue_line_idx, size)
+        word_idx = _index_column(key, "clue_word_idx", clue_word_idx, size)
+        if (line_idx is None) != (word_idx is None):
+            raise ValueError(
+                f"Clues of field '{key}' require both 'clue_line_idx' and "
+                "'clue_word_idx', or none of them."
+            )
+        bboxes = _bbox_column(key, clue_bbox, size)
+
+        clue_lists: List[List[ClueType]] = []
+        for i, page in enumerate(page_idx):
+            if page < 0:
+                clue_lists.append([])
+            elif line_idx is not None and word_idx is not None:
+                clue_lists.append(
+                    [
+                        WordClue.construct(
+                            page_idx=page,
+                            line_idx=line_idx[i],
+                            word_idx=word_idx[i],
+                            bbox=None if bboxes is None else bboxes[i],
+                        )
+                    ]
+                )
+            elif bboxes is not None:
+                clue_lists.append(
+                    [BBoxInPageClue.construct(page_idx=page, bbox=bboxes[i])]
+                )
+            else:
+                clue_lists.append([PageClue.construct(page_idx=page)])
+        return clue_lists
+
+    def build(self) -> Prediction:
+        """Create the `Prediction` containing every added field.
+
+        Returns:
+            Prediction: The prediction.
+        """
+        prediction = self.__prediction.copy()
+        prediction.result = PredictionResultType.construct(__root__=dict(self.__result))
+        return prediction
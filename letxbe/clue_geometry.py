@@ -0,0 +1,151 @@
+"""
+
+Fill in the `bbox` of the `WordClue` objects of a result from the document pages.
+
+Clues are collected in one pass over the labels, grouped by page with a single
+sort, and the boxes of each page are gathered from the arrays of its `PageArray` at
+once. Only the pages referenced by clues are converted, so that a `LazyPages` only
+loads these pages.
+
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from letxbe.page_array import PageArray, array_to_bboxes
+from letxbe.result import ResultType, iter_labels
+from letxbe.type.clue import WordClue
+from letxbe.type.lazy_page import LazyPages
+from letxbe.type.page import Page
+
+
+class UnresolvedClue(NamedTuple):
+    """A `WordClue` pointing out of the pages.
+
+    Attributes:
+        path (str): Path of the label of the clue, see `letxbe.result.iter_labels`.
+        clue (WordClue): The clue.
+        reason (str): "page", "line" or "word", the first index out of range.
+    """
+
+    path: str
+    clue: WordClue
+    reason: str
+
+
+class ClueResolution(NamedTuple):
+    """Outcome of `resolve_word_clues`.
+
+    Attributes:
+        resolved (int): Number of clues whose `bbox` has been set.
+        unresolved (List[UnresolvedClue]): Clues with indexes out of range, left
+            unchanged.
+    """
+
+    resolved: int
+    unresolved: List[UnresolvedClue]
+
+
+def _page_positions(
+    pages: Sequence[Union[Page, PageArray]], page_indexes: List[int]
+) -> Dict[int, int]:
+    """Position in `pages` of each `Page.page_idx`, the first page with an index
+    winning.
+
+    The indexes of a `LazyPages` are taken from `LazyPages.page_indexes` when set,
+    e.g. from the directory of a `PageStore`. Otherwise pages are expected at the
+    position of their index, as in a whole document, and the pages are only all
+    read when it is not the case.
+    """
+    if isinstance(pages, LazyPages) and pages.page_indexes is not None:
+        known = pages.page_indexes
+    else:
+        in_range = [index for index in page_indexes if 0 <= index < len(pages)]
+        if in_range and all(pages[index].page_idx == index for index in in_range):
+            return {index: index for index in in_range}
+        known = [page.page_idx for page in pages]
+
+    positions: Dict[int, int] = {}
+    for position, index in enumerate(known):
+        positions.setdefault(index, position)
+    return positions
+
+
+def resolve_word_clues(
+    result: ResultType,
+    pages: Sequence[Union[Page, PageArray]],
+    overwrite: bool = False,
+) -> ClueResolution:
+    """Set, in place, the `bbox` of the `WordClue` objects of a result to the box of
+    the word they point to.
+
+    Example:
+
+        ::
+
+            resolution = resolve_word_clues(target.current.result, pages)
+            for path, clue, reason in resolution.unresolved:
+                logger.warning(f"Clue of '{path}' has no {reason} {clue}")
+
+    Args:
+        result (ResultType): Result of a `Prediction`, `Feedback` or `Current`.
+        pages (Sequence[Page or PageArray]): Pages of the document, e.g. a
+            `LazyPages`. Clues refer to pages by `Page.page_idx`.
+        overwrite (bool): If True, also replace the boxes already set.
+
+    Returns:
+        ClueResolution: Number of resolved clues, and clues out of range.
+    """
+    paths: List[str] = []
+    clues: List[WordClue] = []
+    for path, label in iter_labels(result):
+        for clue in label.clues:
+            if isinstance(clue, WordClue) and (overwrite or clue.bbox is None):
+                paths.append(path)
+                clues.append(clue)
+    if not clues:
+        return ClueResolution(0, [])
+
+    indexes = np.array(
+        [(clue.page_idx, clue.line_idx, clue.word_idx) for clue in clues],
+        dtype=np.intp,
+    )
+    reasons: List[Optional[str]] = [None] * len(clues)
+    resolved = 0
+
+    order = np.argsort(indexes[:, 0], kind="stable")
+    cuts = np.flatnonzero(np.diff(indexes[order, 0])) + 1
+    page_indexes = indexes[order[np.append(0, cuts)], 0].tolist()
+    positions = _page_positions(pages, page_indexes)
+    for page_idx, members in zip(page_indexes, np.split(order, cuts)):
+        position = positions.get(page_idx)
+        if position is None:
+            for member in members.tolist():
+                reasons[member] = "page"
+            continue
+
+        page = pages[position]
+        page_array = page if isinstance(page, PageArray) else PageArray.from_page(page)
+        line_idx, word_idx = indexes[members, 1], indexes[members, 2]
+        valid_line = (line_idx >= 0) & (line_idx < page_array.line_count)
+        safe_line = np.where(valid_line, line_idx, 0)
+        offsets = page_array.line_word_offsets
+        word_count = offsets[safe_line + 1] - offsets[safe_line]
+        valid = valid_line & (word_idx >= 0) & (word_idx < word_count)
+
+        for member, line_ok in zip(members[~valid].tolist(), valid_line[~valid]):
+            reasons[member] = "word" if line_ok else "line"
+
+        rows = offsets[line_idx[valid]] + word_idx[valid]
+        bboxes = array_to_bboxes(page_array.word_bbox[rows])
+        for member, bbox in zip(members[valid].tolist(), bboxes):
+            clues[member].bbox = bbox
+        resolved += len(bboxes)
+
+    unresolved = [
+        UnresolvedClue(paths[member], clues[member], reason)
+        for member, reason in enumerate(reasons)
+        if reason is not None
+    ]
+    return ClueResolution(resolved, unresolved)
@@ -0,0 +1,272 @@
+"""
+
+Vectorized statistics of the OCR confidences of `Word` and `Line` objects, e.g. to
+route documents.
+
+Confidences of all the pages are gathered in a single array with the page of each
+value, so that the statistics of every page and of the whole document are computed
+with a few array operations, without loops over the lines. Percentiles are
+interpolated linearly, as `np.percentile`.
+
+Example:
+
+    ::
+
+        stats = document_confidence(pages)
+        if stats.document.low_share > 0.2:
+            ...
+        worst_page = int(np.nanargmin(stats.mean))
+
+"""
+
+from typing import NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from letxbe.geometry import bbox_centers
+from letxbe.page_array import PageArray, bboxes_to_array
+from letxbe.type.page import BBOX_SCALE, Page
+
+PERCENTILES = (5.0, 25.0, 50.0, 75.0, 95.0)
+LOW_CONFIDENCE = 50.0
+HISTOGRAM_BINS = 10
+MAX_CONFIDENCE = 100.0
+
+PageType = Union[Page, PageArray]
+
+
+class ConfidenceStats(NamedTuple):
+    """Statistics of a set of confidences, NaN where there is none.
+
+    Attributes:
+        size (int): Number of confidences.
+        mean (float): Mean confidence.
+        percentiles (np.ndarray): `(Q,)` confidences at the requested percentiles.
+        low_share (float): Share of confidences below the low threshold.
+        histogram (np.ndarray): `(B,)` number of confidences in each bin, see
+            `histogram_edges`.
+    """
+
+    size: int
+    mean: float
+    percentiles: np.ndarray
+    low_share: float
+    histogram: np.ndarray
+
+
+class DocumentConfidence(NamedTuple):
+    """Statistics of each page of a document, and of the whole document.
+
+    Attributes:
+        size (np.ndarray): `(P,)` number of confidences of each page.
+        mean (np.ndarray): `(P,)` mean confidence of each page.
+        percentiles (np.ndarray): `(P, Q)` percentiles of each page.
+        low_share (np.ndarray): `(P,)` share of low confidences of each page.
+        histogram (np.ndarray): `(P, B)` histogram of each page.
+        document (ConfidenceStats): Statistics of all the pages together.
+    """
+
+    size: np.ndarray
+    mean: np.ndarray
+    percentiles: np.ndarray
+    low_share: np.ndarray
+    histogram: np.ndarray
+    document: ConfidenceStats
+
+
+class RegionHistogram(NamedTuple):
+    """Confidences of the words of a page, on a grid of regions.
+
+    Words belong to the region of their center.
+
+    Attributes:
+        edges (np.ndarray): `(B + 1,)` edges of the confidence bins.
+        counts (np.ndarray): `(rows, columns, B)` number of words of each region in
+            each bin. Summed over the bins, it is the density of words.
+        mean (np.ndarray): `(rows, columns)` mean confidence, NaN if no word.
+        low_share (np.ndarray): `(rows, columns)` share of low confidences.
+    """
+
+    edges: np.ndarray
+    counts: np.ndarray
+    mean: np.ndarray
+    low_share: np.ndarray
+
+
+def histogram_edges(bins: int = HISTOGRAM_BINS) -> np.ndarray:
+    """`(bins + 1,)` edges of bins of equal width from 0 to 100. The last bin
+    includes 100."""
+    return np.linspace(0.0, MAX_CONFIDENCE, bins + 1)
+
+
+def _bin_indexes(confidences: np.ndarray, bins: int) -> np.ndarray:
+    indexes = (confidences * (bins / MAX_CONFIDENCE)).astype(np.intp)
+    clipped: np.ndarray = np.clip(indexes, 0, bins - 1)
+    return clipped
+
+
+def _confidences(page: PageType, level: str) -> np.ndarray:
+    if level not in {"word", "line"}:
+        raise ValueError(f"Level must be 'word' or 'line', got '{level}'.")
+    if isinstance(page, PageArray):
+        return page.word_confidence if level == "word" else page.line_confidence
+    if level == "line":
+        return np.array([line.confidence for line in page.line_list], dtype=float)
+    return np.array(
+        [word.confidence for line in page.line_list for word in line.words],
+        dtype=float,
+    )
+
+
+def _grouped_percentiles(
+    sorted_values: np.ndarray, offsets: np.ndarray, percentiles: Sequence[float]
+) -> np.ndarray:
+    """Percentiles of consecutive groups of sorted values, with linear interpolation.
+
+    Args:
+        sorted_values (np.ndarray): Values, sorted within each group.
+        offsets (np.ndarray): `(G + 1,)` offsets of the groups.
+        percentiles (Sequence[float]): `(Q,)` percentiles, from 0 to 100.
+
+    Returns:
+        np.ndarray: `(G, Q)` percentiles, NaN for empty groups.
+    """
+    counts = np.diff(offsets)
+    ranks = (
+        np.asarray(percentiles, dtype=float)
+        / 100
+        * (np.maximum(counts, 1) - 1)[:, None]
+    )
+    low = np.floor(ranks).astype(np.intp)
+    high = np.ceil(ranks).astype(np.intp)
+    starts = offsets[:-1, None]
+    values = np.append(sorted_values, np.nan)
+    # empty groups point after the values, to NaN
+    empty = (counts == 0)[:, None]
+    low_values = values[np.where(empty, len(sorted_values), starts + low)]
+    high_values = values[np.where(empty, len(sorted_values), starts + high)]
+    result: np.ndarray = low_values + (ranks - low) * (high_values - low_values)
+    return result
+
+
+def confidence_stats(
+    confidences: npt.ArrayLike,
+    percentiles: Sequence[float] = PERCENTILES,
+    low_threshold: float = LOW_CONFIDENCE,
+    bins: int = HISTOGRAM_BINS,
+) -> ConfidenceStats:
+    """Statistics of confidences, from 0 to 100.
+
+    Args:
+        confidences (ArrayLike): Confidences.
+        percentiles (Sequence[float]): Percentiles to compute, from 0 to 100.
+        low_threshold (float): Confidences strictly below are low.
+        bins (int): Number of bins of the histogram.
+    """
+    array = np.sort(np.asarray(confidences, dtype=float).ravel())
+    count = len(array)
+    (quantiles,) = _grouped_percentiles(array, np.array([0, count]), percentiles)
+    return ConfidenceStats(
+        size=count,
+        mean=float(array.mean()) if count else np.nan,
+        percentiles=quantiles,
+        low_share=(
+            float(np.count_nonzero(array < low_threshold) / count) if count else np.nan
+        ),
+        histogram=np.bincount(_bin_indexes(array, bins), minlength=bins),
+    )
+
+
+def document_confidence(
+    pages: Sequence[PageType],
+    level: str = "word",
+    percentiles: Sequence[float] = PERCENTILES,
+    low_threshold: float = LOW_CONFIDENCE,
+    bins: int = HISTOGRAM_BINS,
+) -> DocumentConfidence:
+    """Statistics of the confidences of each page, and of the whole document.
+
+    Args:
+        pages (Sequence[Page or PageArray]): Pages of the document, in the order
+            of the rows of the results.
+        level (str): "word" for `Word.confidence`, "line" for `Line.confidence`.
+        percentiles (Sequence[float]): Percentiles to compute, from 0 to 100.
+        low_threshold (float): Confidences strictly below are low.
+        bins (int): Number of bins of the histograms.
+
+    Raises:
+        ValueError: Unknown level.
+    """
+    per_page = [_confidences(page, level) for page in pages]
+    offsets = np.zeros(len(per_page) + 1, dtype=np.intp)
+    np.cumsum([len(values) for values in per_page], out=offsets[1:])
+    values = np.concatenate(per_page) if per_page else np.zeros(0)
+    page_of = np.repeat(np.arange(len(per_page)), np.diff(offsets))
+
+    order = np.lexsort((values, page_of))
+    sorted_values = values[order]
+    counts = np.diff(offsets)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.bincount(page_of, values, minlength=len(per_page)) / counts
+        low_share = (
+            np.bincount(page_of, values < low_threshold, minlength=len(per_page))
+            / counts
+        )
+    histogram = np.zeros((len(per_page), bins), dtype=np.intp)
+    np.add.at(histogram, (page_of, _bin_indexes(values, bins)), 1)
+
+    return DocumentConfidence(
+        size=counts,
+        mean=mean,
+        percentiles=_grouped_percentiles(sorted_values, offsets, percentiles),
+        low_share=low_share,
+        histogram=histogram,
+        document=confidence_stats(values, percentiles, low_threshold, bins),
+    )
+
+
+def region_histogram(
+    page: PageType,
+    grid: Tuple[int, int] = (4, 4),
+    low_threshold: float = LOW_CONFIDENCE,
+    bins: int = HISTOGRAM_BINS,
+) -> RegionHistogram:
+    """Histograms of the confidences of the words of a page, per region.
+
+    Args:
+        page (Page or PageArray): The page.
+        grid (Tuple[int, int]): Number of (rows, columns) of regions, of equal
+            size.
+        low_threshold (float): Confidences strictly below are low.
+        bins (int): Number of bins of the histograms.
+    """
+    rows, columns = grid
+    confidences = _confidences(page, "word")
+    if isinstance(page, PageArray):
+        boxes = page.word_bbox
+    else:
+        boxes = bboxes_to_array(
+            word.bbox for line in page.line_list for word in line.words
+        )
+    centers = bbox_centers(boxes)
+    row = np.clip((centers[:, 1] * rows / BBOX_SCALE).astype(np.intp), 0, rows - 1)
+    column = np.clip(
+        (centers[:, 0] * columns / BBOX_SCALE).astype(np.intp), 0, columns - 1
+    )
+
+    counts = np.zeros((rows, columns, bins), dtype=np.intp)
+    np.add.at(counts, (row, column, _bin_indexes(confidences, bins)), 1)
+    totals = np.zeros((rows, columns))
+    np.add.at(totals, (row, column), confidences)
+    lows = np.zeros((rows, columns))
+    np.add.at(lows, (row, column), confidences < low_threshold)
+
+    density = counts.sum(axis=2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return RegionHistogram(
+            edges=histogram_edges(bins),
+            counts=counts,
+            mean=totals / density,
+            low_share=lows / density,
+        )
@@ -3,7 +3,9 @@ from unittest.mock import Mock, patch
 import pytest
 import requests
 
+from letxbe.fingerprint import FingerprintStore
 from letxbe.main import LXB
+from letxbe.type.page import BBox, Page
 
 
 class MockSession:
@@ -32,6 +34,26 @@ def mock_lxb__mocked_session():
     return lxb
 
 
+@pytest.fixture
+def mock_lxb__fingerprint_store():
+    with patch(
+        "letxbe.main.create_letxbe_session",
+        return_value=MockSession(),
+    ):
+        lxb = LXB(
+            "client_id", "client_secret", fingerprint_store=FingerprintStore(":memory:")
+        )
+    return lxb
+
+
+@pytest.fixture
+def mock_session__post():
+    with patch.object(
+        MockSession, "post", autospec=True, side_effect=MockSession.post
+    ) as mock_post:
+        yield mock_post
+
+
 @pytest.fixture
 def mock_lxb():
     with patch(
@@ -40,3 +62,339 @@ def mock_lxb():
     ):
         lxb = LXB("client_id", "client_secret")
     return lxb
+
+
+@pytest.fixture
+def bbox__with_zeros() -> BBox:
+    return BBox(x0=0, x1=0, y0=0, y1=0)
+
+
+@pytest.fixture
+def form_dict():
+    return {
+        "result": {
+            "address": {
+                "principal": True,
+                "street": "41 rue Beauregard",
+                "zip code": 75002,
+            },
+            "artefacts": ["customers", "orders"],
+            "version": 1.2,
+        }
+    }
+
+
+@pytest.fixture
+def bbox_in_page_clue_dict():
+    return {
+        "value": "exemplaire",
+        "role": None,
+        "page_idx": 0,
+        "bbox": {
+            "x0": 0.7011789679527283,
+            "x1": 0.7779027447104454,
+            "y0": 0.5617986917495728,
+            "y1": 0.573211207985878,
+        },
+    }
+
+
+@pytest.fixture
+def word_clue_dict():
+    return {
+        "value": "exemplaire",
+        "role": None,
+        "page_idx": 0,
+        "line_idx": 1,
+        "word_idx": 2,
+        "bbox": {
+            "x0": 0.7011789679527283,
+            "x1": 0.7779027447104454,
+            "y0": 0.5617986917495728,
+            "y1": 0.573211207985878,
+        },
+    }
+
+
+@pytest.fixture
+def prenom_label_prediction_dict(word_clue_dict):
+    return {
+        "lid": "d66f48a0-980c-43ae-a60d-686a48628191",
+        "value": "Exemplaire",
+        "clues": [word_clue_dict],
+        "score": 100.0,
+        "model_version": None,
+        "children": None,
+        "label_type": "prediction",
+    }
+
+
+@pytest.fixture
+def date_label_prediction_dict(bbox_in_page_clue_dict):
+    return {
+        "lid": "3aeb2502-8bc4-473d-a143-4874f9919c4c",
+        "value": 1651363200000,
+        "clues": [bbox_in_page_clue_dict],
+        "score": None,
+        "model_version": None,
+        "children": None,
+        "label_type": "prediction",
+    }
+
+
+@pytest.fixture
+def prediction_result_dict(prenom_label_prediction_dict, date_label_prediction_dict):
+    return {
+        "prenom": prenom_label_prediction_dict,
+        "date": date_label_prediction_dict,
+        "clients": [
+            {
+                "client_1": {
+                    "lid": "aead458b-07b8-4ded-a53f-b04a55a679e3",
+                    "value": "QWE123",
+                    "clues": [],
+                    "children": None,
+                    "score": 98.1,
+                    "model_version": None,
+                    "label_type": "prediction",
+                },
+                "client_2": {
+                    "lid": "2fe3133e-2745-4b66-82db-c0dd612e5f69",
+                    "value": "QWE125",
+                    "clues": [],
+                    "children": None,
+                    "score": 98.2,
+                    "model_version": None,
+                    "label_type": "prediction",
+                },
+            },
+        ],
+        "externe": {
+            "fournisseurs": {
+                "fournisseur_1": {
+                    "lid": "aead458b-07b8-4ded-a53f-b04a55a679e0",
+                    "value": "F4567",
+                    "clues": [],
+                    "children": None,
+                    "score": 98.3,
+                    "model_version": None,
+                    "label_type": "prediction",
+                },
+            },
+        },
+    }
+
+
+@pytest.fixture
+def prediction_dict(prediction_result_dict):
+    return {
+        "model_version": "v0.0",
+        "score": None,
+        "comment": "",
+        "result": prediction_result_dict,
+    }
+
+
+@pytest.fixture
+def prenom_label_feedback_dict():
+    return {
+        "lid": "3aeb2502-8bc4-473d-a143-4874f9918880",
+        "value": "Exemplaire",
+        "clues": [],
+        "children": None,
+        "source": None,
+        "vote": "Valid",
+        "label_type": "feedback",
+    }
+
+
+@pytest.fixture
+def date_label_feedback_dict():
+    return {
+        "lid": "3aeb2502-8bc4-473d-a143-4874f9918888",
+        "value": 1651363299999,
+        "clues": [],
+        "children": None,
+        "source": None,
+        "vote": "Invalid",
+        "label_type": "feedback",
+    }
+
+
+@pytest.fixture
+def feedback_result_dict(prenom_label_feedback_dict, date_label_feedback_dict):
+    return {
+        "prenom": prenom_label_feedback_dict,
+        "date": date_label_feedback_dict,
+        "clients": [
+            {
+                "lid": "3aeb2502-8bc4-473d-a143-4874f9917780",
+                "value": "QWE000",
+                "clues": [],
+                "children": None,
+                "source": None,
+                "vote": "Invalid",
+                "label_type": "feedback",
+            }
+        ],
+        "externe": {
+            "fournisseurs": {
+                "fournisseur_1": {
+                    "lid": "3aeb2502-8bc4-473d-a143-4874f9917780",
+                    "value": "F4567",
+                    "clues": [],
+                    "children": None,
+                    "source": None,
+                    "vote": "Valid",
+                    "label_type": "feedback",
+                }
+            }
+        },
+    }
+
+
+@pytest.fixture
+def feedback_dict(feedback_result_dict):
+    return {
+        "comment": "",
+        "result": feedback_result_dict,
+    }
+
+
+@pytest.fixture
+def prenom_label_dict():
+    return {
+        "lid": "d66f48a0-980c-43ae-a60d-000a48628191",
+        "value": "Exemplaire",
+        "clues": [],
+        "children": None,
+        "label_type": None,
+    }
+
+
+@pytest.fixture
+def date_label_dict():
+    return {
+        "lid": "d66f48a0-980c-43ae-a60d-000a48628191",
+        "value": "1651363299999",
+        "clues": [],
+        "children": None,
+        "label_type": None,
+    }
+
+
+@pytest.fixture
+def current_result_dict(prenom_label_dict, date_label_dict):
+    return {
+        "prenom": prenom_label_dict,
+        "date": date_label_dict,
+        "clients": [
+            {
+                "client_1": {
+                    "lid": "3aeb2502-8bc4-473d-a143-4567f9917780",
+                    "value": "QWE000",
+                    "clues": [],
+                    "children": None,
+                    "label_type": None,
+                },
+                "client_2": {
+                    "lid": "2fe3133e-2745-4b66-82db-gggg612e5f69",
+                    "value": "QWE125",
+                    "clues": [],
+                    "children": None,
+                    "label_type": None,
+                },
+            }
+        ],
+        "fournisseurs": {
+            "fournisseur_1": {
+                "lid": "3aeb2502-8bc4-473d-a143-4874f9917780",
+                "value": "F4567",
+                "clues": [],
+                "children": None,
+                "label_type": None,
+            }
+        },
+    }
+
+
+@pytest.fixture
+def current_dict(current_result_dict):
+    return {
+        "result": current_result_dict,
+    }
+
+
+@pytest.fixture
+def target_dict(form_dict, prediction_dict, feedback_dict, current_dict):
+    return {
+        "created_at": 123456789,
+        "slug": "dkjsvkdfvdef",
+        "client_env": "test",
+        "form": form_dict,
+        "extension": "pdf",
+        "name": "azerty.pdf",
+        "urn": "WXCVBNVMLKJ",
+        "role": None,
+        "prediction": prediction_dict,
+        "feedback": feedback_dict,
+        "current": current_dict,
+        "parent": None,
+        "status_code": "103",
+        "action_code": "prediction",
+        "exception": None,
+        "artefact": {},
+    }
+
+
+def _word_dict(caption, x0, y0, x1, y1, confidence):
+    return {
+        "word-caption": caption,
+        "bbox": {"x0": x0, "x1": x1, "y0": y0, "y1": y1},
+        "confidence": confidence,
+    }
+
+
+@pytest.fixture
+def page_dict():
+    return {
+        "file_uri": "gs://bucket/azerty/page_0.png",
+        "page_idx": 0,
+        "image_properties": {"size": [1000, 2000], "format": "png", "rotation": 0.0},
+        "line_list": [
+            {
+                "line-caption": "Niels Bohr",
+                "bbox": {"x0": 0.1, "x1": 0.4, "y0": 0.1, "y1": 0.15},
+                "rotation": None,
+                "confidence": 95.0,
+                "words": [
+                    _word_dict("Niels", 0.1, 0.1, 0.22, 0.15, 97.0),
+                    _word_dict("Bohr", 0.25, 0.1, 0.4, 0.15, 93.0),
+                ],
+            },
+            {
+                "line-caption": "born 7 October 1885",
+                "bbox": {"x0": 0.1, "x1": 0.7, "y0": 0.2, "y1": 0.25},
+                "rotation": 1.5,
+                "confidence": 80.0,
+                "words": [
+                    _word_dict("born", 0.1, 0.2, 0.2, 0.25, 90.0),
+                    _word_dict("7", 0.22, 0.2, 0.25, 0.25, 40.0),
+                    _word_dict("October", 0.27, 0.2, 0.5, 0.25, 85.0),
+                    _word_dict("1885", 0.52, 0.2, 0.7, 0.25, 88.5),
+                ],
+            },
+            {
+                "line-caption": "",
+                "bbox": {"x0": 0.0, "x1": 0.0, "y0": 0.9, "y1": 0.9},
+                "rotation": 0.0,
+                "confidence": 0.0,
+                "words": [],
+            },
+        ],
+    }
+
+
+@pytest.fixture
+def page(page_dict):
+    return Page(**page_dict)
@@ -0,0 +1,219 @@
+"""
+
+Structural diff between two `*ResultType` trees, e.g. a new `Prediction` and the
+``Target.prediction`` or ``Target.current`` already stored on the document.
+
+Labels of both trees are matched, in this order:
+
+    - by `lid`,
+    - by value in the same field, see `assert_type_and_value_equality`,
+    - by path for single-value fields.
+
+The diff is computed with dict indexes, in time linear in the number of labels and clues.
+
+"""
+
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from letxbe.result import ResultType, clue_key, iter_labels
+from letxbe.type.base import value_key
+from letxbe.type.clue import ClueType
+from letxbe.type.label import Label
+
+_IGNORED_ATTRIBUTES = {"lid", "value", "clues", "label_type"}
+
+
+class LabelChange(NamedTuple):
+    """Differences between two matched labels.
+
+    Attributes:
+        old_path (str): Path of the label in the old result.
+        new_path (str): Path of the label in the new result.
+        old (Label): Label in the old result.
+        new (Label): Label in the new result.
+        attributes (List[str]): Names of the changed attributes, e.g. "value" or
+            "score". "path" is listed when the label has moved, and with
+            `compare_lids`, "lid" when it has been matched by value or path.
+        added_clues (List[ClueType]): Clues of `new` that are not in `old`.
+        removed_clues (List[ClueType]): Clues of `old` that are not in `new`.
+    """
+
+    old_path: str
+    new_path: str
+    old: Label
+    new: Label
+    attributes: List[str]
+    added_clues: List[ClueType]
+    removed_clues: List[ClueType]
+
+
+class ResultDiff(NamedTuple):
+    """Differences between two result trees. Unchanged labels are not listed.
+
+    Attributes:
+        added (List[Tuple[str, Label]]): Paths and labels only in the new result.
+        removed (List[Tuple[str, Label]]): Paths and labels only in the old result.
+        changed (List[LabelChange]): Matched labels that differ.
+    """
+
+    added: List[Tuple[str, Label]]
+    removed: List[Tuple[str, Label]]
+    changed: List[LabelChange]
+
+    @property
+    def is_empty(self) -> bool:
+        """True if both results hold the same labels."""
+        return not (self.added or self.removed or self.changed)
+
+
+def _field_key(path: str) -> Tuple[str, bool]:
+    """Path of the field holding a label, and whether it is a multiple-value field."""
+    if path.endswith("]"):
+        return path[: path.rfind("[")], True
+    return path, False
+
+
+def _diff_clues(
+    old: List[ClueType], new: List[ClueType]
+) -> Tuple[List[ClueType], List[ClueType]]:
+    """Compare two lists of clues as multisets.
+
+    Returns:
+        Tuple[List[ClueType], List[ClueType]]: Added and removed clues.
+    """
+    old_keys = [clue_key(clue) for clue in old]
+    new_keys = [clue_key(clue) for clue in new]
+    remaining = Counter(old_keys)
+    added = []
+    for key, clue in zip(new_keys, new):
+        if remaining[key] > 0:
+            remaining[key] -= 1
+        else:
+            added.append(clue)
+
+    remaining = Counter(new_keys)
+    removed = []
+    for key, clue in zip(old_keys, old):
+        if remaining[key] > 0:
+            remaining[key] -= 1
+        else:
+            removed.append(clue)
+    return added, removed
+
+
+def _compare(
+    old_path: str, old: Label, new_path: str, new: Label, compare_lids: bool
+) -> Optional[LabelChange]:
+    """Compare two matched labels.
+
+    Returns:
+        LabelChange or None: The changes, None if the labels are equivalent.
+    """
+    attributes = []
+    if old_path != new_path:
+        attributes.append("path")
+    if compare_lids and old.lid != new.lid:
+        attributes.append("lid")
+    if value_key(old.value) != value_key(new.value):
+        attributes.append("value")
+
+    old_dict = old.dict(exclude=_IGNORED_ATTRIBUTES)
+    new_dict = new.dict(exclude=_IGNORED_ATTRIBUTES)
+    # only attributes shared by both label types, e.g. no score in a `Current`
+    for name in old_dict.keys() & new_dict.keys():
+        if old_dict[name] != new_dict[name]:
+            attributes.append(name)
+
+    added_clues, removed_clues = _diff_clues(old.clues, new.clues)
+    if added_clues or removed_clues:
+        attributes.append("clues")
+
+    if not attributes:
+        return None
+    return LabelChange(
+        old_path=old_path,
+        new_path=new_path,
+        old=old,
+        new=new,
+        attributes=sorted(attributes),
+        added_clues=added_clues,
+        removed_clues=removed_clues,
+    )
+
+
+def diff_results(
+    old: ResultType, new: ResultType, compare_lids: bool = False
+) -> ResultDiff:
+    """Compute the labels added, removed and changed from `old` to `new`.
+
+    Example:
+
+        ::
+
+            diff = diff_results(target.prediction.result, new_prediction.result)
+            if not diff.is_empty:
+                lxb.post_prediction(atms_slug, target.slug, new_prediction)
+
+    Args:
+        old (ResultType): Result of the stored `Prediction`, `Current` or `Feedback`.
+        new (ResultType): Result to compare with.
+        compare_lids (bool): If True, matched labels with different lids are
+            changed. By default lids are only used to match labels, since a new
+            prediction of the same values has new lids.
+
+    Returns:
+        ResultDiff: The differences.
+    """
+    old_labels = list(iter_labels(old))
+    new_labels = list(iter_labels(new))
+
+    # index -> index of the matched label in the other tree
+    matches: Dict[int, int] = {}
+    matched_old: Set[int] = set()
+
+    old_by_lid = {label.lid: i for i, (_, label) in enumerate(old_labels)}
+    for j, (_, label) in enumerate(new_labels):
+        i = old_by_lid.get(label.lid)
+        if i is not None and i not in matched_old:
+            matches[j] = i
+            matched_old.add(i)
+
+    old_by_value: Dict[tuple, int] = {}
+    old_by_path: Dict[str, int] = {}
+    for i, (path, label) in enumerate(old_labels):
+        if i in matched_old:
+            continue
+        field, multiple = _field_key(path)
+        old_by_value.setdefault((field, value_key(label.value)), i)
+        if not multiple:
+            old_by_path[path] = i
+
+    for by_value in (True, False):
+        for j, (path, label) in enumerate(new_labels):
+            if j in matches:
+                continue
+            field, multiple = _field_key(path)
+            if by_value:
+                i = old_by_value.get((field, value_key(label.value)))
+            elif not multiple:
+                i = old_by_path.get(path)
+            else:
+                continue
+            if i is not None and i not in matched_old:
+                matches[j] = i
+                matched_old.add(i)
+
+    changed = []
+    for j in range(len(new_labels)):
+        if j not in matches:
+            continue
+        change = _compare(*old_labels[matches[j]], *new_labels[j], compare_lids)
+        if change is not None:
+            changed.append(change)
+
+    return ResultDiff(
+        added=[item for j, item in enumerate(new_labels) if j not in matches],
+        removed=[item for i, item in enumerate(old_labels) if i not in matched_old],
+        changed=changed,
+    )
@@ -0,0 +1,268 @@
+"""
+
+Merge the `Prediction` objects of several models into a single one.
+
+"""
+
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from letxbe.result import clue_key, field_of, join_path
+from letxbe.type.base import value_key
+from letxbe.type.clue import ClueType
+from letxbe.type.label import LabelPrediction, Prediction, PredictionResultType
+
+
+class MergeStrategy(str, Enum):
+    """How the labels of a field are combined in `merge_predictions`.
+
+    Attributes:
+        MAX_SCORE: Keep the label with the highest score. For multiple-value fields,
+            keep the labels of the model with the highest mean score only.
+        WEIGHTED_VOTE: Each model votes for its values with its weight multiplied by
+            the label score. For single-value fields the value with the highest
+            support is kept, for multiple-value fields the values whose support is
+            at least `vote_threshold` of the total weight are kept. The score of a
+            kept value is its share of the total weight, from 0 to 100.
+        UNION: Keep every value of a multiple-value field once, with its highest
+            score. Not supported for single-value fields.
+    """
+
+    MAX_SCORE = "max_score"
+    WEIGHTED_VOTE = "weighted_vote"
+    UNION = "union"
+
+
+# (model index, label, model_version of the label or of its prediction)
+Candidate = Tuple[int, LabelPrediction, Optional[str]]
+
+
+def _score(label: LabelPrediction) -> float:
+    return -1.0 if label.score is None else label.score
+
+
+def _merge_group(group: List[Candidate], score: Optional[float]) -> LabelPrediction:
+    """Merge labels sharing the same value into one.
+
+    The label with the highest score is kept, with the clues of every label and the
+    model versions of every model of the group, joined with ",".
+    """
+    best = max(group, key=lambda candidate: _score(candidate[1]))[1]
+
+    clues: Dict[Tuple[str, str], ClueType] = {}
+    versions: Dict[str, None] = {}
+    for _, label, model_version in group:
+        for clue in label.clues:
+            clues.setdefault(clue_key(clue), clue)
+        if model_version is not None:
+            versions.setdefault(model_version)
+
+    return best.copy(
+        update={
+            "clues": list(clues.values()),
+            "score": score,
+            "model_version": ",".join(versions) or None,
+        }
+    )
+
+
+def _group_by_value(candidates: List[Candidate]) -> Dict[tuple, List[Candidate]]:
+    """Group candidates by value, see `value_key`, in order of first appearance."""
+    groups: Dict[tuple, List[Candidate]] = {}
+    for candidate in candidates:
+        groups.setdefault(value_key(candidate[1].value), []).append(candidate)
+    return groups
+
+
+class _Merger:
+    """Merge nodes of `PredictionResultType` coming from several models."""
+
+    def __init__(
+        self,
+        strategies: Dict[str, MergeStrategy],
+        weights: Sequence[float],
+        model_versions: Sequence[Optional[str]],
+        vote_threshold: float,
+    ):
+        self.strategies = strategies
+        self.weights = weights
+        self.model_versions = model_versions
+        self.vote_threshold = vote_threshold
+
+    def merge_result(
+        self, results: List[Tuple[int, PredictionResultType]], path: Optional[str]
+    ) -> PredictionResultType:
+        children: Dict[str, List[Tuple[int, Any]]] = {}
+        for model_idx, result in results:
+            for key, node in result.__root__.items():
+                children.setdefault(key, []).append((model_idx, node))
+
+        return PredictionResultType.construct(
+            __root__={
+                key: self.merge_node(nodes, join_path(path, key))
+                for key, nodes in children.items()
+            }
+        )
+
+    def merge_node(self, nodes: List[Tuple[int, Any]], path: str) -> Any:
+        """Merge the nodes of several models found at the same path."""
+        if all(isinstance(node, PredictionResultType) for _, node in nodes):
+            return self.merge_result(nodes, path)
+
+        if all(isinstance(node, LabelPrediction) for _, node in nodes):
+            return self.merge_labels(nodes, path, multiple=False)
+
+        if not all(isinstance(node, list) for _, node in nodes):
+            raise ValueError(f"Predictions have different structures at '{path}'.")
+
+        elements = [element for _, node in nodes for element in node]
+        if all(isinstance(element, LabelPrediction) for element in elements):
+            return self.merge_labels(nodes, path, multiple=True)
+
+        # tables, merged row by row
+        rows: List[Any] = []
+        for index in range(max(len(node) for _, node in nodes)):
+            row_nodes = [
+                (model_idx, node[index])
+                for model_idx, node in nodes
+                if index < len(node)
+            ]
+            rows.append(self.merge_node(row_nodes, f"{path}[{index}]"))
+        return rows
+
+    def merge_labels(
+        self, nodes: List[Tuple[int, Any]], path: str, multiple: bool
+    ) -> Any:
+        """Merge the labels of a single-value or multiple-value field."""
+        candidates: List[Candidate] = []
+        for model_idx, node in nodes:
+            for label in node if multiple else [node]:
+                candidates.append(
+                    (
+                        model_idx,
+                        label,
+                        label.model_version or self.model_versions[model_idx],
+                    )
+                )
+
+        default = MergeStrategy.UNION if multiple else MergeStrategy.MAX_SCORE
+        strategy = self.strategies.get(field_of(path), default)
+        groups = _group_by_value(candidates)
+
+        if strategy == MergeStrategy.MAX_SCORE:
+            if not multiple:
+                best = max(candidates, key=lambda candidate: _score(candidate[1]))[1]
+                return _merge_group(groups[value_key(best.value)], best.score)
+
+            # keep the values of the model with the highest mean score
+            score_sums = [0.0] * len(self.weights)
+            counts = [0] * len(self.weights)
+            for model_idx, label, _ in candidates:
+                score_sums[model_idx] += _score(label)
+                counts[model_idx] += 1
+            best_model = max(
+                (model_idx for model_idx, _ in nodes),
+                key=lambda idx: score_sums[idx] / counts[idx] if counts[idx] else -1.0,
+            )
+            # labels of a single model, its repeated values merged into one
+            best_groups = _group_by_value(
+                [candidate for candidate in candidates if candidate[0] == best_model]
+            )
+            return [
+                _merge_group(group, max(group, key=lambda c: _score(c[1]))[1].score)
+                for group in best_groups.values()
+            ]
+
+        if strategy == MergeStrategy.UNION:
+            if not multiple:
+                raise ValueError(f"UNION is not supported for single value '{path}'.")
+            return [
+                _merge_group(group, max(group, key=lambda c: _score(c[1]))[1].score)
+                for group in groups.values()
+            ]
+
+        # WEIGHTED_VOTE: a model votes once per value, with its best score
+        total_weight = sum(self.weights[model_idx] for model_idx, _ in nodes)
+        vote_scores: Dict[tuple, float] = {}
+        for key, group in groups.items():
+            votes: Dict[int, float] = {}
+            for model_idx, label, _ in group:
+                vote = 1.0 if label.score is None else label.score / 100
+                votes[model_idx] = max(vote, votes.get(model_idx, 0.0))
+            support = sum(self.weights[idx] * vote for idx, vote in votes.items())
+            vote_scores[key] = 100 * support / total_weight if total_weight > 0 else 0.0
+
+        if not multiple:
+            winner = max(vote_scores, key=vote_scores.__getitem__)
+            return _merge_group(groups[winner], vote_scores[winner])
+
+        return [
+            _merge_group(group, vote_scores[key])
+            for key, group in groups.items()
+            if vote_scores[key] >= 100 * self.vote_threshold
+        ]
+
+
+def merge_predictions(
+    predictions: Sequence[Prediction],
+    strategies: Optional[Dict[str, MergeStrategy]] = None,
+    weights: Optional[Sequence[float]] = None,
+    vote_threshold: float = 0.5,
+    comment: str = "",
+) -> Prediction:
+    """Merge the predictions of several models on the same document.
+
+    Fields are merged according to `strategies`, by default `MergeStrategy.MAX_SCORE`
+    for single-value fields and `MergeStrategy.UNION` for multiple-value fields.
+    Labels with the same value (see `assert_type_and_value_equality`) are merged
+    into one, so that a multiple-value field holds a single label per value. Their
+    clues are merged, and the `model_version` of the merged label lists the versions
+    of the models that predicted the value.
+
+    Nested results are merged key by key, and tables row by row. Values are grouped
+    with dict indexes, so the merge is linear in the number of labels.
+
+    Args:
+        predictions (Sequence[Prediction]): Predictions to merge.
+        strategies (Dict[str, MergeStrategy], optional): Strategy per field, where
+            fields are label paths without list indexes, see `letxbe.result.field_of`.
+        weights (Sequence[float], optional): Weight of each prediction, used by
+            `MergeStrategy.WEIGHTED_VOTE`. 1 for every prediction by default.
+        vote_threshold (float): Share of the total weight a value needs to be kept
+            in a multiple-value field with `MergeStrategy.WEIGHTED_VOTE`.
+        comment (str): Comment of the merged prediction.
+
+    Returns:
+        Prediction: The merged prediction, whose `model_version` lists the versions
+        of the merged predictions.
+
+    Raises:
+        ValueError: Predictions have different structures, or a strategy is not
+            supported by a field.
+    """
+    if weights is None:
+        weights = [1.0] * len(predictions)
+    if len(weights) != len(predictions):
+        raise ValueError("There must be one weight per prediction.")
+
+    model_versions = [prediction.model_version for prediction in predictions]
+    merger = _Merger(
+        {key: MergeStrategy(value) for key, value in (strategies or {}).items()},
+        weights,
+        model_versions,
+        vote_threshold,
+    )
+    result = merger.merge_result(
+        [
+            (model_idx, prediction.result)
+            for model_idx, prediction in enumerate(predictions)
+        ],
+        None,
+    )
+
+    versions = dict.fromkeys(version for version in model_versions if version)
+    return Prediction(
+        model_version=",".join(versions) or None,
+        comment=comment,
+        result=result,
+    )
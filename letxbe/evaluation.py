@@ -0,0 +1,313 @@
+"""
+
+Evaluate `LabelPrediction.score` against `LabelFeedback.vote` on many `Target` documents.
+
+Labels of ``Target.prediction`` and ``Target.feedback`` are first aligned, document
+per document, into an `EvaluationTable` of arrays. Metrics for every field and every
+threshold are then computed with a few NumPy operations on the whole table.
+
+Alignment rules, for each `LabelFeedback`:
+
+    - it is matched with the `LabelPrediction` sharing its `lid`, else with the
+      prediction sharing its value in the same multiple-value field, else with the
+      prediction at the same path for a single-value field.
+    - a matched prediction is correct if the feedback is `FeedbackVote.VALID` and
+      has the same value, see `assert_type_and_value_equality`.
+    - a feedback that carries a value but does not confirm a prediction (either
+      unmatched or correcting the value) is a value the model missed.
+
+Predictions without feedback are considered unreviewed and left out, unless
+`unreviewed_as_valid` is set.
+
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from letxbe.result import ResultType, field_of, iter_labels
+from letxbe.type.base import value_key
+from letxbe.type.enum import FeedbackVote
+from letxbe.type.label import LabelFeedback, LabelPrediction
+from letxbe.type.target import Target
+
+
+class EvaluationTable(NamedTuple):
+    """Aligned predictions and feedbacks, one row per evaluated value.
+
+    Attributes:
+        fields (List[str]): Field names, see `letxbe.result.field_of`.
+        field_idx (np.ndarray): Index in `fields` of each row.
+        score (np.ndarray): Score of the prediction, NaN if none or if the row is a
+            missed value.
+        predicted (np.ndarray): False if the row is a value missed by the model.
+        correct (np.ndarray): True if the prediction has been validated, always True
+            for missed values.
+    """
+
+    fields: List[str]
+    field_idx: np.ndarray
+    score: np.ndarray
+    predicted: np.ndarray
+    correct: np.ndarray
+
+
+class EvaluationMetrics(NamedTuple):
+    """Counts and metrics per field (rows) and per threshold (columns).
+
+    A prediction is kept at a threshold if its score is greater or equal to the
+    threshold. Predictions without score are always kept.
+
+    Attributes:
+        fields (List[str]): Field names.
+        thresholds (np.ndarray): Sorted thresholds.
+        true_positive (np.ndarray): Kept and correct predictions.
+        false_positive (np.ndarray): Kept and incorrect predictions.
+        false_negative (np.ndarray): Missed values and correct predictions that are
+            not kept.
+        precision (np.ndarray): NaN when nothing is kept.
+        recall (np.ndarray): NaN when there is nothing to find.
+    """
+
+    fields: List[str]
+    thresholds: np.ndarray
+    true_positive: np.ndarray
+    false_positive: np.ndarray
+    false_negative: np.ndarray
+    precision: np.ndarray
+    recall: np.ndarray
+
+
+class CalibrationCurve(NamedTuple):
+    """Accuracy of predictions grouped by score bins.
+
+    Attributes:
+        bin_edges (np.ndarray): `bins + 1` edges between 0 and 100.
+        bin_count (np.ndarray): Number of predictions per bin.
+        mean_score (np.ndarray): Mean score per bin, NaN for empty bins.
+        accuracy (np.ndarray): Share of correct predictions per bin, from 0 to 100,
+            NaN for empty bins.
+        expected_calibration_error (float): Mean of `|accuracy - mean_score|` weighted
+            by `bin_count`.
+    """
+
+    bin_edges: np.ndarray
+    bin_count: np.ndarray
+    mean_score: np.ndarray
+    accuracy: np.ndarray
+    expected_calibration_error: float
+
+
+Row = Tuple[str, float, bool, bool]
+
+
+def _container_of(path: str) -> Optional[str]:
+    """Path of the multiple-value field containing a label, None for single values."""
+    if not path.endswith("]"):
+        return None
+    return path[: path.rfind("[")]
+
+
+def _align(
+    prediction: ResultType,
+    feedback: Optional[ResultType],
+    unreviewed_as_valid: bool,
+) -> List[Row]:
+    """Align the labels of a prediction and a feedback of the same document.
+
+    See the module documentation for the alignment rules.
+
+    Returns:
+        List[Row]: Rows `(field, score, predicted, correct)`.
+    """
+    by_lid: Dict[str, Tuple[str, LabelPrediction]] = {}
+    by_path: Dict[str, Tuple[str, LabelPrediction]] = {}
+    by_value: Dict[tuple, Tuple[str, LabelPrediction]] = {}
+    for path, label in iter_labels(prediction):
+        if not isinstance(label, LabelPrediction):
+            continue
+        by_lid[label.lid] = path, label
+        container = _container_of(path)
+        if container is None:
+            by_path[path] = path, label
+        else:
+            by_value.setdefault((container, value_key(label.value)), (path, label))
+
+    rows: List[Row] = []
+    reviewed: Set[str] = set()
+    if feedback is not None:
+        for path, label in iter_labels(feedback):
+            if not isinstance(label, LabelFeedback):
+                continue
+            container = _container_of(path)
+            match = by_lid.get(label.lid)
+            if match is None:
+                if container is None:
+                    match = by_path.get(path)
+                else:
+                    match = by_value.get((container, value_key(label.value)))
+
+            same_value = False
+            if match is not None and match[1].lid not in reviewed:
+                predicted_path, predicted = match
+                reviewed.add(predicted.lid)
+                same_value = value_key(predicted.value) == value_key(label.value)
+                rows.append(
+                    (
+                        field_of(predicted_path),
+                        np.nan if predicted.score is None else predicted.score,
+                        True,
+                        same_value and label.vote == FeedbackVote.VALID,
+                    )
+                )
+
+            if not same_value and label.value is not None:
+                rows.append((field_of(path), np.nan, False, True))
+
+    if unreviewed_as_valid:
+        for lid, (path, predicted) in by_lid.items():
+            if lid not in reviewed:
+                score = np.nan if predicted.score is None else predicted.score
+                rows.append((field_of(path), score, True, True))
+
+    return rows
+
+
+def build_evaluation_table(
+    targets: Iterable[Target], unreviewed_as_valid: bool = False
+) -> EvaluationTable:
+    """Align predictions and feedbacks of many documents into a single table.
+
+    Args:
+        targets (Iterable[Target]): Documents with a prediction and a feedback.
+        unreviewed_as_valid (bool): If True, predictions without feedback are
+            considered correct, else they are left out.
+
+    Returns:
+        EvaluationTable: The aligned rows of every document.
+    """
+    field_index: Dict[str, int] = {}
+    field_idx: List[int] = []
+    scores: List[float] = []
+    predicted: List[bool] = []
+    correct: List[bool] = []
+
+    for target in targets:
+        feedback = None if target.feedback is None else target.feedback.result
+        for field, score, is_predicted, is_correct in _align(
+            target.prediction.result, feedback, unreviewed_as_valid
+        ):
+            field_idx.append(field_index.setdefault(field, len(field_index)))
+            scores.append(score)
+            predicted.append(is_predicted)
+            correct.append(is_correct)
+
+    return EvaluationTable(
+        fields=list(field_index),
+        field_idx=np.array(field_idx, dtype=np.intp),
+        score=np.array(scores, dtype=float),
+        predicted=np.array(predicted, dtype=bool),
+        correct=np.array(correct, dtype=bool),
+    )
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Element-wise division, NaN where the denominator is 0."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def evaluate(
+    table: EvaluationTable, thresholds: Optional[npt.ArrayLike] = None
+) -> EvaluationMetrics:
+    """Compute precision and recall of every field for a sweep of score thresholds.
+
+    Args:
+        table (EvaluationTable): See `build_evaluation_table`.
+        thresholds (ArrayLike, optional): Score thresholds, [0] by default.
+
+    Returns:
+        EvaluationMetrics: Metrics with shape `(len(table.fields), len(thresholds))`.
+    """
+    sorted_thresholds = np.sort(
+        np.asarray([0.0] if thresholds is None else thresholds, dtype=float)
+    )
+    n_fields = len(table.fields)
+    n_thresholds = len(sorted_thresholds)
+
+    # number of thresholds a prediction passes, predictions without score pass all
+    passed = np.searchsorted(sorted_thresholds, table.score, side="right")
+    passed[np.isnan(table.score)] = n_thresholds
+
+    def _kept_counts(mask: np.ndarray) -> np.ndarray:
+        counts = np.bincount(
+            table.field_idx[mask] * (n_thresholds + 1) + passed[mask],
+            minlength=n_fields * (n_thresholds + 1),
+        ).reshape(n_fields, n_thresholds + 1)
+        # a row passing `p` thresholds is kept for thresholds 0 to p - 1
+        return np.cumsum(counts[:, ::-1], axis=1)[:, ::-1][:, 1:]
+
+    true_positive = _kept_counts(table.predicted & table.correct)
+    false_positive = _kept_counts(table.predicted & ~table.correct)
+
+    correct_per_field = np.bincount(
+        table.field_idx[table.predicted & table.correct], minlength=n_fields
+    )
+    missed_per_field = np.bincount(
+        table.field_idx[~table.predicted], minlength=n_fields
+    )
+    false_negative = (
+        missed_per_field[:, None] + correct_per_field[:, None] - true_positive
+    )
+
+    return EvaluationMetrics(
+        fields=table.fields,
+        thresholds=sorted_thresholds,
+        true_positive=true_positive,
+        false_positive=false_positive,
+        false_negative=false_negative,
+        precision=_ratio(true_positive, true_positive + false_positive),
+        recall=_ratio(true_positive, true_positive + false_negative),
+    )
+
+
+def calibration(
+    table: EvaluationTable, bins: int = 10, field: Optional[str] = None
+) -> CalibrationCurve:
+    """Compare prediction scores with the share of correct predictions.
+
+    Args:
+        table (EvaluationTable): See `build_evaluation_table`.
+        bins (int): Number of equal-width score bins between 0 and 100.
+        field (str, optional): Restrict the curve to a field, all fields by default.
+
+    Returns:
+        CalibrationCurve: The curve.
+    """
+    mask = table.predicted & ~np.isnan(table.score)
+    if field is not None:
+        mask &= table.field_idx == table.fields.index(field)
+
+    scores = table.score[mask]
+    correct = table.correct[mask]
+    bin_edges = np.linspace(0, 100, bins + 1)
+    bin_idx = np.clip(np.searchsorted(bin_edges, scores, side="right") - 1, 0, bins - 1)
+
+    count = np.bincount(bin_idx, minlength=bins)
+    mean_score = _ratio(np.bincount(bin_idx, weights=scores, minlength=bins), count)
+    accuracy = 100 * _ratio(
+        np.bincount(bin_idx, weights=correct, minlength=bins), count
+    )
+
+    non_empty = count > 0
+    gaps = np.abs(accuracy[non_empty] - mean_score[non_empty])
+    ece = float(np.average(gaps, weights=count[non_empty])) if gaps.size else np.nan
+
+    return CalibrationCurve(
+        bin_edges=bin_edges,
+        bin_count=count,
+        mean_score=mean_score,
+        accuracy=accuracy,
+        expected_calibration_error=ece,
+    )
@@ -0,0 +1,210 @@
+"""
+
+Flatten the labels of many `Target` documents into columnar batches, for analytics.
+
+Each row describes a single `Label` of ``Target.prediction``, ``Target.feedback`` or
+``Target.current``. Batches are NumPy structured arrays of at most `batch_size` rows,
+so that memory stays bounded whatever the number of documents. Batches can also be
+converted to Arrow and written to Parquet when `pyarrow` is installed.
+
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from letxbe.result import ResultType, iter_labels
+from letxbe.type.label import LabelFeedback, LabelPrediction
+from letxbe.type.target import Target
+
+EXPORT_DTYPE = np.dtype(
+    [
+        ("slug", object),
+        ("source", object),
+        ("path", object),
+        ("lid", object),
+        ("value", object),
+        ("value_type", object),
+        ("score", np.float64),
+        ("vote", object),
+        ("model_version", object),
+    ]
+)
+"""Columns of an exported batch. `score` is NaN when there is no score, other
+columns are None when the information is not available for the label."""
+
+EXPORT_SOURCES = ("prediction", "feedback", "current")
+
+DEFAULT_BATCH_SIZE = 65536
+
+
+def _rows_of(target: Target, sources: Sequence[str]) -> Iterator[tuple]:
+    """Iterate over the rows describing the labels of a target.
+
+    Args:
+        target (Target): The document.
+        sources (Sequence[str]): Parts of the target to export, see `EXPORT_SOURCES`.
+
+    Yields:
+        tuple: A row following `EXPORT_DTYPE`.
+    """
+    for source in sources:
+        result: ResultType
+        default_model_version = None
+        if source == "prediction":
+            result = target.prediction.result
+            default_model_version = target.prediction.model_version
+        elif source == "feedback":
+            if target.feedback is None:
+                continue
+            result = target.feedback.result
+        elif source == "current":
+            result = target.current.result
+        else:
+            raise ValueError(f"Unknown source '{source}', see EXPORT_SOURCES.")
+
+        for path, label in iter_labels(result):
+            score = np.nan
+            vote = None
+            model_version = None
+            if isinstance(label, LabelPrediction):
+                if label.score is not None:
+                    score = label.score
+                model_version = label.model_version or default_model_version
+            elif isinstance(label, LabelFeedback):
+                vote = label.vote
+
+            value = label.value
+            yield (
+                target.slug,
+                source,
+                path,
+                label.lid,
+                value,
+                None if value is None else type(value).__name__,
+                score,
+                vote,
+                model_version,
+            )
+
+
+def iter_label_batches(
+    targets: Iterable[Target],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    sources: Sequence[str] = EXPORT_SOURCES,
+) -> Iterator[np.ndarray]:
+    """Stream the labels of many documents as columnar batches.
+
+    Documents are consumed one at a time, so `targets` can be a generator reading
+    documents from disk or from the API.
+
+    Args:
+        targets (Iterable[Target]): Documents to export.
+        batch_size (int): Maximum number of rows in a batch.
+        sources (Sequence[str]): Parts of the targets to export, see `EXPORT_SOURCES`.
+
+    Yields:
+        np.ndarray: Structured array with dtype `EXPORT_DTYPE` and at most
+        `batch_size` rows. Only the last batch may be smaller.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive.")
+
+    rows: List[tuple] = []
+    for target in targets:
+        for row in _rows_of(target, sources):
+            rows.append(row)
+            if len(rows) == batch_size:
+                yield np.array(rows, dtype=EXPORT_DTYPE)
+                rows = []
+
+    if rows:
+        yield np.array(rows, dtype=EXPORT_DTYPE)
+
+
+def _import_pyarrow() -> Any:
+    """Import the optional `pyarrow` dependency.
+
+    Raises:
+        ImportError: `pyarrow` is not installed.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as error:
+        raise ImportError(
+            "pyarrow is required for Arrow and Parquet exports: `pip install pyarrow`."
+        ) from error
+    return pyarrow
+
+
+def batch_to_arrow(batch: np.ndarray) -> Any:
+    """Convert a batch yielded by `iter_label_batches` to a `pyarrow.RecordBatch`.
+
+    Values can have different types in a single column, so the `value` column is
+    converted to strings. The original type is kept in `value_type`.
+
+    Args:
+        batch (np.ndarray): Structured array with dtype `EXPORT_DTYPE`.
+
+    Returns:
+        pyarrow.RecordBatch: The batch.
+
+    Raises:
+        ImportError: `pyarrow` is not installed.
+    """
+    pa = _import_pyarrow()
+
+    columns: Dict[str, Any] = {}
+    for name in EXPORT_DTYPE.names or ():
+        if name == "value":
+            columns[name] = pa.array(
+                [None if value is None else str(value) for value in batch[name]],
+                type=pa.string(),
+            )
+        elif name == "score":
+            columns[name] = pa.array(batch[name], type=pa.float64())
+        else:
+            columns[name] = pa.array(batch[name].tolist(), type=pa.string())
+    return pa.RecordBatch.from_pydict(columns)
+
+
+def write_parquet(
+    targets: Iterable[Target],
+    path: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    sources: Sequence[str] = EXPORT_SOURCES,
+) -> int:
+    """Write the labels of many documents to a Parquet file, one batch at a time.
+
+    Args:
+        targets (Iterable[Target]): Documents to export.
+        path (str): Path of the Parquet file.
+        batch_size (int): Maximum number of rows held in memory.
+        sources (Sequence[str]): Parts of the targets to export, see `EXPORT_SOURCES`.
+
+    Returns:
+        int: Number of rows written.
+
+    Raises:
+        ImportError: `pyarrow` is not installed.
+    """
+    pa = _import_pyarrow()
+
+    writer: Optional[Any] = None
+    count = 0
+    try:
+        for batch in iter_label_batches(targets, batch_size, sources):
+            record_batch = batch_to_arrow(batch)
+            if writer is None:
+                writer = pa.parquet.ParquetWriter(path, record_batch.schema)
+            writer.write_batch(record_batch)
+            count += len(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        schema = batch_to_arrow(np.array([], dtype=EXPORT_DTYPE)).schema
+        pa.parquet.write_table(schema.empty_table(), path)
+    return count
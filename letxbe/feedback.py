@@ -0,0 +1,467 @@
+"""
+
+Tools to create `Feedback` objects and to post them efficiently.
+
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from letxbe.main import LXB
+from letxbe.result import join_path
+from letxbe.type.api import FeedbackResponse
+from letxbe.type.base import value_key
+from letxbe.type.enum import FeedbackVote
+from letxbe.type.label import (
+    Current,
+    CurrentResultType,
+    Feedback,
+    FeedbackResultType,
+    Label,
+    LabelFeedback,
+)
+
+
+def _is_value(obj: Any) -> bool:
+    """Whether a corrected value is a leaf value, not a structure."""
+    return not isinstance(obj, (dict, list))
+
+
+def _empty_result() -> FeedbackResultType:
+    """Placeholder row of a list of structures, with nothing to share."""
+    return FeedbackResultType.construct(__root__={})
+
+
+def _is_empty(node: Any) -> bool:
+    """Whether a node of `FeedbackResultType` holds no feedback."""
+    if isinstance(node, FeedbackResultType):
+        return not node.__root__
+    return isinstance(node, list) and not node
+
+
+def _label_feedback(
+    value: Any, vote: FeedbackVote, lid: Optional[str], source: Optional[str]
+) -> LabelFeedback:
+    """Create a `LabelFeedback`, with a generated lid if `lid` is None."""
+    if lid is None:
+        return LabelFeedback(value=value, vote=vote, source=source)
+    return LabelFeedback(lid=lid, value=value, vote=vote, source=source)
+
+
+def _feedback_single(
+    label: Optional[Label],
+    value: Any,
+    confirm_unchanged: bool,
+    source: Optional[str],
+) -> Optional[LabelFeedback]:
+    """Feedback on a single-value field.
+
+    Returns:
+        LabelFeedback or None: None if there is nothing to share.
+    """
+    if label is None:
+        if value is None:
+            return None
+        return _label_feedback(value, FeedbackVote.VALID, None, source)
+
+    if value is None:
+        return _label_feedback(label.value, FeedbackVote.INVALID, label.lid, source)
+
+    if value_key(value) == value_key(label.value):
+        if not confirm_unchanged:
+            return None
+        return _label_feedback(value, FeedbackVote.VALID, label.lid, source)
+
+    return _label_feedback(value, FeedbackVote.INVALID, label.lid, source)
+
+
+def _feedback_multiple(
+    labels: List[Label],
+    values: List[Any],
+    confirm_unchanged: bool,
+    source: Optional[str],
+) -> List[LabelFeedback]:
+    """Feedback on a multiple-value field, whose values are compared with a hash
+    index on `value_key`.
+
+    Returns:
+        List[LabelFeedback]: Confirmed values, then added values, then invalidated
+        values.
+    """
+    labels_by_value: Dict[tuple, Label] = {}
+    for label in labels:
+        labels_by_value.setdefault(value_key(label.value), label)
+
+    kept: Set[tuple] = set()
+    feedbacks = []
+    for value in values:
+        key = value_key(value)
+        if key in kept:
+            continue
+        kept.add(key)
+        known = labels_by_value.get(key)
+        if known is None:
+            feedbacks.append(_label_feedback(value, FeedbackVote.VALID, None, source))
+        elif confirm_unchanged:
+            feedbacks.append(
+                _label_feedback(value, FeedbackVote.VALID, known.lid, source)
+            )
+
+    for key, label in labels_by_value.items():
+        if key not in kept:
+            feedbacks.append(
+                _label_feedback(label.value, FeedbackVote.INVALID, label.lid, source)
+            )
+    return feedbacks
+
+
+def _invalidate(node: Any, source: Optional[str]) -> Any:
+    """Invalidate every label of a `Current` node that has been removed."""
+    if isinstance(node, Label):
+        return _label_feedback(node.value, FeedbackVote.INVALID, node.lid, source)
+    if isinstance(node, list):
+        return [_invalidate(element, source) for element in node]
+    return FeedbackResultType.construct(
+        __root__={
+            key: _invalidate(child, source) for key, child in node.__root__.items()
+        }
+    )
+
+
+def _feedback_node(
+    node: Any, corrected: Any, path: str, confirm_unchanged: bool, source: Optional[str]
+) -> Any:
+    """Compare a node of `Current.result` with its corrected value.
+
+    Args:
+        node: `Label`, list of ones, `CurrentResultType`, list of ones or None if
+            the corrected value is not in `Current`.
+        corrected: Corrected value with the same structure.
+        path (str): Path of the node, used in error messages.
+
+    Returns:
+        A node of `FeedbackResultType`, or None if there is nothing to share.
+
+    Raises:
+        ValueError: `corrected` does not match the structure of `node`.
+    """
+    if isinstance(corrected, dict):
+        if node is not None and not isinstance(node, CurrentResultType):
+            raise ValueError(f"Corrected value at '{path}' should not be a dict.")
+        current_root = {} if node is None else node.__root__
+        return _feedback_result(
+            current_root, corrected, path, confirm_unchanged, source
+        )
+
+    if _is_value(corrected):
+        if isinstance(node, list):
+            return _feedback_node(node, [corrected], path, confirm_unchanged, source)
+        if node is not None and not isinstance(node, Label):
+            raise ValueError(f"Corrected value at '{path}' should be a dict.")
+        return _feedback_single(node, corrected, confirm_unchanged, source)
+
+    # corrected is a list
+    current_list = [] if node is None else node if isinstance(node, list) else [node]
+    elements = corrected or current_list
+    if all(_is_value(element) for element in corrected) and all(
+        isinstance(element, Label) for element in current_list
+    ):
+        feedbacks = _feedback_multiple(
+            current_list, corrected, confirm_unchanged, source
+        )
+        return feedbacks or None
+
+    if not all(
+        isinstance(element, (dict, list, CurrentResultType)) for element in elements
+    ):
+        raise ValueError(f"Corrected value at '{path}' mixes values and structures.")
+
+    rows: List[Any] = []
+    for index, element in enumerate(corrected):
+        current_element = current_list[index] if index < len(current_list) else None
+        row = _feedback_node(
+            current_element, element, f"{path}[{index}]", confirm_unchanged, source
+        )
+        if row is None:
+            row = [] if isinstance(element, list) else _empty_result()
+        rows.append(row)
+    for current_element in current_list[len(corrected) :]:
+        rows.append(_invalidate(current_element, source))
+
+    if all(_is_empty(row) for row in rows):
+        return None
+    return rows
+
+
+def _feedback_result(
+    current_root: Dict[str, Any],
+    corrected: Dict[str, Any],
+    path: Optional[str],
+    confirm_unchanged: bool,
+    source: Optional[str],
+) -> Optional[FeedbackResultType]:
+    """Compare the keys of a `CurrentResultType` with a corrected dict.
+
+    Returns:
+        FeedbackResultType or None: None if there is nothing to share.
+    """
+    result: Dict[str, Any] = {}
+    for key, value in corrected.items():
+        child_path = join_path(path, key)
+        feedback = _feedback_node(
+            current_root.get(key), value, child_path, confirm_unchanged, source
+        )
+        if feedback is not None:
+            result[key] = feedback
+    if not result:
+        return None
+    return FeedbackResultType.construct(__root__=result)
+
+
+def generate_feedback(
+    current: Current,
+    corrected: Dict[str, Any],
+    confirm_unchanged: bool = True,
+    source: Optional[str] = None,
+    comment: str = "",
+) -> Feedback:
+    """Create the `Feedback` turning ``Target.current`` into corrected values.
+
+    `corrected` is a nested dict following the structure of ``Current.result``,
+    where labels are replaced by their values, e.g. the output of a review tool.
+    Keys that are absent from `corrected` are considered not reviewed and get no
+    feedback.
+
+        - single-value fields: an unchanged value is confirmed with a
+          `FeedbackVote.VALID` vote, a changed value is shared with a
+          `FeedbackVote.INVALID` vote, and None invalidates the current value.
+        - multiple-value fields (lists of values): kept values are confirmed, new
+          values are added with a `FeedbackVote.VALID` vote and removed values are
+          invalidated. Values are compared with a hash index, see `value_key`.
+        - tables (lists of dicts): rows are compared by index, and removed rows
+          are invalidated.
+
+    Example:
+
+        ::
+
+            feedback = generate_feedback(target.current, {"date": 1579474800, "first names": ["Bohr"]})
+            lxb.post_feedback(atms_slug, target.slug, feedback)
+
+    Args:
+        current (Current): Current values of the document.
+        corrected (Dict[str, Any]): Corrected values.
+        confirm_unchanged (bool): If False, unchanged values get no feedback.
+        source (str, optional): See `LabelFeedback.source`.
+        comment (str): Comment related to the feedback.
+
+    Returns:
+        Feedback: The feedback.
+
+    Raises:
+        ValueError: `corrected` does not match the structure of ``current.result``.
+    """
+    result = _feedback_result(
+        current.result.__root__, corrected, None, confirm_unchanged, source
+    )
+    return Feedback(
+        comment=comment,
+        result=_empty_result() if result is None else result,
+    )
+
+
+def _merge_nodes(old: Any, new: Any) -> Any:
+    """Merge two nodes of `FeedbackResultType`, `new` winning conflicts.
+
+    Dicts are merged key by key, lists of labels are merged by `lid` and other
+    lists (tables) are merged by index. In any other case, `new` replaces `old`.
+    """
+    if isinstance(old, FeedbackResultType) and isinstance(new, FeedbackResultType):
+        return merge_feedback_results(old, new)
+
+    if not (isinstance(old, list) and isinstance(new, list)):
+        return new
+
+    if any(isinstance(element, Label) for element in old + new):
+        labels_by_lid = {label.lid: label for label in old}
+        labels_by_lid.update((label.lid, label) for label in new)
+        return list(labels_by_lid.values())
+
+    merged = [
+        _merge_nodes(old_element, new_element)
+        for old_element, new_element in zip(old, new)
+    ]
+    longest = old if len(old) > len(new) else new
+    return merged + longest[len(merged) :]
+
+
+def merge_feedback_results(
+    old: FeedbackResultType, new: FeedbackResultType
+) -> FeedbackResultType:
+    """Merge two feedback results on the same document, last writer wins.
+
+    Labels of multiple-value fields are merged by `lid`, so that a value can
+    receive several votes and only the last one is kept.
+
+    Args:
+        old (FeedbackResultType): Previous feedback.
+        new (FeedbackResultType): Later feedback, winning conflicts.
+
+    Returns:
+        FeedbackResultType: The merged result. `old` and `new` are not modified.
+    """
+    merged = dict(old.__root__)
+    for key, node in new.__root__.items():
+        merged[key] = _merge_nodes(merged[key], node) if key in merged else node
+    return FeedbackResultType.construct(__root__=merged)
+
+
+class _PendingFeedback:
+    """Feedbacks waiting to be posted on a document, merged into one."""
+
+    def __init__(self, feedback: Feedback):
+        self.created_at = time.monotonic()
+        self.count = 1
+        self.feedback = feedback.copy(deep=True)
+
+    def merge(self, feedback: Feedback) -> None:
+        """Merge a later feedback, which wins conflicts, and append its comment."""
+        self.count += 1
+        self.feedback.result = merge_feedback_results(
+            self.feedback.result, feedback.copy(deep=True).result
+        )
+        if feedback.comment and feedback.comment not in self.feedback.comment.split(
+            "\n"
+        ):
+            self.feedback.comment = "\n".join(
+                comment
+                for comment in (self.feedback.comment, feedback.comment)
+                if comment
+            )
+
+
+class FeedbackBuffer:
+    """Client-side buffer coalescing the feedbacks posted on the same document.
+
+    Feedbacks added for the same (automatisme, document) are merged with
+    `merge_feedback_results` and posted in a single `LXB.post_feedback` call when:
+
+        - `max_feedbacks` feedbacks are pending on the document,
+        - the oldest pending feedback of a document is older than `max_age` seconds,
+          checked whenever a feedback is added or with `flush_expired`,
+        - `flush` is called, or the buffer is used as a context manager and exits
+          without an exception. When the block raises, nothing is posted and the
+          feedbacks stay pending in the buffer.
+
+    Example:
+
+        ::
+
+            with FeedbackBuffer(lxb, max_feedbacks=20, max_age=5) as buffer:
+                for atms_slug, doc_slug, feedback in reviews:
+                    buffer.add(atms_slug, doc_slug, feedback)
+    """
+
+    def __init__(self, lxb: LXB, max_feedbacks: int = 100, max_age: float = 10.0):
+        """
+        Args:
+            lxb (LXB): Connection used to post the feedbacks.
+            max_feedbacks (int): Number of pending feedbacks on a document that
+                triggers a post.
+            max_age (float): Age in seconds of the oldest pending feedback of a
+                document that triggers a post.
+        """
+        if max_feedbacks <= 0:
+            raise ValueError("max_feedbacks must be positive.")
+
+        self.__lxb = lxb
+        self.__max_feedbacks = max_feedbacks
+        self.__max_age = max_age
+        self.__pending: Dict[Tuple[str, str], _PendingFeedback] = {}
+
+    def __enter__(self) -> "FeedbackBuffer":
+        return self
+
+    def __exit__(self, exc_type: Optional[type], *args: Any) -> None:
+        if exc_type is None:
+            self.flush()
+
+    def __len__(self) -> int:
+        """Number of documents with pending feedbacks."""
+        return len(self.__pending)
+
+    def add(
+        self, automatisme_slug: str, document_slug: str, feedback: Feedback
+    ) -> FeedbackResponse:
+        """Add a feedback to the buffer, and post the pending feedbacks that are due.
+
+        Args:
+            automatisme_slug (str): Slug of the automatisme.
+            document_slug (str): Slug of the document.
+            feedback (Feedback): Contents of the feedback.
+
+        Returns:
+            FeedbackResponse: The labels updated by the posts triggered by this call,
+            if any.
+        """
+        key = (automatisme_slug, document_slug)
+        pending = self.__pending.get(key)
+        if pending is None:
+            self.__pending[key] = _PendingFeedback(feedback)
+        else:
+            pending.merge(feedback)
+
+        updated_labels = self.flush_expired().updated_labels
+        pending = self.__pending.get(key)
+        if pending is not None and pending.count >= self.__max_feedbacks:
+            updated_labels += self._post(key).updated_labels
+        return FeedbackResponse(updated_labels=updated_labels)
+
+    def flush_expired(self) -> FeedbackResponse:
+        """Post the pending feedbacks older than `max_age`.
+
+        Returns:
+            FeedbackResponse: The labels updated by the posts.
+        """
+        now = time.monotonic()
+        expired = [
+            key
+            for key, pending in self.__pending.items()
+            if now - pending.created_at >= self.__max_age
+        ]
+        updated_labels: List[str] = []
+        for key in expired:
+            updated_labels += self._post(key).updated_labels
+        return FeedbackResponse(updated_labels=updated_labels)
+
+    def flush(
+        self,
+        automatisme_slug: Optional[str] = None,
+        document_slug: Optional[str] = None,
+    ) -> FeedbackResponse:
+        """Post the pending feedbacks, of every document by default.
+
+        Args:
+            automatisme_slug (str, optional): Only post on this automatisme.
+            document_slug (str, optional): Only post on this document.
+
+        Returns:
+            FeedbackResponse: The labels updated by the posts.
+        """
+        keys = [
+            key
+            for key in self.__pending
+            if automatisme_slug in (None, key[0]) and document_slug in (None, key[1])
+        ]
+        updated_labels: List[str] = []
+        for key in keys:
+            updated_labels += self._post(key).updated_labels
+        return FeedbackResponse(updated_labels=updated_labels)
+
+    def _post(self, key: Tuple[str, str]) -> FeedbackResponse:
+        """Post the merged feedback of a document and remove it from the buffer."""
+        response = self.__lxb.post_feedback(
+            key[0], key[1], self.__pending[key].feedback
+        )
+        del self.__pending[key]
+        return response
@@ -0,0 +1,134 @@
+"""
+
+Canonical content fingerprints of `Prediction` and `Feedback`, used to avoid posting
+the same content twice on a document.
+
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from typing import Any, Optional, Union
+
+from letxbe.type.label import Feedback, Prediction
+
+VOLATILE_LABEL_KEYS = {"lid"}
+"""Keys of a label that are ignored in fingerprints, as they are generated when
+the label is created."""
+
+
+def _strip_volatile(obj: Any) -> Any:
+    """Copy a `.dict()` representation without the volatile keys of labels."""
+    if isinstance(obj, dict):
+        is_label = "label_type" in obj
+        return {
+            key: _strip_volatile(value)
+            for key, value in obj.items()
+            if not (is_label and key in VOLATILE_LABEL_KEYS)
+        }
+    if isinstance(obj, list):
+        return [_strip_volatile(value) for value in obj]
+    return obj
+
+
+def fingerprint_dict(model_dict: dict) -> str:
+    """Fingerprint the `.dict()` representation of a `Prediction` or a `Feedback`.
+
+    Useful to serialize a model only once when it is also posted.
+
+    Args:
+        model_dict (dict): Output of `Prediction.dict()` or `Feedback.dict()`.
+
+    Returns:
+        str: Hexadecimal SHA-256 digest of the canonical content.
+    """
+    canonical = json.dumps(
+        _strip_volatile(model_dict),
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def fingerprint(model: Union[Prediction, Feedback]) -> str:
+    """Fingerprint the content of a `Prediction` or a `Feedback`.
+
+    Two models share the same fingerprint if they only differ by their labels
+    `lid`, see `VOLATILE_LABEL_KEYS`.
+
+    Args:
+        model (Prediction or Feedback):
+
+    Returns:
+        str: Hexadecimal SHA-256 digest of the canonical content.
+    """
+    return fingerprint_dict(model.dict())
+
+
+class FingerprintStore:
+    """Local persistent store of the last fingerprint posted on each document.
+
+    Fingerprints are stored in a SQLite database, per kind of content
+    ("prediction" or "feedback"), automatisme and document. A store can be shared
+    between threads, its accesses to the database being serialized by a lock.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Path of the SQLite database, created if it does not exist.
+                Use ":memory:" for a store that is not persisted.
+        """
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__lock = threading.Lock()
+        with self.__connection:
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS fingerprint ("
+                "kind TEXT, automatisme_slug TEXT, document_slug TEXT, value TEXT, "
+                "PRIMARY KEY (kind, automatisme_slug, document_slug))"
+            )
+
+    def get(
+        self, kind: str, automatisme_slug: str, document_slug: str
+    ) -> Optional[str]:
+        """Get the last fingerprint posted on a document.
+
+        Args:
+            kind (str): "prediction" or "feedback".
+            automatisme_slug (str): Slug of the automatisme.
+            document_slug (str): Slug of the document.
+
+        Returns:
+            str or None: The fingerprint, None if nothing has been stored.
+        """
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT value FROM fingerprint "
+                "WHERE kind = ? AND automatisme_slug = ? AND document_slug = ?",
+                (kind, automatisme_slug, document_slug),
+            ).fetchone()
+        return None if row is None else str(row[0])
+
+    def set(
+        self, kind: str, automatisme_slug: str, document_slug: str, value: str
+    ) -> None:
+        """Store the last fingerprint posted on a document.
+
+        Args:
+            kind (str): "prediction" or "feedback".
+            automatisme_slug (str): Slug of the automatisme.
+            document_slug (str): Slug of the document.
+            value (str): The fingerprint.
+        """
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO fingerprint VALUES (?, ?, ?, ?)",
+                (kind, automatisme_slug, document_slug, value),
+            )
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        with self.__lock:
+            self.__connection.close()
@@ -0,0 +1,203 @@
+"""
+
+Vectorized versions of the `BBox` comparisons, on `(N, 4)` arrays of boxes.
+
+Boxes are rows (x0, y0, x1, y1), in the order of `BBox.to_tuple`, e.g.
+`PageArray.word_bbox` or the output of `letxbe.page_array.bboxes_to_array`.
+
+Pairwise functions compare every box of `a` with every box of `b` and return
+`(len(a), len(b))` matrices. Boxes can come from several pages: when the page of
+each box is given, boxes on different pages never overlap.
+
+"""
+
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from letxbe.type.page import MIN_BBOX_OVERLAP_PROPORTION
+
+
+def as_boxes(boxes: npt.ArrayLike) -> np.ndarray:
+    """Convert to a `(N, 4)` float array.
+
+    Raises:
+        ValueError: `boxes` does not have the right shape.
+    """
+    array = np.asarray(boxes, dtype=float)
+    if array.size == 0:
+        return array.reshape(0, 4)
+    if array.ndim != 2 or array.shape[1] != 4:
+        raise ValueError(f"Boxes must have shape (N, 4), got {array.shape}.")
+    return array
+
+
+def bbox_widths(boxes: npt.ArrayLike) -> np.ndarray:
+    """`(N,)` widths, see `BBox.width`."""
+    array = as_boxes(boxes)
+    widths: np.ndarray = array[:, 2] - array[:, 0]
+    return widths
+
+
+def bbox_heights(boxes: npt.ArrayLike) -> np.ndarray:
+    """`(N,)` heights, see `BBox.height`."""
+    array = as_boxes(boxes)
+    heights: np.ndarray = array[:, 3] - array[:, 1]
+    return heights
+
+
+def bbox_areas(boxes: npt.ArrayLike) -> np.ndarray:
+    """`(N,)` areas, see `BBox.area`."""
+    areas: np.ndarray = bbox_widths(boxes) * bbox_heights(boxes)
+    return areas
+
+
+def bbox_centers(boxes: npt.ArrayLike) -> np.ndarray:
+    """`(N, 2)` centers (x, y), see `BBox.center`."""
+    array = as_boxes(boxes)
+    return np.column_stack(
+        ((array[:, 0] + array[:, 2]) / 2, (array[:, 1] + array[:, 3]) / 2)
+    )
+
+
+def _same_page(
+    a_page_idx: Optional[npt.ArrayLike], b_page_idx: Optional[npt.ArrayLike]
+) -> Optional[np.ndarray]:
+    """`(len(a), len(b))` mask of the pairs on the same page, None if pages are
+    not given."""
+    if a_page_idx is None and b_page_idx is None:
+        return None
+    if a_page_idx is None or b_page_idx is None:
+        raise ValueError("Pages must be given for both arrays of boxes.")
+    same_page: np.ndarray = np.equal.outer(
+        np.asarray(a_page_idx), np.asarray(b_page_idx)
+    )
+    return same_page
+
+
+def _overlap_matrix(
+    a: np.ndarray,
+    b: np.ndarray,
+    axis: int,
+    threshold: float,
+    same_page: Optional[np.ndarray],
+) -> np.ndarray:
+    """See `x_overlap_matrix`, with `axis` 0 for x and 1 for y."""
+    start, end = axis, axis + 2
+    overlap = np.minimum.outer(a[:, end], b[:, end]) - np.maximum.outer(
+        a[:, start], b[:, start]
+    )
+    min_length = np.minimum.outer(a[:, end] - a[:, start], b[:, end] - b[:, start])
+    overlaps: np.ndarray = overlap > threshold * min_length
+    if same_page is not None:
+        overlaps &= same_page
+    return overlaps
+
+
+def x_overlap_matrix(
+    a: npt.ArrayLike,
+    b: npt.ArrayLike,
+    threshold: float = MIN_BBOX_OVERLAP_PROPORTION,
+    a_page_idx: Optional[npt.ArrayLike] = None,
+    b_page_idx: Optional[npt.ArrayLike] = None,
+) -> np.ndarray:
+    """Pairwise `BBox.x_overlap_with`.
+
+    Args:
+        a (ArrayLike): `(N, 4)` boxes.
+        b (ArrayLike): `(M, 4)` boxes.
+        threshold (float): Minimum overlap, as a share of the smallest width.
+        a_page_idx (ArrayLike, optional): `(N,)` page of each box of `a`.
+        b_page_idx (ArrayLike, optional): `(M,)` page of each box of `b`.
+
+    Returns:
+        np.ndarray: `(N, M)` booleans, True if `a[i]` overlaps `b[j]` along x.
+    """
+    return _overlap_matrix(
+        as_boxes(a), as_boxes(b), 0, threshold, _same_page(a_page_idx, b_page_idx)
+    )
+
+
+def y_overlap_matrix(
+    a: npt.ArrayLike,
+    b: npt.ArrayLike,
+    threshold: float = MIN_BBOX_OVERLAP_PROPORTION,
+    a_page_idx: Optional[npt.ArrayLike] = None,
+    b_page_idx: Optional[npt.ArrayLike] = None,
+) -> np.ndarray:
+    """Pairwise `BBox.y_overlap_with`, see `x_overlap_matrix`.
+
+    Returns:
+        np.ndarray: `(N, M)` booleans, True if `a[i]` overlaps `b[j]` along y.
+    """
+    return _overlap_matrix(
+        as_boxes(a), as_boxes(b), 1, threshold, _same_page(a_page_idx, b_page_idx)
+    )
+
+
+def contain_matrix(
+    a: npt.ArrayLike,
+    b: npt.ArrayLike,
+    a_page_idx: Optional[npt.ArrayLike] = None,
+    b_page_idx: Optional[npt.ArrayLike] = None,
+) -> np.ndarray:
+    """Pairwise `BBox.contain`, see `x_overlap_matrix` for the arguments.
+
+    Returns:
+        np.ndarray: `(N, M)` booleans, True if `a[i]` contains `b[j]`.
+    """
+    a_boxes, b_boxes = as_boxes(a), as_boxes(b)
+    contains: np.ndarray = (
+        np.less_equal.outer(a_boxes[:, 0], b_boxes[:, 0])
+        & np.less_equal.outer(a_boxes[:, 1], b_boxes[:, 1])
+        & np.greater_equal.outer(a_boxes[:, 2], b_boxes[:, 2])
+        & np.greater_equal.outer(a_boxes[:, 3], b_boxes[:, 3])
+    )
+    same_page = _same_page(a_page_idx, b_page_idx)
+    if same_page is not None:
+        contains &= same_page
+    return contains
+
+
+def intersection_matrix(
+    a: npt.ArrayLike,
+    b: npt.ArrayLike,
+    a_page_idx: Optional[npt.ArrayLike] = None,
+    b_page_idx: Optional[npt.ArrayLike] = None,
+) -> np.ndarray:
+    """Pairwise intersection areas, see `x_overlap_matrix` for the arguments.
+
+    Returns:
+        np.ndarray: `(N, M)` areas, 0 for disjoint boxes.
+    """
+    a_boxes, b_boxes = as_boxes(a), as_boxes(b)
+    width = np.minimum.outer(a_boxes[:, 2], b_boxes[:, 2]) - np.maximum.outer(
+        a_boxes[:, 0], b_boxes[:, 0]
+    )
+    height = np.minimum.outer(a_boxes[:, 3], b_boxes[:, 3]) - np.maximum.outer(
+        a_boxes[:, 1], b_boxes[:, 1]
+    )
+    areas: np.ndarray = np.clip(width, 0, None) * np.clip(height, 0, None)
+    same_page = _same_page(a_page_idx, b_page_idx)
+    if same_page is not None:
+        areas[~same_page] = 0
+    return areas
+
+
+def iou_matrix(
+    a: npt.ArrayLike,
+    b: npt.ArrayLike,
+    a_page_idx: Optional[npt.ArrayLike] = None,
+    b_page_idx: Optional[npt.ArrayLike] = None,
+) -> np.ndarray:
+    """Pairwise intersection over union, see `x_overlap_matrix` for the arguments.
+
+    Returns:
+        np.ndarray: `(N, M)` ratios from 0 to 1, 0 when both boxes are empty.
+    """
+    intersection = intersection_matrix(a, b, a_page_idx, b_page_idx)
+    union = np.add.outer(bbox_areas(a), bbox_areas(b)) - intersection
+    with np.errstate(divide="ignore", invalid="ignore"):
+        iou: np.ndarray = np.where(union > 0, intersection / union, 0.0)
+    return iou
@@ -0,0 +1,286 @@
+"""
+
+Attach `WordClue` objects to the values of a `Prediction`, by finding them in the
+words of the document's pages.
+
+Each value is turned into a few textual variants, e.g. `1234.5` into "1234.5" and
+"1234.50", or a date into its usual day-month-year formats. Variants are searched
+as phrases in a `TextIndex`, first exactly, then approximately with the character
+n-grams of the index. Tokens holding digits are only matched exactly, so that
+"1885" never grounds "1886".
+
+Results are cached per variant, so that a value repeated in many labels is only
+searched once.
+
+"""
+
+from datetime import datetime, timezone, tzinfo
+from typing import Collection, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from letxbe.page_array import PageArray
+from letxbe.result import field_of, iter_labels
+from letxbe.text_index import TextIndex, tokenize
+from letxbe.type.base import ValueType
+from letxbe.type.clue import WordClue
+from letxbe.type.label import LabelPrediction, Prediction
+from letxbe.type.page import Page
+
+MONTH_NAMES = (
+    (
+        "january",
+        "february",
+        "march",
+        "april",
+        "may",
+        "june",
+        "july",
+        "august",
+        "september",
+        "october",
+        "november",
+        "december",
+    ),
+    (
+        "janvier",
+        "février",
+        "mars",
+        "avril",
+        "mai",
+        "juin",
+        "juillet",
+        "août",
+        "septembre",
+        "octobre",
+        "novembre",
+        "décembre",
+    ),
+)
+"""Month names used in date variants, per language."""
+
+MAX_TIMESTAMP_SECONDS = 1e11
+"""Larger timestamps of `ValueGrounder.date_fields` are in milliseconds."""
+
+
+class GroundingMatch(NamedTuple):
+    """Words matching a value.
+
+    Attributes:
+        clues (List[WordClue]): Clues of the matching words, with their caption as
+            `value` and their `bbox`.
+        similarity (float): 1 for an exact match, else the mean similarity of the
+            matched tokens, see `TextIndex.similar_tokens`.
+    """
+
+    clues: List[WordClue]
+    similarity: float
+
+
+def date_variants(date: datetime) -> List[str]:
+    """Usual textual forms of a date, e.g. "20/01/2020", "2020-01-20",
+    "20 January 2020" or "January 20, 2020"."""
+    day, month, year = date.day, date.month, date.year
+    variants = [f"{day:02}/{month:02}/{year}", f"{year}-{month:02}-{day:02}"]
+    for names in MONTH_NAMES:
+        name = names[month - 1]
+        variants += [f"{day} {name} {year}", f"{name} {day}, {year}"]
+    return variants
+
+
+def number_variants(number: Union[int, float]) -> List[str]:
+    """Usual textual forms of a number, with 2 decimals and without, with thousands
+    separated by spaces, commas or dots, and with a decimal point or comma, e.g.
+    "1234.50", "1,234.50", "1234,50" or "1.234,50"."""
+    plain = f"{number:.2f}"
+    grouped = f"{number:,.2f}"
+    variants = [
+        str(int(number)) if float(number).is_integer() else repr(float(number)),
+        plain,
+        grouped.replace(",", " "),
+        grouped,
+        plain.replace(".", ","),
+        grouped.replace(",", " ").replace(".", ","),
+        grouped.replace(",", "_").replace(".", ",").replace("_", "."),
+    ]
+    return list(dict.fromkeys(variants))
+
+
+class ValueGrounder:
+    """Find the values of predictions in the words of a document.
+
+    Example:
+
+        ::
+
+            grounder = ValueGrounder(pages, date_fields={"date"})
+            grounder.ground(prediction)
+    """
+
+    def __init__(
+        self,
+        pages: Sequence[Union[Page, PageArray]],
+        min_similarity: float = 0.8,
+        ngram_size: int = 3,
+        date_fields: Collection[str] = (),
+        tz: tzinfo = timezone.utc,
+    ):
+        """
+        Args:
+            pages (Sequence[Page or PageArray]): Pages of the document.
+            min_similarity (float): Minimum similarity of approximate matches, from
+                0 to 1. 1 to only accept exact matches.
+            ngram_size (int): Size of the character n-grams used for approximate
+                matches.
+            date_fields (Collection[str]): Fields, see `letxbe.result.field_of`,
+                whose integer values are timestamps in seconds, or in milliseconds
+                above `MAX_TIMESTAMP_SECONDS`. String values in ISO format are
+                always considered as dates.
+            tz (tzinfo): Time zone of the timestamps.
+        """
+        self.__pages = {
+            page.page_idx: page
+            for page in (
+                page if isinstance(page, PageArray) else PageArray.from_page(page)
+                for page in pages
+            )
+        }
+        self.index = TextIndex.from_pages(list(self.__pages.values()), ngram_size)
+        self.min_similarity = min_similarity
+        self.date_fields = set(date_fields)
+        self.tz = tz
+        self.__cache: Dict[str, Optional[Tuple[int, int, float]]] = {}
+        self.__similar: Dict[str, List[Tuple[str, float]]] = {}
+
+    def variants(self, value: ValueType, field: str = "") -> List[str]:
+        """Textual forms of a value to search in the document.
+
+        Args:
+            value (ValueType): Value of a label.
+            field (str): Field of the label, see `date_fields`.
+
+        Returns:
+            List[str]: The variants, the most specific first. Empty for booleans.
+        """
+        if isinstance(value, bool):
+            return []
+        if isinstance(value, int) and field in self.date_fields:
+            # timestamps beyond year 5138 in seconds are taken as milliseconds
+            seconds = value / 1000 if abs(value) > MAX_TIMESTAMP_SECONDS else value
+            try:
+                return date_variants(datetime.fromtimestamp(seconds, tz=self.tz))
+            except (ValueError, OverflowError, OSError):
+                return number_variants(value)
+        if isinstance(value, (int, float)):
+            return number_variants(value)
+        try:
+            return [value] + date_variants(datetime.fromisoformat(value))
+        except ValueError:
+            return [value]
+
+    def _similar(self, token: str) -> List[Tuple[str, float]]:
+        if token not in self.__similar:
+            if any(char.isdigit() for char in token) or self.min_similarity >= 1:
+                self.__similar[token] = [(token, 1.0)]
+            else:
+                self.__similar[token] = self.index.similar_tokens(
+                    token, self.min_similarity
+                )
+        return self.__similar[token]
+
+    def _match(self, tokens: List[str]) -> Optional[Tuple[int, int, float]]:
+        """Best span of consecutive words of a page matching tokens, approximately.
+
+        Returns:
+            Tuple[int, int, float] or None: `(start, stop, similarity)` of the
+            earliest span with the highest similarity, None if nothing matches.
+        """
+        starts: Optional[np.ndarray] = None
+        total = np.empty(0)
+        for shift, token in enumerate(tokens):
+            rows_list, similarity_list = [], []
+            for similar, similarity in self._similar(token):
+                postings = self.index.postings(similar)
+                rows_list.append(postings)
+                similarity_list.append(np.full(len(postings), similarity))
+            rows = np.concatenate(rows_list) if rows_list else np.empty(0, np.intp)
+            if len(rows) == 0:
+                return None
+            similarities = np.concatenate(similarity_list)
+            order = np.argsort(rows, kind="stable")
+            rows, similarities = rows[order], similarities[order]
+
+            if starts is None:
+                starts, total = rows, similarities
+                continue
+            found = np.searchsorted(rows, starts + shift)
+            found_clipped = np.minimum(found, len(rows) - 1)
+            matched = (found < len(rows)) & (rows[found_clipped] == starts + shift)
+            starts = starts[matched]
+            total = total[matched] + similarities[found_clipped[matched]]
+
+        if starts is None or len(starts) == 0:
+            return None
+        stops = starts + len(tokens)
+        pages = self.index.positions[:, 0]
+        same_page = pages[starts] == pages[stops - 1]
+        if not same_page.any():
+            return None
+        best = int(np.argmax(np.where(same_page, total, -1.0)))
+        return int(starts[best]), int(stops[best]), float(total[best]) / len(tokens)
+
+    def find(self, value: ValueType, field: str = "") -> Optional[GroundingMatch]:
+        """Find the words of the document matching a value.
+
+        Args:
+            value (ValueType): Value of a label.
+            field (str): Field of the label, see `date_fields`.
+
+        Returns:
+            GroundingMatch or None: The best match among the variants of the value,
+            None if no variant is found.
+        """
+        best: Optional[Tuple[int, int, float]] = None
+        for variant in self.variants(value, field):
+            if variant not in self.__cache:
+                tokens = tokenize(variant)
+                self.__cache[variant] = self._match(tokens) if tokens else None
+            match = self.__cache[variant]
+            if match is not None and (best is None or match[2] > best[2]):
+                best = match
+            if best is not None and best[2] >= 1:
+                break
+
+        if best is None:
+            return None
+        start, stop, similarity = best
+        clues = self.index.span_clues(start, stop)
+        for clue in clues:
+            page = self.__pages[clue.page_idx]
+            clue.value = page.word_captions[
+                page.word_position(clue.line_idx, clue.word_idx)
+            ]
+        return GroundingMatch(clues, similarity)
+
+    def ground(self, prediction: Prediction, overwrite: bool = False) -> int:
+        """Attach clues, in place, to the labels of a prediction.
+
+        Args:
+            prediction (Prediction): Prediction on the document.
+            overwrite (bool): If True, replace the clues of labels that already have
+                some, else leave these labels unchanged.
+
+        Returns:
+            int: Number of labels that have been given clues.
+        """
+        grounded = 0
+        for path, label in iter_labels(prediction.result):
+            if not isinstance(label, LabelPrediction) or label.value is None:
+                continue
+            if label.clues and not overwrite:
+                continue
+            match = self.find(label.value, field_of(path))
+            if match is not None:
+                label.clues = list(match.clues)
+                grounded += 1
+        return grounded
@@ -0,0 +1,267 @@
+"""
+
+Rebuild the `Line` objects of a page, in reading order, from its `Word` objects.
+
+Words are grouped into lines with a sweep over their vertical centers: a word joins
+an open line if they overlap vertically, with the semantics of `BBox.y_overlap_with`.
+Lines are then split where the horizontal gap between two words is larger than
+`max_word_gap` times the height of the line, which separates the columns of a page.
+
+Lines are put in reading order with a recursive XY-cut: the lines are split into
+columns where their horizontal projections leave a gap, else into bands where their
+vertical projections leave one, keeping together consecutive bands with the same
+columns. Lines that cannot be split are read from top to bottom.
+
+When the image is rotated, see `ImageProperties.rotation`, taken in degrees
+counter-clockwise as displayed, words are grouped and ordered in the frame of the
+text, while the boxes of the lines are computed from the boxes of their words.
+
+Grouping sorts the words once and compares each word with the few lines still
+open, and ordering sorts the lines at each cut, so that the cost is O(n log n) per
+page for usual layouts.
+
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from letxbe.page_array import array_to_bboxes, bboxes_to_array
+from letxbe.transform import deskew_boxes
+from letxbe.type.page import (
+    MIN_BBOX_OVERLAP_PROPORTION,
+    ImageProperties,
+    Line,
+    Page,
+    Word,
+)
+
+
+def _text_frame_boxes(
+    boxes: np.ndarray, image_properties: Optional[ImageProperties]
+) -> np.ndarray:
+    """Boxes of the words in the frame of the text, i.e. with the rotation of the
+    image undone, see `letxbe.transform.deskew_boxes`.
+    """
+    if image_properties is None or not image_properties.rotation:
+        return boxes
+    return deskew_boxes(boxes, image_properties, clip=False)
+
+
+def _group_rows(boxes: np.ndarray, threshold: float) -> List[List[int]]:
+    """Group boxes whose vertical ranges overlap, sweeping them by vertical center.
+
+    A row stays open while its bottom is less than its mean height above the center
+    of the current box, so that one tall box does not keep every row open.
+
+    Returns:
+        List[List[int]]: Indexes of the boxes of each row.
+    """
+    heights = boxes[:, 3] - boxes[:, 1]
+    centers = (boxes[:, 1] + boxes[:, 3]) / 2
+
+    rows: List[List[int]] = []
+    # open rows: (index in rows, y0, y1, sum of heights)
+    open_rows: List[Tuple[int, float, float, float]] = []
+    for index in np.argsort(centers, kind="stable").tolist():
+        y0, y1, height = boxes[index, 1], boxes[index, 3], heights[index]
+        center = centers[index]
+        # rows that end far above the word cannot be joined by the next words
+        open_rows = [
+            row for row in open_rows if row[2] + row[3] / len(rows[row[0]]) >= center
+        ]
+
+        best, best_overlap = -1, 0.0
+        for position, (row_idx, row_y0, row_y1, height_sum) in enumerate(open_rows):
+            row_height = height_sum / len(rows[row_idx])
+            overlap = min(y1, row_y1) - max(y0, row_y0)
+            if overlap > threshold * min(height, row_height) and overlap > best_overlap:
+                best, best_overlap = position, overlap
+
+        if best < 0:
+            open_rows.append((len(rows), y0, y1, height))
+            rows.append([index])
+        else:
+            row_idx, row_y0, row_y1, height_sum = open_rows[best]
+            rows[row_idx].append(index)
+            open_rows[best] = (
+                row_idx,
+                min(row_y0, y0),
+                max(row_y1, y1),
+                height_sum + height,
+            )
+    return rows
+
+
+def _split_row(
+    boxes: np.ndarray, row: List[int], max_word_gap: Optional[float]
+) -> List[List[int]]:
+    """Sort the words of a row from left to right, and split it at large gaps."""
+    indexes = np.array(row)[np.argsort(boxes[row, 0], kind="stable")]
+    if max_word_gap is None or len(indexes) < 2:
+        return [indexes.tolist()]
+    height = float(np.median(boxes[indexes, 3] - boxes[indexes, 1]))
+    # gap between the right of the words so far and the next word
+    right = np.maximum.accumulate(boxes[indexes[:-1], 2])
+    gaps = boxes[indexes[1:], 0] - right
+    cuts = np.flatnonzero(gaps > max_word_gap * height) + 1
+    return [part.tolist() for part in np.split(indexes, cuts)]
+
+
+def _projection_groups(starts: np.ndarray, ends: np.ndarray) -> List[np.ndarray]:
+    """Split intervals into groups separated by gaps in their union, in order."""
+    order = np.argsort(starts, kind="stable")
+    reach = np.maximum.accumulate(ends[order])
+    cuts = np.flatnonzero(starts[order][1:] > reach[:-1]) + 1
+    return np.split(order, cuts)
+
+
+def _union(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """`(G, 2)` intervals of the union of intervals, in order."""
+    order = np.argsort(starts, kind="stable")
+    starts, reach = starts[order], np.maximum.accumulate(ends[order])
+    cuts = np.flatnonzero(starts[1:] > reach[:-1]) + 1
+    first = np.concatenate(([0], cuts))
+    last = np.append(cuts - 1, len(starts) - 1)
+    return np.column_stack((starts[first], reach[last]))
+
+
+def _bands(boxes: np.ndarray, indexes: np.ndarray) -> List[np.ndarray]:
+    """Split boxes into horizontal bands, where their vertical projections leave a
+    gap. Consecutive bands that share their columns are kept together, so that the
+    rows of a multi-column area are not read across the columns.
+
+    The horizontal projection of the last band is kept as the union of its
+    intervals, so that each band is only compared with its few columns.
+
+    Returns:
+        List[np.ndarray]: Positions in `indexes` of the boxes of each band.
+    """
+    bands: List[List[np.ndarray]] = []
+    columns = np.zeros((0, 2))
+    for band in _projection_groups(boxes[indexes, 1], boxes[indexes, 3]):
+        band_columns = _union(boxes[indexes[band], 0], boxes[indexes[band], 2])
+        if bands and len(columns) > 1 and len(band_columns) > 1:
+            merged = np.concatenate((columns, band_columns))
+            merged = _union(merged[:, 0], merged[:, 1])
+            if len(merged) > 1:
+                bands[-1].append(band)
+                columns = merged
+                continue
+        bands.append([band])
+        columns = band_columns
+    return [np.concatenate(parts) for parts in bands]
+
+
+def reading_order(boxes: np.ndarray, columns: bool = True) -> np.ndarray:
+    """Order boxes of lines for reading, with a recursive XY-cut.
+
+    Args:
+        boxes (np.ndarray): `(N, 4)` boxes of the lines.
+        columns (bool): If False, boxes are read from top to bottom without
+            looking for columns.
+
+    Returns:
+        np.ndarray: `(N,)` indexes of the boxes in reading order.
+    """
+    order: List[int] = []
+    stack = [np.arange(len(boxes))]
+    while stack:
+        indexes = stack.pop()
+        if len(indexes) > 1 and columns:
+            groups = _projection_groups(boxes[indexes, 0], boxes[indexes, 2])
+            if len(groups) == 1:
+                groups = _bands(boxes, indexes)
+            if len(groups) > 1:
+                stack.extend(indexes[group] for group in reversed(groups))
+                continue
+        centers = (boxes[indexes, 1] + boxes[indexes, 3]) / 2
+        order.extend(indexes[np.lexsort((boxes[indexes, 0], centers))].tolist())
+    return np.array(order, dtype=np.intp)
+
+
+def build_lines(
+    words: Sequence[Word],
+    image_properties: Optional[ImageProperties] = None,
+    threshold: float = MIN_BBOX_OVERLAP_PROPORTION,
+    max_word_gap: Optional[float] = 3.0,
+) -> List[Line]:
+    """Group words into lines, in reading order.
+
+    The caption of a line is the captions of its words separated by spaces, its
+    box contains the boxes of its words, and its confidence is their mean
+    confidence. Its rotation is the rotation of the image, if any.
+
+    Args:
+        words (Sequence[Word]): Words of a page, in any order.
+        image_properties (ImageProperties, optional): Properties of the page image,
+            used to undo its rotation.
+        threshold (float): Minimum vertical overlap of a word with a line, as a share
+            of the smallest height, see `BBox.y_overlap_with`.
+        max_word_gap (float, optional): Maximum horizontal gap between two words of
+            a line, in line heights. None to never split lines, which also
+            disables the detection of columns.
+
+    Returns:
+        List[Line]: The lines, in reading order.
+    """
+    if not words:
+        return []
+    boxes = bboxes_to_array(word.bbox for word in words)
+    frame_boxes = _text_frame_boxes(boxes, image_properties)
+
+    groups = [
+        part
+        for row in _group_rows(frame_boxes, threshold)
+        for part in _split_row(frame_boxes, row, max_word_gap)
+    ]
+    group_boxes = np.array(
+        [
+            [
+                frame_boxes[group, 0].min(),
+                frame_boxes[group, 1].min(),
+                frame_boxes[group, 2].max(),
+                frame_boxes[group, 3].max(),
+            ]
+            for group in groups
+        ]
+    )
+    rotation = None if image_properties is None else image_properties.rotation or None
+
+    lines = []
+    for group_idx in reading_order(group_boxes, max_word_gap is not None).tolist():
+        group = groups[group_idx]
+        line_words = [words[index] for index in group]
+        line_box = np.concatenate(
+            (boxes[group, :2].min(axis=0), boxes[group, 2:].max(axis=0))
+        )
+        lines.append(
+            Line.construct(
+                bbox=array_to_bboxes(line_box[None, :])[0],
+                words=line_words,
+                line_caption=" ".join(word.word_caption for word in line_words),
+                rotation=rotation,
+                confidence=float(np.mean([word.confidence for word in line_words])),
+            )
+        )
+    return lines
+
+
+def rebuild_lines(
+    page: Page,
+    threshold: float = MIN_BBOX_OVERLAP_PROPORTION,
+    max_word_gap: Optional[float] = 3.0,
+) -> Page:
+    """Rebuild the lines of a page from its words, see `build_lines`.
+
+    Args:
+        page (Page): Page whose lines are not reliable.
+        threshold (float): See `build_lines`.
+        max_word_gap (float, optional): See `build_lines`.
+
+    Returns:
+        Page: A copy of the page with the new lines.
+    """
+    words = [word for line in page.line_list for word in line.words]
+    lines = build_lines(words, page.image_properties, threshold, max_word_gap)
+    return page.copy(update={"line_list": lines})
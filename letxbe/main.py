@@ -9,6 +9,7 @@ from letxbe.exception import (
     UnauthorizedError,
     UnknownResourceError,
 )
+from letxbe.fingerprint import FingerprintStore, fingerprint_dict
 from letxbe.session import BASE_URL, create_letxbe_session
 from letxbe.type import (
     Artefact,
@@ -27,7 +28,11 @@ class LXB:
     requesting documents, artefacts, predictions and feedbacks."""
 
     def __init__(
-        self, client_id: str, client_secret: str, server_address: Optional[str] = None
+        self,
+        client_id: str,
+        client_secret: str,
+        server_address: Optional[str] = None,
+        fingerprint_store: Optional[FingerprintStore] = None,
     ):
         """
         Args:
@@ -35,8 +40,12 @@ class LXB:
             client_secret (str): Auth0 client secret.
             server_address (str, optional): Address of the server.
                 If None or not specified, `BASE_URL` will be used by default.
+            fingerprint_store (FingerprintStore, optional): Store of the fingerprints
+                of posted predictions and feedbacks, required to skip posts whose
+                content has already been posted.
         """
         self.__server_address = BASE_URL if server_address is None else server_address
+        self.__fingerprint_store = fingerprint_store
         self.__session = create_letxbe_session(
             client_id, client_secret, self.__server_address
         )
@@ -46,6 +55,46 @@ class LXB:
         """Address of the server."""
         return self.__server_address
 
+    def _fingerprint_if_stored(
+        self, model_dict: dict, skip_if_unchanged: bool
+    ) -> Optional[str]:
+        """Fingerprint a content to post, if `LXB` has a `FingerprintStore`.
+
+        Args:
+            model_dict (dict): Output of `Prediction.dict()` or `Feedback.dict()`.
+            skip_if_unchanged (bool): Whether the post should be skipped if unchanged.
+
+        Returns:
+            str or None: The fingerprint, None if there is no `FingerprintStore`.
+
+        Raises:
+            ValueError: `skip_if_unchanged` is used without a `FingerprintStore`.
+        """
+        if self.__fingerprint_store is None:
+            if skip_if_unchanged:
+                raise ValueError(
+                    "A FingerprintStore is required to skip unchanged posts."
+                )
+            return None
+        return fingerprint_dict(model_dict)
+
+    def _is_last_posted(
+        self, kind: str, automatisme_slug: str, document_slug: str, fingerprint: str
+    ) -> bool:
+        """Check whether a fingerprint is the last one posted on a document."""
+        return self.__fingerprint_store is not None and fingerprint == (
+            self.__fingerprint_store.get(kind, automatisme_slug, document_slug)
+        )
+
+    def _store_fingerprint(
+        self, kind: str, automatisme_slug: str, document_slug: str, fingerprint: str
+    ) -> None:
+        """Store the fingerprint of a content posted on a document."""
+        if self.__fingerprint_store is not None:
+            self.__fingerprint_store.set(
+                kind, automatisme_slug, document_slug, fingerprint
+            )
+
     @staticmethod
     def _verify_status_code(res: requests.Response) -> None:
         """Map the response status code to a Python exception and raise it (if any).
@@ -173,6 +222,7 @@ class LXB:
         automatisme_slug: str,
         document_slug: str,
         prediction: Prediction,
+        skip_if_unchanged: bool = False,
     ) -> None:
         """Post a prediction to a given document.
 
@@ -180,16 +230,39 @@ class LXB:
             automatisme_slug (str): Slug of the automatisme.
             document_slug (str): Slug of the document.
             prediction (Prediction): Contents of the prediction.
+            skip_if_unchanged (bool): If True, the request is not sent when the
+                prediction has the same content as the last prediction posted on the
+                document, see `letxbe.fingerprint.fingerprint`.
+
+        Raises:
+            ValueError: `skip_if_unchanged` is used without a `FingerprintStore`.
         """
+        prediction_dict = prediction.dict()
+        prediction_fingerprint = self._fingerprint_if_stored(
+            prediction_dict, skip_if_unchanged
+        )
+        if (
+            skip_if_unchanged
+            and prediction_fingerprint is not None
+            and self._is_last_posted(
+                "prediction", automatisme_slug, document_slug, prediction_fingerprint
+            )
+        ):
+            return None
+
         response = self.__session.post(
             url=self.server
             + Url.POST_PREDICTION.format(
                 automatisme_slug=automatisme_slug, document_slug=document_slug
             ),
-            data=json.dumps(prediction.dict()),
+            data=json.dumps(prediction_dict),
         )
 
         self._verify_status_code(response)
+        if prediction_fingerprint is not None:
+            self._store_fingerprint(
+                "prediction", automatisme_slug, document_slug, prediction_fingerprint
+            )
 
         return None
 
@@ -198,6 +271,7 @@ class LXB:
         automatisme_slug: str,
         document_slug: str,
         feedback: Feedback,
+        skip_if_unchanged: bool = False,
     ) -> FeedbackResponse:
         """Post a feedback to a given document.
 
@@ -205,19 +279,43 @@ class LXB:
             automatisme_slug (str): Slug of the automatisme.
             document_slug (str): Slug of the document.
             feedback (Feedback): Contents of the feedback.
+            skip_if_unchanged (bool): If True, the request is not sent when the
+                feedback has the same content as the last feedback posted on the
+                document, see `letxbe.fingerprint.fingerprint`.
 
         Returns:
-            FeedbackResponse: The response containing the updated labels.
+            FeedbackResponse: The response containing the updated labels, with no
+            updated labels if the request has been skipped.
+
+        Raises:
+            ValueError: `skip_if_unchanged` is used without a `FingerprintStore`.
         """
+        feedback_dict = feedback.dict()
+        feedback_fingerprint = self._fingerprint_if_stored(
+            feedback_dict, skip_if_unchanged
+        )
+        if (
+            skip_if_unchanged
+            and feedback_fingerprint is not None
+            and self._is_last_posted(
+                "feedback", automatisme_slug, document_slug, feedback_fingerprint
+            )
+        ):
+            return FeedbackResponse(updated_labels=[])
+
         response = self.__session.post(
             url=self.server
             + Url.POST_FEEDBACK.format(
                 automatisme_slug=automatisme_slug, document_slug=document_slug
             ),
-            data=json.dumps(feedback.dict()),
+            data=json.dumps(feedback_dict),
         )
 
         self._verify_status_code(response)
+        if feedback_fingerprint is not None:
+            self._store_fingerprint(
+                "feedback", automatisme_slug, document_slug, feedback_fingerprint
+            )
 
         return FeedbackResponse.parse_obj(response.json())
 
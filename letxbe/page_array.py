@@ -0,0 +1,258 @@
+"""
+
+Array-backed representation of a `Page`, for geometric work on many words at once.
+
+A `PageArray` holds the boxes of lines and words as `(N, 4)` float arrays, in the
+order of `BBox.to_tuple` (x0, y0, x1, y1), their confidences as arrays, and their
+captions in `StringTable` objects. Words are stored line after line, and
+`line_word_offsets` delimits the words of each line.
+
+Conversion from and to `Page` is lossless.
+
+"""
+
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from letxbe.type.page import BBox, ImageProperties, Line, Page, Word
+
+
+def bboxes_to_array(bboxes: Iterable[BBox]) -> np.ndarray:
+    """Stack boxes into a `(N, 4)` array of (x0, y0, x1, y1) rows."""
+    array = np.array([bbox.to_tuple() for bbox in bboxes], dtype=float)
+    return array.reshape(-1, 4)
+
+
+def array_to_bboxes(array: np.ndarray) -> List[BBox]:
+    """Convert a `(N, 4)` array of (x0, y0, x1, y1) rows into boxes, without
+    validation."""
+    return [
+        BBox.construct(x0=x0, y0=y0, x1=x1, y1=y1)
+        for x0, y0, x1, y1 in np.asarray(array, dtype=float).tolist()
+    ]
+
+
+class StringTable:
+    """Immutable sequence of strings stored in a single string.
+
+    String `i` is `text[offsets[i]:offsets[i + 1]]`.
+    """
+
+    def __init__(self, text: str, offsets: np.ndarray):
+        """
+        Args:
+            text (str): Concatenation of the strings.
+            offsets (np.ndarray): `N + 1` increasing offsets in `text`, starting at 0.
+        """
+        self.text = text
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, strings: Iterable[str]) -> "StringTable":
+        string_list = list(strings)
+        offsets = np.zeros(len(string_list) + 1, dtype=np.intp)
+        np.cumsum([len(string) for string in string_list], out=offsets[1:])
+        return cls("".join(string_list), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        if not -len(self) <= index < len(self):
+            raise IndexError(f"StringTable index {index} out of range.")
+        index %= len(self)
+        return self.text[self.offsets[index] : self.offsets[index + 1]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_list())
+
+    def to_list(self) -> List[str]:
+        offsets = self.offsets.tolist()
+        return [self.text[start:end] for start, end in zip(offsets, offsets[1:])]
+
+
+class PageArray:
+    """Array-backed `Page`, see the module documentation.
+
+    Attributes:
+        file_uri (str): See `Page`.
+        page_idx (int): See `Page`.
+        image_properties (ImageProperties, optional): See `Page`.
+        line_bbox (np.ndarray): `(L, 4)` boxes of the lines.
+        line_confidence (np.ndarray): `(L,)` confidences of the lines.
+        line_rotation (np.ndarray): `(L,)` rotations of the lines, NaN if unknown.
+        line_captions (StringTable): Captions of the lines.
+        line_word_offsets (np.ndarray): `(L + 1,)` offsets, the words of line `i`
+            are the rows `line_word_offsets[i]` to `line_word_offsets[i + 1]`.
+        word_bbox (np.ndarray): `(W, 4)` boxes of the words.
+        word_confidence (np.ndarray): `(W,)` confidences of the words.
+        word_captions (StringTable): Captions of the words.
+    """
+
+    def __init__(
+        self,
+        file_uri: str,
+        page_idx: int,
+        image_properties: Optional[ImageProperties],
+        line_bbox: np.ndarray,
+        line_confidence: np.ndarray,
+        line_rotation: np.ndarray,
+        line_captions: StringTable,
+        line_word_offsets: np.ndarray,
+        word_bbox: np.ndarray,
+        word_confidence: np.ndarray,
+        word_captions: StringTable,
+    ):
+        self.file_uri = file_uri
+        self.page_idx = page_idx
+        self.image_properties = image_properties
+        self.line_bbox = line_bbox
+        self.line_confidence = line_confidence
+        self.line_rotation = line_rotation
+        self.line_captions = line_captions
+        self.line_word_offsets = line_word_offsets
+        self.word_bbox = word_bbox
+        self.word_confidence = word_confidence
+        self.word_captions = word_captions
+
+    @property
+    def line_count(self) -> int:
+        return len(self.line_confidence)
+
+    @property
+    def word_count(self) -> int:
+        return len(self.word_confidence)
+
+    @property
+    def word_line_idx(self) -> np.ndarray:
+        """`(W,)` index of the line of each word, see `WordClue.line_idx`."""
+        return np.repeat(
+            np.arange(self.line_count, dtype=np.intp), np.diff(self.line_word_offsets)
+        )
+
+    @property
+    def word_idx(self) -> np.ndarray:
+        """`(W,)` index of each word in its line, see `WordClue.word_idx`."""
+        line_start: np.ndarray = self.line_word_offsets[self.word_line_idx]
+        word_idx: np.ndarray = np.arange(self.word_count, dtype=np.intp) - line_start
+        return word_idx
+
+    def word_position(self, line_idx: int, word_idx: int) -> int:
+        """Row of the word `word_idx` of the line `line_idx` in the word arrays.
+
+        Raises:
+            IndexError: The word does not exist.
+        """
+        if not 0 <= line_idx < self.line_count:
+            raise IndexError(f"Line {line_idx} out of range.")
+        start, end = self.line_word_offsets[line_idx : line_idx + 2]
+        if not 0 <= word_idx < end - start:
+            raise IndexError(f"Word {word_idx} out of range in line {line_idx}.")
+        return int(start + word_idx)
+
+    @classmethod
+    def from_page(cls, page: Page) -> "PageArray":
+        """Convert a `Page`.
+
+        Args:
+            page (Page):
+
+        Returns:
+            PageArray: The page, with the same content.
+        """
+        lines = page.line_list
+        words = [word for line in lines for word in line.words]
+
+        line_word_offsets = np.zeros(len(lines) + 1, dtype=np.intp)
+        np.cumsum([len(line.words) for line in lines], out=line_word_offsets[1:])
+
+        return cls(
+            file_uri=page.file_uri,
+            page_idx=page.page_idx,
+            image_properties=page.image_properties,
+            line_bbox=bboxes_to_array(line.bbox for line in lines),
+            line_confidence=np.array([line.confidence for line in lines], dtype=float),
+            line_rotation=np.array(
+                [np.nan if line.rotation is None else line.rotation for line in lines],
+                dtype=float,
+            ),
+            line_captions=StringTable.from_strings(line.line_caption for line in lines),
+            line_word_offsets=line_word_offsets,
+            word_bbox=bboxes_to_array(word.bbox for word in words),
+            word_confidence=np.array([word.confidence for word in words], dtype=float),
+            word_captions=StringTable.from_strings(word.word_caption for word in words),
+        )
+
+    def to_page(self) -> Page:
+        """Convert back to a `Page`, without validation.
+
+        Returns:
+            Page: The page, with the same content.
+        """
+        words = [
+            Word.construct(word_caption=caption, bbox=bbox, confidence=confidence)
+            for caption, bbox, confidence in zip(
+                self.word_captions,
+                array_to_bboxes(self.word_bbox),
+                self.word_confidence.tolist(),
+            )
+        ]
+        offsets = self.line_word_offsets.tolist()
+        rotations = [
+            None if np.isnan(rotation) else rotation
+            for rotation in self.line_rotation.tolist()
+        ]
+
+        lines = [
+            Line.construct(
+                bbox=bbox,
+                words=words[start:end],
+                line_caption=caption,
+                rotation=rotation,
+                confidence=confidence,
+            )
+            for bbox, start, end, caption, rotation, confidence in zip(
+                array_to_bboxes(self.line_bbox),
+                offsets,
+                offsets[1:],
+                self.line_captions,
+                rotations,
+                self.line_confidence.tolist(),
+            )
+        ]
+        return Page.construct(
+            file_uri=self.file_uri,
+            page_idx=self.page_idx,
+            line_list=lines,
+            image_properties=self.image_properties,
+        )
+
+
+def pages_to_arrays(pages: Sequence[Page]) -> List[PageArray]:
+    """Convert the pages of a document, see `PageArray.from_page`."""
+    return [PageArray.from_page(page) for page in pages]
+
+
+def stack_words(page_arrays: Sequence[PageArray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Concatenate the word boxes of several pages.
+
+    Args:
+        page_arrays (Sequence[PageArray]): Pages of a document.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: `(W, 4)` boxes of every word, and `(W, 3)`
+        (page_idx, line_idx, word_idx) of each of them, see `WordClue`. `page_idx`
+        is the index of the page in `page_arrays`.
+    """
+    boxes = [page.word_bbox for page in page_arrays]
+    positions = [
+        np.column_stack(
+            (np.full(page.word_count, page_idx), page.word_line_idx, page.word_idx)
+        ).astype(np.intp)
+        for page_idx, page in enumerate(page_arrays)
+    ]
+    return (
+        np.concatenate(boxes) if boxes else np.empty((0, 4)),
+        np.concatenate(positions) if positions else np.empty((0, 3), dtype=np.intp),
+    )
@@ -0,0 +1,449 @@
+"""
+
+Compact binary store of the pages of many documents, readable with `mmap`.
+
+A store file is made of, in this order:
+
+    - a header: `PAGE_STORE_MAGIC`, the format version, and the number of pages,
+      lines, words and strings, see `_HEADER_DTYPE`,
+    - the page directory, one fixed-width record per page, see `PAGE_DTYPE`,
+    - the lines of every page, see `LINE_DTYPE`,
+    - the words of every page, see `WORD_DTYPE`,
+    - the string table: `n + 1` byte offsets, then the UTF-8 bytes of the strings.
+
+Records refer to strings (captions, file URIs, image formats) by their index in
+the string table, and pages refer to their lines and words by their first index.
+Sections are memory-mapped, so that reading a page or a range of words only
+decodes that page or these words.
+
+"""
+
+import os
+import shutil
+import tempfile
+from contextlib import ExitStack
+from typing import IO, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from letxbe.page_array import PageArray, StringTable
+from letxbe.type.lazy_page import LazyPages
+from letxbe.type.page import ImageFormat, ImageProperties, Page
+
+PAGE_STORE_MAGIC = b"LXBPAGES"
+PAGE_STORE_VERSION = 1
+
+_HEADER_DTYPE = np.dtype(
+    [
+        ("magic", "S8"),
+        ("version", "<u4"),
+        ("page_count", "<u4"),
+        ("line_count", "<u8"),
+        ("word_count", "<u8"),
+        ("string_count", "<u8"),
+        ("text_size", "<u8"),
+    ]
+)
+
+PAGE_DTYPE = np.dtype(
+    [
+        ("page_idx", "<i8"),
+        ("file_uri", "<i8"),
+        ("line_start", "<u8"),
+        ("line_count", "<u8"),
+        ("word_start", "<u8"),
+        ("word_count", "<u8"),
+        # -1 when the page has no image properties
+        ("image_format", "<i8"),
+        ("image_size", "<i8", (2,)),
+        ("image_rotation", "<f8"),
+    ]
+)
+"""Record of a page in the directory. Strings are indexes in the string table."""
+
+LINE_DTYPE = np.dtype(
+    [
+        ("bbox", "<f8", (4,)),
+        ("confidence", "<f8"),
+        # NaN when unknown
+        ("rotation", "<f8"),
+        ("caption", "<i8"),
+        ("word_count", "<u8"),
+    ]
+)
+"""Record of a line, whose words follow the words of the previous lines."""
+
+WORD_DTYPE = np.dtype(
+    [
+        ("bbox", "<f8", (4,)),
+        ("confidence", "<f8"),
+        ("caption", "<i8"),
+    ]
+)
+"""Record of a word. Boxes are (x0, y0, x1, y1), see `BBox.to_tuple`."""
+
+
+WRITE_CHUNK_SIZE = 1 << 16
+"""Number of records, or bytes of strings, buffered per section while writing."""
+
+
+class _SectionWriter:
+    """Records of a section, written by chunks to a temporary file as they come."""
+
+    def __init__(self, dtype: np.dtype, chunk_size: int, directory: str):
+        self.file = tempfile.TemporaryFile(dir=directory)
+        self.buffer = np.zeros(chunk_size, dtype=dtype)
+        self.filled = 0
+        self.count = 0
+
+    def append(self, records: np.ndarray) -> None:
+        records = np.atleast_1d(records)
+        done = 0
+        while done < len(records):
+            size = min(len(self.buffer) - self.filled, len(records) - done)
+            self.buffer[self.filled : self.filled + size] = records[done : done + size]
+            self.filled += size
+            done += size
+            if self.filled == len(self.buffer):
+                self.flush()
+        self.count += len(records)
+
+    def flush(self) -> None:
+        self.file.write(self.buffer[: self.filled].tobytes())
+        self.filled = 0
+
+    def copy_to(self, file: IO[bytes]) -> None:
+        self.flush()
+        self.file.seek(0)
+        shutil.copyfileobj(self.file, file)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class _StringWriter:
+    """Strings of a store, numbered in order, whose offsets and bytes are written
+    by chunks to temporary files."""
+
+    def __init__(self, chunk_size: int, directory: str):
+        self.offsets = _SectionWriter(np.dtype("<u8"), chunk_size, directory)
+        self.offsets.append(np.zeros(1, dtype="<u8"))
+        self.file = tempfile.TemporaryFile(dir=directory)
+        self.chunk_size = chunk_size
+        self.buffer = bytearray()
+        self.size = 0
+
+    @property
+    def count(self) -> int:
+        return self.offsets.count - 1
+
+    def add(self, string: str) -> int:
+        return int(self.extend([string])[0])
+
+    def extend(self, strings: Iterable[str]) -> np.ndarray:
+        start = self.count
+        encoded = [string.encode() for string in strings]
+        offsets = np.cumsum([len(string) for string in encoded], dtype="<u8")
+        self.offsets.append(offsets + np.uint64(self.size))
+        self.size += int(offsets[-1]) if len(offsets) else 0
+        self.buffer += b"".join(encoded)
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+        return np.arange(start, self.count, dtype=np.int64)
+
+    def flush(self) -> None:
+        self.file.write(self.buffer)
+        self.buffer.clear()
+
+    def copy_to(self, file: IO[bytes]) -> None:
+        self.offsets.copy_to(file)
+        self.flush()
+        self.file.seek(0)
+        shutil.copyfileobj(self.file, file)
+
+    def close(self) -> None:
+        self.offsets.close()
+        self.file.close()
+
+
+def write_page_store(
+    path: str, pages: Iterable[Page], chunk_size: int = WRITE_CHUNK_SIZE
+) -> int:
+    """Write pages in a store file, see the module documentation.
+
+    Pages are consumed one at a time, and each section is spooled by chunks to a
+    temporary file next to `path`, then copied after the header, so that memory
+    does not grow with the number of pages.
+
+    Args:
+        path (str): Path of the file, overwritten if it exists.
+        pages (Iterable[Page]): Pages to store, e.g. the pages of many documents.
+        chunk_size (int): Number of records, or bytes of strings, buffered per
+            section.
+
+    Returns:
+        int: Number of stored pages.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    with ExitStack() as stack:
+        page_records = _SectionWriter(PAGE_DTYPE, chunk_size, directory)
+        stack.callback(page_records.close)
+        line_records = _SectionWriter(LINE_DTYPE, chunk_size, directory)
+        stack.callback(line_records.close)
+        word_records = _SectionWriter(WORD_DTYPE, chunk_size, directory)
+        stack.callback(word_records.close)
+        strings = _StringWriter(chunk_size, directory)
+        stack.callback(strings.close)
+
+        for page in pages:
+            array = PageArray.from_page(page)
+            record = np.zeros((), dtype=PAGE_DTYPE)
+            record["page_idx"] = array.page_idx
+            record["file_uri"] = strings.add(array.file_uri)
+            record["line_start"] = line_records.count
+            record["line_count"] = array.line_count
+            record["word_start"] = word_records.count
+            record["word_count"] = array.word_count
+            record["image_format"] = -1
+            if array.image_properties is not None:
+                record["image_format"] = strings.add(
+                    ImageFormat(array.image_properties.format).value
+                )
+                record["image_size"] = array.image_properties.size
+                record["image_rotation"] = array.image_properties.rotation
+            page_records.append(record)
+
+            lines = np.zeros(array.line_count, dtype=LINE_DTYPE)
+            lines["bbox"] = array.line_bbox
+            lines["confidence"] = array.line_confidence
+            lines["rotation"] = array.line_rotation
+            lines["caption"] = strings.extend(array.line_captions)
+            lines["word_count"] = np.diff(array.line_word_offsets)
+            line_records.append(lines)
+
+            words = np.zeros(array.word_count, dtype=WORD_DTYPE)
+            words["bbox"] = array.word_bbox
+            words["confidence"] = array.word_confidence
+            words["caption"] = strings.extend(array.word_captions)
+            word_records.append(words)
+
+        header = np.zeros((), dtype=_HEADER_DTYPE)
+        header["magic"] = PAGE_STORE_MAGIC
+        header["version"] = PAGE_STORE_VERSION
+        header["page_count"] = page_records.count
+        header["line_count"] = line_records.count
+        header["word_count"] = word_records.count
+        header["string_count"] = strings.count
+        header["text_size"] = strings.size
+
+        with open(path, "wb") as file:
+            file.write(header.tobytes())
+            page_records.copy_to(file)
+            line_records.copy_to(file)
+            word_records.copy_to(file)
+            strings.copy_to(file)
+        return page_records.count
+
+
+class PageStore:
+    """Read-only access to a store file written with `write_page_store`.
+
+    Pages are accessed by their position in the store, see `PageStore.position`
+    to find a page by `Page.page_idx`.
+
+    Example:
+
+        ::
+
+            with PageStore("pages.lxb") as store:
+                page = store[3]
+                captions = store.word_captions(3, start=10, stop=20)
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Path of the store file.
+
+        Raises:
+            ValueError: The file is not a page store or has an unsupported version.
+        """
+        self.path = path
+        self.__memmap: np.ndarray = np.memmap(path, dtype=np.uint8, mode="r")
+        header = self.__memmap[: _HEADER_DTYPE.itemsize].view(_HEADER_DTYPE)[0]
+        if bytes(header["magic"]) != PAGE_STORE_MAGIC:
+            raise ValueError(f"'{path}' is not a page store.")
+        if int(header["version"]) != PAGE_STORE_VERSION:
+            raise ValueError(f"Unsupported page store version {header['version']}.")
+
+        offset = _HEADER_DTYPE.itemsize
+        self.pages, offset = self._section(
+            offset, int(header["page_count"]), PAGE_DTYPE
+        )
+        self.lines, offset = self._section(
+            offset, int(header["line_count"]), LINE_DTYPE
+        )
+        self.words, offset = self._section(
+            offset, int(header["word_count"]), WORD_DTYPE
+        )
+        self.string_offsets, offset = self._section(
+            offset, int(header["string_count"]) + 1, np.dtype("<u8")
+        )
+        self.__text = self.__memmap[offset : offset + int(header["text_size"])]
+        self.__positions: Optional[Dict[int, int]] = None
+
+    def _section(
+        self, offset: int, count: int, dtype: np.dtype
+    ) -> Tuple[np.ndarray, int]:
+        end = offset + count * dtype.itemsize
+        return self.__memmap[offset:end].view(dtype), end
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def __getitem__(self, position: int) -> Page:
+        return self.page(position)
+
+    def __enter__(self) -> "PageStore":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the references of the store to the memory map, which is unmapped
+        once the arrays returned by the store are released too."""
+        self.__memmap = self.__text = np.empty(0, dtype=np.uint8)
+        self.pages = np.empty(0, dtype=PAGE_DTYPE)
+        self.lines = np.empty(0, dtype=LINE_DTYPE)
+        self.words = np.empty(0, dtype=WORD_DTYPE)
+        self.string_offsets = np.zeros(1, dtype="<u8")
+
+    def string(self, index: int) -> str:
+        """Decode a string of the string table."""
+        start, end = self.string_offsets[index : index + 2]
+        return bytes(self.__text[start:end]).decode()
+
+    def strings(self, indexes: np.ndarray) -> List[str]:
+        """Decode several strings of the string table.
+
+        The strings of a page are contiguous in the table, so they are read with a
+        single copy from the memory map.
+        """
+        index_list = indexes.tolist()
+        if not index_list:
+            return []
+        first, last = min(index_list), max(index_list)
+        if last - first + 1 > 2 * len(index_list):
+            return [self.string(index) for index in index_list]
+        offsets = self.string_offsets[first : last + 2].tolist()
+        text = bytes(self.__text[offsets[0] : offsets[-1]])
+        base = offsets[0]
+        return [
+            text[offsets[i - first] - base : offsets[i - first + 1] - base].decode()
+            for i in index_list
+        ]
+
+    def position(self, page_idx: int) -> int:
+        """Position in the store of the first page with a given `Page.page_idx`.
+
+        Raises:
+            KeyError: No page has this index.
+        """
+        if self.__positions is None:
+            self.__positions = {}
+            for position, index in enumerate(self.pages["page_idx"].tolist()):
+                self.__positions.setdefault(index, position)
+        return self.__positions[page_idx]
+
+    def _page_record(self, position: int) -> np.void:
+        if not -len(self) <= position < len(self):
+            raise IndexError(f"Page {position} out of range.")
+        record: np.void = self.pages[position]
+        return record
+
+    def word_range(
+        self, position: int, start: int = 0, stop: Optional[int] = None
+    ) -> np.ndarray:
+        """Records of a range of words of a page, see `WORD_DTYPE`, without copy.
+
+        Args:
+            position (int): Position of the page in the store.
+            start (int): Index of the first word in the page, words being numbered
+                line after line.
+            stop (int, optional): Index after the last word, the end of the page by
+                default.
+        """
+        record = self._page_record(position)
+        first, count = int(record["word_start"]), int(record["word_count"])
+        start, stop, _ = slice(start, stop).indices(count)
+        return self.words[first + start : first + max(start, stop)]
+
+    def word_captions(
+        self, position: int, start: int = 0, stop: Optional[int] = None
+    ) -> List[str]:
+        """Captions of a range of words of a page, see `PageStore.word_range`."""
+        return self.strings(self.word_range(position, start, stop)["caption"])
+
+    def page_array(self, position: int) -> PageArray:
+        """Decode a page as a `PageArray`.
+
+        Args:
+            position (int): Position of the page in the store.
+        """
+        record = self._page_record(position)
+        line_start = int(record["line_start"])
+        lines = self.lines[line_start : line_start + int(record["line_count"])]
+        words = self.word_range(position)
+
+        line_word_offsets = np.zeros(len(lines) + 1, dtype=np.intp)
+        np.cumsum(lines["word_count"], out=line_word_offsets[1:])
+
+        image_properties = None
+        if int(record["image_format"]) >= 0:
+            image_properties = ImageProperties.parse_obj(
+                {
+                    "size": record["image_size"].tolist(),
+                    "format": self.string(int(record["image_format"])),
+                    "rotation": float(record["image_rotation"]),
+                }
+            )
+
+        return PageArray(
+            file_uri=self.string(int(record["file_uri"])),
+            page_idx=int(record["page_idx"]),
+            image_properties=image_properties,
+            line_bbox=np.array(lines["bbox"]),
+            line_confidence=np.array(lines["confidence"]),
+            line_rotation=np.array(lines["rotation"]),
+            line_captions=StringTable.from_strings(self.strings(lines["caption"])),
+            line_word_offsets=line_word_offsets,
+            word_bbox=np.array(words["bbox"]),
+            word_confidence=np.array(words["confidence"]),
+            word_captions=StringTable.from_strings(self.strings(words["caption"])),
+        )
+
+    def page(self, position: int) -> Page:
+        """Decode a page, without validation.
+
+        Args:
+            position (int): Position of the page in the store.
+        """
+        return self.page_array(position).to_page()
+
+    def lazy_pages(self, max_cached: int = 16, validate: bool = False) -> LazyPages:
+        """Pages of the store, decoded when accessed, see `LazyPages`.
+
+        Args:
+            max_cached (int): Maximum number of decoded pages kept in memory.
+            validate (bool): If True, validate pages when they are decoded.
+
+        Returns:
+            LazyPages: The pages, in the order of the store.
+        """
+
+        def _load(position: int) -> Page:
+            page = self.page(position)
+            return Page.parse_obj(page.dict()) if validate else page
+
+        return LazyPages(_load, len(self), max_cached, self.pages["page_idx"].tolist())
@@ -0,0 +1,251 @@
+"""
+
+Render pages as plain text, keeping the character offsets of every word.
+
+Words of a line are separated by a space, lines by a newline and pages by a form
+feed. Lines are rendered in the order of `Page.line_list`, see
+`letxbe.layout.rebuild_lines`, or with `reorder`, in the order given by
+`letxbe.layout.reading_order`.
+
+The text of a page is written in a single array of code points: the captions of
+its words, already concatenated in a `StringTable`, are moved to their offsets at
+once and separators fill the gaps, without concatenating strings word by word.
+
+Example:
+    turn the matches of a regular expression into `WordClue` objects
+
+    ::
+
+        rendered = PageTextRenderer().render_document(pages)
+        for match in re.finditer(r"\\d{2}/\\d{2}/\\d{4}", rendered.text):
+            clues = rendered.span_clues(*match.span())
+
+"""
+
+import re
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from letxbe.layout import reading_order
+from letxbe.page_array import PageArray, array_to_bboxes
+from letxbe.type.clue import WordClue
+from letxbe.type.page import Page
+
+WORD_SEPARATOR = " "
+LINE_SEPARATOR = "\n"
+PAGE_SEPARATOR = "\f"
+
+_CODEC = "utf-32-le"
+
+
+class RenderedText:
+    """Text of one or more pages, with the offsets of their words.
+
+    Words are stored in the order of the text.
+
+    Attributes:
+        text (str): The text.
+        word_start (np.ndarray): `(W,)` offset of the first character of each word.
+        word_end (np.ndarray): `(W,)` offset after the last character of each word.
+        positions (np.ndarray): `(W, 3)` (page_idx, line_idx, word_idx) of each word,
+            see `WordClue`.
+        boxes (np.ndarray): `(W, 4)` boxes of the words.
+        page_start (np.ndarray): `(P,)` offset of the text of each page.
+    """
+
+    def __init__(
+        self,
+        text: str,
+        word_start: np.ndarray,
+        word_end: np.ndarray,
+        positions: np.ndarray,
+        boxes: np.ndarray,
+        page_start: np.ndarray,
+    ):
+        self.text = text
+        self.word_start = word_start
+        self.word_end = word_end
+        self.positions = positions
+        self.boxes = boxes
+        self.page_start = page_start
+
+    def __len__(self) -> int:
+        return len(self.word_start)
+
+    def locate(self, offset: int) -> Optional[Tuple[int, int, int]]:
+        """(page_idx, line_idx, word_idx) of the word at a character offset, None if
+        the character is a separator."""
+        row = int(np.searchsorted(self.word_end, offset, side="right"))
+        if row == len(self) or self.word_start[row] > offset:
+            return None
+        page_idx, line_idx, word_idx = self.positions[row].tolist()
+        return page_idx, line_idx, word_idx
+
+    def word_range(self, start: int, end: int) -> Tuple[int, int]:
+        """Rows of the words overlapping the characters `start` to `end`, e.g. the
+        span of a `re.Match`.
+
+        Returns:
+            Tuple[int, int]: First row and row after the last one.
+        """
+        first = int(np.searchsorted(self.word_end, start, side="right"))
+        stop = int(np.searchsorted(self.word_start, end, side="left"))
+        return first, max(first, stop)
+
+    def span_clues(self, start: int, end: int) -> List[WordClue]:
+        """`WordClue` objects, with their `bbox`, of the words overlapping the
+        characters `start` to `end`."""
+        first, stop = self.word_range(start, end)
+        return [
+            WordClue.construct(
+                page_idx=page_idx, line_idx=line_idx, word_idx=word_idx, bbox=bbox
+            )
+            for (page_idx, line_idx, word_idx), bbox in zip(
+                self.positions[first:stop].tolist(),
+                array_to_bboxes(self.boxes[first:stop]),
+            )
+        ]
+
+    def search(self, pattern: str, flags: int = 0) -> List[List[WordClue]]:
+        """Find the non-empty matches of a regular expression.
+
+        Returns:
+            List[List[WordClue]]: Clues of the words of each match.
+        """
+        return [
+            self.span_clues(*match.span())
+            for match in re.finditer(pattern, self.text, flags)
+            if match.end() > match.start()
+        ]
+
+
+def render_page(page: Union[Page, PageArray], reorder: bool = False) -> RenderedText:
+    """Render the text of a page.
+
+    Args:
+        page (Page or PageArray): The page.
+        reorder (bool): If True, order the lines with
+            `letxbe.layout.reading_order`, else keep the order of the page.
+
+    Returns:
+        RenderedText: Text of the page, with the offsets of its words.
+    """
+    array = page if isinstance(page, PageArray) else PageArray.from_page(page)
+    captions = array.word_captions
+    line_offsets = array.line_word_offsets
+    line_idx = array.word_line_idx
+
+    # length of each line: its captions, and a space between consecutive words
+    word_counts = np.diff(line_offsets)
+    line_lengths = (
+        np.diff(captions.offsets[line_offsets]) + np.maximum(word_counts, 1) - 1
+    )
+    order = (
+        reading_order(array.line_bbox)
+        if reorder
+        else np.arange(array.line_count, dtype=np.intp)
+    )
+    line_start = np.zeros(array.line_count, dtype=np.intp)
+    ordered_ends = np.cumsum(line_lengths[order] + 1)
+    line_start[order[1:]] = ordered_ends[:-1]
+    length = int(ordered_ends[-1] - 1) if array.line_count else 0
+
+    word_idx = np.arange(array.word_count, dtype=np.intp) - line_offsets[line_idx]
+    word_start = (
+        line_start[line_idx]
+        + captions.offsets[:-1]
+        - captions.offsets[line_offsets[line_idx]]
+        + word_idx
+    )
+    word_lengths = np.diff(captions.offsets)
+
+    code_points = np.full(length, ord(WORD_SEPARATOR), dtype="<u4")
+    code_points[line_start[order[1:]] - 1] = ord(LINE_SEPARATOR)
+    shifts = np.repeat(word_start - captions.offsets[:-1], word_lengths)
+    code_points[np.arange(len(captions.text)) + shifts] = np.frombuffer(
+        captions.text.encode(_CODEC), dtype="<u4"
+    )
+
+    rows = (
+        np.argsort(word_start, kind="stable")
+        if reorder
+        else np.arange(array.word_count, dtype=np.intp)
+    )
+    positions = np.column_stack(
+        (np.full(array.word_count, array.page_idx, dtype=np.intp), line_idx, word_idx)
+    )
+    return RenderedText(
+        text=code_points.tobytes().decode(_CODEC),
+        word_start=word_start[rows],
+        word_end=(word_start + word_lengths)[rows],
+        positions=positions[rows],
+        boxes=array.word_bbox[rows],
+        page_start=np.zeros(1, dtype=np.intp),
+    )
+
+
+def join_rendered(rendered: Sequence[RenderedText]) -> RenderedText:
+    """Join the texts of pages, separated by `PAGE_SEPARATOR`."""
+    lengths = np.array([len(part.text) for part in rendered], dtype=np.intp)
+    page_start = np.zeros(len(rendered), dtype=np.intp)
+    np.cumsum(lengths[:-1] + 1, out=page_start[1:])
+    shifts = np.repeat(page_start, [len(part) for part in rendered])
+    return RenderedText(
+        text=PAGE_SEPARATOR.join(part.text for part in rendered),
+        word_start=np.concatenate(
+            [part.word_start for part in rendered] + [np.zeros(0, dtype=np.intp)]
+        )
+        + shifts,
+        word_end=np.concatenate(
+            [part.word_end for part in rendered] + [np.zeros(0, dtype=np.intp)]
+        )
+        + shifts,
+        positions=np.concatenate(
+            [part.positions for part in rendered] + [np.zeros((0, 3), dtype=np.intp)]
+        ),
+        boxes=np.concatenate([part.boxes for part in rendered] + [np.zeros((0, 4))]),
+        page_start=page_start,
+    )
+
+
+class PageTextRenderer:
+    """Render pages as text, keeping the rendering of the last pages in a bounded
+    cache.
+
+    Pages are cached by identity: a page modified after being rendered must be
+    dropped with `clear`.
+    """
+
+    def __init__(self, reorder: bool = False, max_cached: int = 1024):
+        """
+        Args:
+            reorder (bool): See `render_page`.
+            max_cached (int): Maximum number of pages whose text is kept.
+        """
+        self.reorder = reorder
+        self.max_cached = max_cached
+        self.__cache: "OrderedDict[int, Tuple[Union[Page, PageArray], RenderedText]]"
+        self.__cache = OrderedDict()
+
+    def render(self, page: Union[Page, PageArray]) -> RenderedText:
+        """Text of a page, see `render_page`."""
+        cached = self.__cache.get(id(page))
+        if cached is not None and cached[0] is page:
+            self.__cache.move_to_end(id(page))
+            return cached[1]
+
+        rendered = render_page(page, self.reorder)
+        # the page is kept so that its id is not reused while cached
+        self.__cache[id(page)] = (page, rendered)
+        if len(self.__cache) > self.max_cached:
+            self.__cache.popitem(last=False)
+        return rendered
+
+    def render_document(self, pages: Sequence[Union[Page, PageArray]]) -> RenderedText:
+        """Text of the pages of a document, separated by `PAGE_SEPARATOR`."""
+        return join_rendered([self.render(page) for page in pages])
+
+    def clear(self) -> None:
+        self.__cache.clear()
@@ -0,0 +1,259 @@
+"""
+
+Array-backed polygons of `ShapeClue` objects, for geometry on many points at once.
+
+A `Polygon` holds its vertices as a `(N, 2)` array of (x, y) points. The
+coordinates of `ShapeClue.polygon` are read in order, whether its tuples are
+points or flat COCO sequences, and written back in the layout they were read
+from. Polygons built from points are written as (x, y) points. A `ShapeClue`
+without polygon is the rectangle of its `bbox`.
+
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from letxbe.geometry import as_boxes, bbox_centers
+from letxbe.type.clue import ShapeClue
+from letxbe.type.page import BBox
+
+
+def _clip(points: np.ndarray, axis: int, limit: float, keep_above: bool) -> np.ndarray:
+    """Clip a polygon by a half-plane `x >= limit` (or `<=`) along an axis, with the
+    Sutherland-Hodgman algorithm."""
+    if len(points) == 0:
+        return points
+    following = np.roll(points, -1, axis=0)
+    sign = 1 if keep_above else -1
+    inside = sign * (points[:, axis] - limit) >= 0
+    following_inside = np.roll(inside, -1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = (limit - points[:, axis]) / (following[:, axis] - points[:, axis])
+        crossing = points + ratio[:, None] * (following - points)
+
+    clipped = []
+    for i in range(len(points)):
+        if inside[i]:
+            clipped.append(points[i])
+        if inside[i] != following_inside[i]:
+            clipped.append(crossing[i])
+    return np.array(clipped).reshape(-1, 2)
+
+
+def _segments_in_boxes(
+    start: np.ndarray, end: np.ndarray, boxes: np.ndarray, strict: bool
+) -> np.ndarray:
+    """Test which segments meet which boxes, with the Liang-Barsky algorithm.
+
+    Args:
+        start (np.ndarray): `(N, 2)` first points of the segments.
+        end (np.ndarray): `(N, 2)` last points of the segments.
+        boxes (np.ndarray): `(K, 4)` boxes (x0, y0, x1, y1).
+        strict (bool): If True, segments must pass through the interior of the
+            boxes, else touching their border is enough.
+
+    Returns:
+        np.ndarray: `(K, N)` booleans.
+    """
+    low = np.zeros((len(boxes), len(start)))
+    high = np.ones((len(boxes), len(start)))
+    for axis in (0, 1):
+        origin, delta = start[:, axis], end[:, axis] - start[:, axis]
+        lower, upper = boxes[:, axis : axis + 1], boxes[:, axis + 2 : axis + 3]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            enter, leave = (lower - origin) / delta, (upper - origin) / delta
+        # segments parallel to the axis are inside the slab for all or no t
+        if strict:
+            within = (lower < origin) & (origin < upper)
+        else:
+            within = (lower <= origin) & (origin <= upper)
+        parallel = delta == 0
+        low = np.maximum(
+            low,
+            np.where(parallel, np.where(within, 0, np.inf), np.minimum(enter, leave)),
+        )
+        high = np.minimum(
+            high,
+            np.where(parallel, np.where(within, 1, -np.inf), np.maximum(enter, leave)),
+        )
+    meets: np.ndarray = low < high if strict else low <= high
+    return meets
+
+
+class Polygon:
+    """Polygon of (x, y) vertices, see the module documentation.
+
+    Attributes:
+        points (np.ndarray): `(N, 2)` vertices, in order.
+    """
+
+    def __init__(self, points: npt.ArrayLike):
+        """
+        Args:
+            points (ArrayLike): Vertices, as `(N, 2)` points or flat coordinates
+                [x1, y1, ..., xn, yn].
+
+        Raises:
+            ValueError: Coordinates are not made of pairs.
+        """
+        array = np.asarray(points, dtype=float).ravel()
+        if len(array) % 2 == 1:
+            raise ValueError("Polygon must have an even number of coordinates")
+        self.points = array.reshape(-1, 2)
+        # number of coordinates of each tuple of `ShapeClue.polygon`, if read from it
+        self._layout: Optional[List[int]] = None
+
+    @classmethod
+    def from_polygon(cls, polygon: Sequence[Tuple[float, ...]]) -> "Polygon":
+        """Read the format of `ShapeClue.polygon`, keeping its layout."""
+        result = cls([coordinate for element in polygon for coordinate in element])
+        result._layout = [len(element) for element in polygon]
+        return result
+
+    @classmethod
+    def from_bbox(cls, bbox: BBox) -> "Polygon":
+        return cls(
+            [
+                (bbox.x0, bbox.y0),
+                (bbox.x1, bbox.y0),
+                (bbox.x1, bbox.y1),
+                (bbox.x0, bbox.y1),
+            ]
+        )
+
+    @classmethod
+    def from_shape_clue(cls, clue: ShapeClue) -> "Polygon":
+        """Polygon of a clue, the rectangle of its `bbox` if it has no polygon."""
+        if not clue.polygon:
+            return cls.from_bbox(clue.bbox)
+        return cls.from_polygon(clue.polygon)
+
+    def to_polygon(self) -> List[Tuple[float, ...]]:
+        """Vertices in the format of `ShapeClue.polygon`, in the layout of the
+        polygon read with `from_polygon`, else as (x, y) points."""
+        if self._layout is None or sum(self._layout) != self.points.size:
+            return [tuple(point) for point in self.points.tolist()]
+        coordinates = self.points.ravel().tolist()
+        ends = np.cumsum(self._layout).tolist()
+        return [
+            tuple(coordinates[end - width : end])
+            for width, end in zip(self._layout, ends)
+        ]
+
+    def to_shape_clue(
+        self, page_idx: int, value: str = "", role: Optional[str] = None
+    ) -> ShapeClue:
+        """Create a validated `ShapeClue`, whose `bbox` is the bounds of the polygon.
+
+        Raises:
+            ValueError: The polygon does not pass the validation of `ShapeClue`.
+        """
+        return ShapeClue(
+            page_idx=page_idx,
+            value=value,
+            role=role,
+            bbox=self.bounds,
+            polygon=self.to_polygon(),
+        )
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    @property
+    def area(self) -> float:
+        """Area, with the shoelace formula."""
+        x, y = self.points[:, 0], self.points[:, 1]
+        return float(abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2)
+
+    @property
+    def bounds(self) -> BBox:
+        """Smallest box containing the polygon."""
+        x0, y0 = self.points.min(axis=0).tolist()
+        x1, y1 = self.points.max(axis=0).tolist()
+        return BBox.construct(x0=x0, y0=y0, x1=x1, y1=y1)
+
+    def contains_points(self, points: npt.ArrayLike) -> np.ndarray:
+        """Test which points are inside the polygon, with the even-odd rule.
+
+        Args:
+            points (ArrayLike): `(M, 2)` points, e.g. the centers of words, see
+                `letxbe.geometry.bbox_centers`.
+
+        Returns:
+            np.ndarray: `(M,)` booleans.
+        """
+        array = np.asarray(points, dtype=float).reshape(-1, 2)
+        x, y = array[:, 0:1], array[:, 1:2]
+        start = self.points
+        end = np.roll(self.points, -1, axis=0)
+
+        # edges crossing the horizontal line of each point, `(M, N)`
+        crosses = (start[:, 1] > y) != (end[:, 1] > y)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_cross = start[:, 0] + (y - start[:, 1]) * (end[:, 0] - start[:, 0]) / (
+                end[:, 1] - start[:, 1]
+            )
+        inside: np.ndarray = np.count_nonzero(crosses & (x < x_cross), axis=1) % 2 == 1
+        return inside
+
+    def intersection_area(self, bbox: BBox) -> float:
+        """Area of the intersection of the polygon with a box.
+
+        The polygon is clipped by the box, which is exact for convex polygons and
+        for simple polygons whose clipped parts stay connected.
+        """
+        clipped = self.points
+        for axis, limit, keep_above in (
+            (0, bbox.x0, True),
+            (0, bbox.x1, False),
+            (1, bbox.y0, True),
+            (1, bbox.y1, False),
+        ):
+            clipped = _clip(clipped, axis, limit, keep_above)
+        return Polygon(clipped).area if len(clipped) >= 3 else 0.0
+
+    def intersects(self, boxes: npt.ArrayLike) -> np.ndarray:
+        """Test which boxes intersect the polygon with a positive area.
+
+        Boxes out of the bounds of the polygon are discarded at once. For the
+        others, the edges of the polygon are tested against all the boxes at once:
+        a box crossed by an edge intersects the polygon, and a box that no edge
+        touches intersects it if it is inside. Only boxes whose border is touched by
+        edges without being crossed are clipped one by one. Polygons are expected
+        without zero-width spikes.
+
+        Args:
+            boxes (ArrayLike): `(K, 4)` boxes (x0, y0, x1, y1), see
+                `letxbe.geometry`.
+
+        Returns:
+            np.ndarray: `(K,)` booleans.
+        """
+        array = as_boxes(boxes)
+        result = np.zeros(len(array), dtype=bool)
+        if len(self) < 3 or self.area == 0:
+            return result
+        (x0, y0), (x1, y1) = self.points.min(axis=0), self.points.max(axis=0)
+        candidates = np.flatnonzero(
+            (array[:, 0] < x1)
+            & (array[:, 2] > x0)
+            & (array[:, 1] < y1)
+            & (array[:, 3] > y0)
+            & (array[:, 0] < array[:, 2])
+            & (array[:, 1] < array[:, 3])
+        )
+        boxes_array = array[candidates]
+        start, end = self.points, np.roll(self.points, -1, axis=0)
+        crossed = _segments_in_boxes(start, end, boxes_array, strict=True).any(axis=1)
+        touched = _segments_in_boxes(start, end, boxes_array, strict=False).any(axis=1)
+        inside = self.contains_points(bbox_centers(boxes_array))
+        result[candidates] = crossed | (~touched & inside)
+
+        for index in candidates[touched & ~crossed].tolist():
+            bx0, by0, bx1, by1 = array[index].tolist()
+            box = BBox.construct(x0=bx0, y0=by0, x1=bx1, y1=by1)
+            result[index] = self.intersection_area(box) > 0
+        return result
@@ -0,0 +1,119 @@
+"""
+
+Resolve `ProjectionClue` objects to the `ProjectionField` they point to.
+
+The projections of a document are indexed once by (pkey, xid), and each
+`ProjectionRoot` indexes its elements by `projection_entry`, see
+`ProjectionRoot.projection_index`, so that a clue is resolved with two lookups
+instead of a scan of the roots and a walk of the path. Keep one resolver per
+document to reuse its index.
+
+Example:
+
+    ::
+
+        resolver = ProjectionResolver(projections)
+        for label in labels:
+            for clue, resolved in zip(label.clues, resolver.resolve_many(label.clues)):
+                if resolved is not None:
+                    print(clue.projection_entry, resolved.token)
+
+"""
+
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from letxbe.type.base import ValueType
+from letxbe.type.clue import ProjectionClue
+from letxbe.type.projection import ProjectionField, ProjectionRoot
+
+
+class ResolvedProjectionClue(NamedTuple):
+    """A `ProjectionClue` and what it points to.
+
+    Attributes:
+        clue (ProjectionClue): The clue.
+        field (ProjectionField): The field at `clue.projection_entry`.
+        token (ValueType): For a string value, the characters from
+            `clue.token_idx` on, `clue.length` of them if it is not 0. Else the
+            value.
+    """
+
+    clue: ProjectionClue
+    field: ProjectionField
+    token: Optional[ValueType]
+
+
+def _token(
+    value: Optional[ValueType], token_idx: int, length: int
+) -> Optional[ValueType]:
+    if not isinstance(value, str):
+        return value
+    return value[token_idx : token_idx + length] if length else value[token_idx:]
+
+
+class ProjectionResolver:
+    """Index of the projections of a document, see the module documentation."""
+
+    def __init__(self, projections: Mapping[str, Sequence[ProjectionRoot]]):
+        """
+        Args:
+            projections (Mapping[str, Sequence[ProjectionRoot]]): Projections of a
+                document, by `pkey`. Where several roots have the same xid, the
+                first one is used.
+        """
+        self.__roots: Dict[Tuple[str, str], ProjectionRoot] = {}
+        for pkey, roots in projections.items():
+            for root in roots:
+                self.__roots.setdefault((pkey, root.xid), root)
+
+    def __len__(self) -> int:
+        return len(self.__roots)
+
+    def root(self, pkey: str, xid: str) -> Optional[ProjectionRoot]:
+        """The `ProjectionRoot` with this xid in the projections of `pkey`."""
+        return self.__roots.get((pkey, xid))
+
+    def resolve(self, clue: ProjectionClue) -> ResolvedProjectionClue:
+        """Find the field a clue points to.
+
+        Raises:
+            KeyError: No root has this pkey and xid, or no field has this
+                projection_entry in the root.
+        """
+        root = self.__roots.get((clue.pkey, clue.xid))
+        if root is None:
+            raise KeyError(f"No ProjectionRoot '{clue.xid}' in '{clue.pkey}'.")
+        field = root.projection_index.get(clue.projection_entry)
+        if not isinstance(field, ProjectionField):
+            raise KeyError(
+                f"No ProjectionField '{clue.projection_entry}' in ProjectionRoot "
+                f"'{clue.xid}' of '{clue.pkey}'."
+            )
+        return ResolvedProjectionClue(
+            clue, field, _token(field.value, clue.token_idx, clue.length)
+        )
+
+    def resolve_many(
+        self, clues: Iterable[object]
+    ) -> List[Optional[ResolvedProjectionClue]]:
+        """Resolve the `ProjectionClue` objects of a sequence of clues, see
+        `resolve`.
+
+        Args:
+            clues (Iterable): Clues, e.g. `Label.clues`, of any type.
+
+        Returns:
+            List[ResolvedProjectionClue or None]: One entry per clue, in order: the
+                resolution of a `ProjectionClue`, or None for other types of clues
+                and for clues that do not point to a field.
+        """
+        resolved: List[Optional[ResolvedProjectionClue]] = []
+        for clue in clues:
+            if not isinstance(clue, ProjectionClue):
+                resolved.append(None)
+                continue
+            try:
+                resolved.append(self.resolve(clue))
+            except KeyError:
+                resolved.append(None)
+        return resolved
@@ -0,0 +1,80 @@
+"""
+
+Helpers to walk the nested `*ResultType` trees of `Prediction`, `Feedback` and `Current`.
+
+Labels are identified by a path built like `__ProjectionBase.projection_entry`:
+keys are joined with dots and list indexes are appended between brackets, e.g.
+``clients[0].client_1`` or ``first names[1]``.
+
+"""
+
+import re
+from typing import Iterator, Tuple, Union
+
+from letxbe.type.base import iter_nodes, join_path
+from letxbe.type.clue import ClueType
+from letxbe.type.label import (
+    CurrentResultType,
+    FeedbackResultType,
+    Label,
+    PredictionResultType,
+    iter_label_lists,
+)
+
+ResultType = Union[PredictionResultType, FeedbackResultType, CurrentResultType]
+
+__all__ = [
+    "ResultType",
+    "clue_key",
+    "field_of",
+    "iter_label_lists",
+    "iter_labels",
+    "join_path",
+]
+
+_INDEX_REGEX = re.compile(r"\[\d+\]")
+
+
+def field_of(path: str) -> str:
+    """Remove list indexes from a label path, so that every value of a field, and
+    every row of a table, share the same field.
+
+    Example:
+        ``field_of("clients[0].client_1") == "clients.client_1"``
+
+    Args:
+        path (str): Path of a label.
+
+    Returns:
+        str: Path of the field the label belongs to.
+    """
+    return _INDEX_REGEX.sub("", path)
+
+
+def clue_key(clue: ClueType) -> Tuple[str, str]:
+    """Hashable key identifying a clue by its type and content.
+
+    Args:
+        clue (ClueType):
+
+    Returns:
+        Tuple[str, str]: Name of the clue type and JSON representation of the clue.
+    """
+    return type(clue).__name__, clue.json()
+
+
+def iter_labels(result: ResultType) -> Iterator[Tuple[str, Label]]:
+    """Iterate over the labels of a result tree, depth first and in key order.
+
+    The tree is walked with an explicit stack, so deep results do not hit the
+    recursion limit.
+
+    Args:
+        result (ResultType): `Prediction.result`, `Feedback.result` or `Current.result`.
+
+    Yields:
+        Tuple[str, Label]: Path of the label and the label itself.
+    """
+    for path, node in iter_nodes(result):
+        if isinstance(node, Label):
+            yield str(path), node
@@ -0,0 +1,320 @@
+"""
+
+Spatial index over the words or lines of the pages of a document.
+
+Boxes are assigned to the cells of a uniform grid covering each page, stored as
+sorted arrays. A query only tests the boxes of the cells it covers, so that its
+cost depends on the number of boxes around the query rather than on the number of
+boxes of the page.
+
+Hits are rows of positions: (page_idx, line_idx, word_idx) for words, as in
+`WordClue`, and (page_idx, line_idx) for lines, where `page_idx` is `Page.page_idx`.
+
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from letxbe.geometry import as_boxes
+from letxbe.page_array import PageArray, array_to_bboxes, stack_words
+from letxbe.type.clue import WordClue
+from letxbe.type.page import BBOX_SCALE, MIN_BBOX_OVERLAP_PROPORTION, BBox, Page
+
+BoxLike = Union[BBox, Tuple[float, float, float, float]]
+
+_BOXES_PER_CELL = 4
+_MAX_GRID_SIZE = 256
+
+
+def _to_tuple(bbox: BoxLike) -> Tuple[float, float, float, float]:
+    if isinstance(bbox, BBox):
+        return bbox.to_tuple()
+    x0, y0, x1, y1 = bbox
+    return x0, y0, x1, y1
+
+
+def _to_page_arrays(pages: Sequence[Union[Page, PageArray]]) -> List[PageArray]:
+    return [
+        page if isinstance(page, PageArray) else PageArray.from_page(page)
+        for page in pages
+    ]
+
+
+class SpatialIndex:
+    """Grid index of boxes spread over several pages.
+
+    Use `SpatialIndex.words` or `SpatialIndex.lines` to index a document.
+    """
+
+    def __init__(self, boxes: npt.ArrayLike, positions: npt.ArrayLike):
+        """
+        Args:
+            boxes (ArrayLike): `(N, 4)` boxes (x0, y0, x1, y1), see
+                `letxbe.geometry`.
+            positions (ArrayLike): `(N, K)` integer positions of the boxes, whose
+                first column is the page index.
+        """
+        self.boxes = as_boxes(boxes)
+        self.positions = np.asarray(positions, dtype=np.intp).reshape(
+            len(self.boxes), -1
+        )
+
+        pages, page_slot = np.unique(self.positions[:, 0], return_inverse=True)
+        self.__page_slots: Dict[int, int] = {
+            page: slot for slot, page in enumerate(pages.tolist())
+        }
+        max_per_page = int(np.bincount(page_slot).max()) if len(page_slot) else 0
+        self.grid_size = int(
+            np.clip(
+                math.ceil(math.sqrt(max_per_page / _BOXES_PER_CELL)), 1, _MAX_GRID_SIZE
+            )
+        )
+        self.cell_size = BBOX_SCALE / self.grid_size
+
+        # every box is listed in each cell it covers
+        cx0, cy0 = self._cells(self.boxes[:, 0]), self._cells(self.boxes[:, 1])
+        cx1, cy1 = self._cells(self.boxes[:, 2]), self._cells(self.boxes[:, 3])
+        widths, heights = cx1 - cx0 + 1, cy1 - cy0 + 1
+        counts = widths * heights
+        box_ids = np.repeat(np.arange(len(self.boxes), dtype=np.intp), counts)
+        rank = np.arange(len(box_ids)) - np.repeat(np.cumsum(counts) - counts, counts)
+        cell_x = cx0[box_ids] + rank % widths[box_ids]
+        cell_y = cy0[box_ids] + rank // widths[box_ids]
+        keys = self._keys(page_slot[box_ids], cell_x, cell_y)
+
+        order = np.argsort(keys, kind="stable")
+        self.__cell_keys = keys[order]
+        self.__cell_box_ids = box_ids[order]
+        self.__rows: Optional[Dict[Tuple[int, ...], int]] = None
+
+    @classmethod
+    def words(cls, pages: Sequence[Union[Page, PageArray]]) -> "SpatialIndex":
+        """Index the words of a document.
+
+        Args:
+            pages (Sequence[Page or PageArray]): Pages of the document.
+
+        Returns:
+            SpatialIndex: Index with (page_idx, line_idx, word_idx) positions.
+        """
+        page_arrays = _to_page_arrays(pages)
+        boxes, positions = stack_words(page_arrays)
+        page_idx = np.array([page.page_idx for page in page_arrays], dtype=np.intp)
+        positions[:, 0] = page_idx[positions[:, 0]]
+        return cls(boxes, positions)
+
+    @classmethod
+    def lines(cls, pages: Sequence[Union[Page, PageArray]]) -> "SpatialIndex":
+        """Index the lines of a document.
+
+        Args:
+            pages (Sequence[Page or PageArray]): Pages of the document.
+
+        Returns:
+            SpatialIndex: Index with (page_idx, line_idx) positions.
+        """
+        page_arrays = _to_page_arrays(pages)
+        boxes = [page.line_bbox for page in page_arrays]
+        positions = [
+            np.column_stack(
+                (
+                    np.full(page.line_count, page.page_idx),
+                    np.arange(page.line_count),
+                )
+            )
+            for page in page_arrays
+        ]
+        return cls(
+            np.concatenate(boxes) if boxes else np.empty((0, 4)),
+            np.concatenate(positions) if positions else np.empty((0, 2)),
+        )
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def _cells(self, coordinates: np.ndarray) -> np.ndarray:
+        cells = np.floor(np.asarray(coordinates) / self.cell_size).astype(np.intp)
+        return np.clip(cells, 0, self.grid_size - 1)
+
+    def _keys(
+        self, page_slot: npt.ArrayLike, cell_x: npt.ArrayLike, cell_y: npt.ArrayLike
+    ) -> np.ndarray:
+        keys: np.ndarray = (
+            np.asarray(page_slot) * self.grid_size + np.asarray(cell_y)
+        ) * self.grid_size + np.asarray(cell_x)
+        return keys
+
+    def _candidates(
+        self, page_idx: int, cx0: int, cy0: int, cx1: int, cy1: int
+    ) -> np.ndarray:
+        """Ids of the boxes listed in the cells `cx0..cx1` x `cy0..cy1` of a page."""
+        slot = self.__page_slots.get(page_idx)
+        if slot is None:
+            return np.empty(0, dtype=np.intp)
+        # cells of a grid row are contiguous keys
+        rows = np.arange(cy0, cy1 + 1)
+        starts = np.searchsorted(self.__cell_keys, self._keys(slot, cx0, rows))
+        ends = np.searchsorted(
+            self.__cell_keys, self._keys(slot, cx1, rows), side="right"
+        )
+        ids = [self.__cell_box_ids[start:end] for start, end in zip(starts, ends)]
+        return np.unique(np.concatenate(ids))
+
+    def _window(self, bbox: BoxLike, page_idx: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Candidate ids around a query box, and their boxes."""
+        x0, y0, x1, y1 = _to_tuple(bbox)
+        cx0, cy0, cx1, cy1 = self._cells(np.array([x0, y0, x1, y1])).tolist()
+        ids = self._candidates(page_idx, cx0, cy0, cx1, cy1)
+        return ids, self.boxes[ids]
+
+    def _hits(self, ids: np.ndarray) -> np.ndarray:
+        hits: np.ndarray = self.positions[ids]
+        return hits
+
+    def intersecting(self, bbox: BoxLike, page_idx: int) -> np.ndarray:
+        """Range query: boxes that intersect or touch `bbox`.
+
+        Args:
+            bbox (BBox or Tuple[float, float, float, float]): Query box, or
+                (x0, y0, x1, y1).
+            page_idx (int): Page of the query.
+
+        Returns:
+            np.ndarray: Positions of the hits, in index order.
+        """
+        x0, y0, x1, y1 = _to_tuple(bbox)
+        ids, boxes = self._window(bbox, page_idx)
+        mask = (
+            (boxes[:, 0] <= x1)
+            & (boxes[:, 2] >= x0)
+            & (boxes[:, 1] <= y1)
+            & (boxes[:, 3] >= y0)
+        )
+        return self._hits(ids[mask])
+
+    def contained_in(self, bbox: BoxLike, page_idx: int) -> np.ndarray:
+        """Boxes contained in `bbox`, see `BBox.contain`, e.g. the words of a
+        `BBoxInPageClue`. See `SpatialIndex.intersecting` for the arguments."""
+        x0, y0, x1, y1 = _to_tuple(bbox)
+        ids, boxes = self._window(bbox, page_idx)
+        mask = (
+            (boxes[:, 0] >= x0)
+            & (boxes[:, 1] >= y0)
+            & (boxes[:, 2] <= x1)
+            & (boxes[:, 3] <= y1)
+        )
+        return self._hits(ids[mask])
+
+    def containing(self, x: float, y: float, page_idx: int) -> np.ndarray:
+        """Boxes that contain the point `(x, y)` of a page.
+
+        Returns:
+            np.ndarray: Positions of the hits, in index order.
+        """
+        return self.intersecting((x, y, x, y), page_idx)
+
+    def overlapping(
+        self,
+        bbox: BoxLike,
+        page_idx: int,
+        threshold: float = MIN_BBOX_OVERLAP_PROPORTION,
+    ) -> np.ndarray:
+        """Boxes that overlap `bbox` along both x and y, see `BBox.x_overlap_with`
+        and `BBox.y_overlap_with`.
+
+        Args:
+            bbox (BBox or Tuple[float, float, float, float]): Query box.
+            page_idx (int): Page of the query.
+            threshold (float): Minimum overlap, as a share of the smallest width
+                (resp. height). Must be positive.
+
+        Returns:
+            np.ndarray: Positions of the hits, in index order.
+        """
+        if threshold < 0:
+            raise ValueError("Threshold must be positive.")
+        x0, y0, x1, y1 = _to_tuple(bbox)
+        ids, boxes = self._window(bbox, page_idx)
+        x_overlap = np.minimum(boxes[:, 2], x1) - np.maximum(boxes[:, 0], x0)
+        y_overlap = np.minimum(boxes[:, 3], y1) - np.maximum(boxes[:, 1], y0)
+        min_width = np.minimum(boxes[:, 2] - boxes[:, 0], x1 - x0)
+        min_height = np.minimum(boxes[:, 3] - boxes[:, 1], y1 - y0)
+        mask = (x_overlap > threshold * min_width) & (
+            y_overlap > threshold * min_height
+        )
+        return self._hits(ids[mask])
+
+    def nearest(
+        self, x: float, y: float, page_idx: int, k: int = 1
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """The `k` boxes nearest to the point `(x, y)` of a page.
+
+        The distance to a box is 0 inside the box, else the euclidean distance to
+        its closest point. Cells are searched in rings around the point, until no
+        unseen box can be closer than the `k` found ones.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Positions of the hits and their distances,
+            from the nearest. Fewer than `k` hits if the page has fewer boxes.
+        """
+        empty = self.positions[:0], np.empty(0)
+        if page_idx not in self.__page_slots or k < 1:
+            return empty
+
+        cx, cy = self._cells(np.array([x, y])).tolist()
+        last = self.grid_size - 1
+        for ring in range(self.grid_size):
+            ids = self._candidates(
+                page_idx,
+                max(cx - ring, 0),
+                max(cy - ring, 0),
+                min(cx + ring, last),
+                min(cy + ring, last),
+            )
+            if len(ids) < k and ring < last:
+                continue
+
+            boxes = self.boxes[ids]
+            dx = np.maximum(np.maximum(boxes[:, 0] - x, 0), x - boxes[:, 2])
+            dy = np.maximum(np.maximum(boxes[:, 1] - y, 0), y - boxes[:, 3])
+            distances = np.hypot(dx, dy)
+            order = np.argsort(distances, kind="stable")[:k]
+            # a box out of the searched cells is at least `ring` cells away
+            if len(order) == k and distances[order[-1]] <= ring * self.cell_size:
+                return self._hits(ids[order]), distances[order]
+            if ring == last:
+                return self._hits(ids[order]), distances[order]
+        return empty
+
+    def to_word_clues(self, hits: np.ndarray) -> List[WordClue]:
+        """Convert word hits to `WordClue` objects, with their `bbox`.
+
+        Args:
+            hits (np.ndarray): (page_idx, line_idx, word_idx) positions returned by
+                a query on `SpatialIndex.words`.
+
+        Returns:
+            List[WordClue]: One clue per hit.
+        """
+        if self.positions.shape[1] != 3:
+            raise ValueError("Only word hits can be converted to WordClue.")
+        if self.__rows is None:
+            self.__rows = {
+                tuple(position): row
+                for row, position in enumerate(self.positions.tolist())
+            }
+        rows = [self.__rows[tuple(position)] for position in hits.tolist()]
+        return [
+            WordClue.construct(
+                page_idx=page_idx,
+                line_idx=line_idx,
+                word_idx=word_idx,
+                bbox=bbox,
+            )
+            for (page_idx, line_idx, word_idx), bbox in zip(
+                hits.tolist(), array_to_bboxes(self.boxes[rows])
+            )
+        ]
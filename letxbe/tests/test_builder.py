@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from letxbe.builder import PredictionBuilder
+from letxbe.type.clue import BBoxInPageClue, PageClue, WordClue
+from letxbe.type.label import Prediction
+
+
+def test_prediction_builder__valid_prediction():
+    # Given
+    builder = PredictionBuilder(model_version="v1.0")
+
+    # When
+    prediction = (
+        builder.add_field(
+            "first names",
+            np.array(["Bohr", "Einstein"]),
+            np.array([12.0, np.nan]),
+            model_version="v1.1",
+        )
+        .add_field("date", np.array([1579474800]), np.array([87.0]), multiple=False)
+        .add_field("flags", np.array([True, False]))
+        .build()
+    )
+
+    # Then
+    prediction_dict = prediction.dict()
+    assert Prediction(**prediction_dict).dict() == prediction_dict
+    assert prediction.model_version == "v1.0"
+
+    first_names = prediction_dict["result"]["first names"]
+    assert [label["value"] for label in first_names] == ["Bohr", "Einstein"]
+    assert [label["score"] for label in first_names] == [12.0, None]
+    assert first_names[0]["model_version"] == "v1.1"
+    assert prediction_dict["result"]["date"]["value"] == 1579474800
+    assert type(prediction_dict["result"]["flags"][0]["value"]) is bool
+
+
+def test_prediction_builder__unique_lids():
+    # When
+    prediction = PredictionBuilder().add_field("ids", np.arange(1000)).build()
+
+    # Then
+    lids = [label.lid for label in prediction.result.__root__["ids"]]
+    assert len(set(lids)) == 1000
+    assert all(len(lid) == 12 for lid in lids)
+
+
+def test_prediction_builder__clues():
+    # When
+    prediction = (
+        PredictionBuilder()
+        .add_field(
+            "words",
+            np.array(["a", "b", "c"]),
+            clue_page_idx=np.array([0, -1, 2]),
+            clue_line_idx=np.array([1, 0, 3]),
+            clue_word_idx=np.array([4, 0, 5]),
+        )
+        .add_field(
+            "boxes",
+            np.array(["d"]),
+            clue_page_idx=np.array([1]),
+            clue_bbox=np.array([[0.1, 0.2, 0.3, 0.4]]),
+        )
+        .add_field("pages", np.array(["e"]), clue_page_idx=np.array([3]))
+        .build()
+    )
+
+    # Then
+    words = prediction.result.__root__["words"]
+    assert words[0].clues == [WordClue(page_idx=0, line_idx=1, word_idx=4)]
+    assert words[1].clues == []
+    boxes = prediction.result.__root__["boxes"]
+    assert isinstance(boxes[0].clues[0], BBoxInPageClue)
+    assert boxes[0].clues[0].bbox.to_tuple() == (0.1, 0.2, 0.3, 0.4)
+    pages = prediction.result.__root__["pages"]
+    assert pages[0].clues == [PageClue(page_idx=3)]
+    assert Prediction(**prediction.dict()).dict() == prediction.dict()
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"values": np.array([1, 2]), "scores": np.array([50.0, 101.0])},
+        {"values": np.array([1, 2]), "scores": np.array([-1.0, 0.0])},
+        {"values": np.array([1, 2]), "scores": np.array([1.0])},
+        {"values": np.array([[1, 2]])},
+        {"values": np.array([1, 2]), "multiple": False},
+        {"values": np.array([object(), 2], dtype=object)},
+        {"values": np.array([1]), "clue_line_idx": np.array([0])},
+        {
+            "values": np.array([1]),
+            "clue_page_idx": np.array([0]),
+            "clue_bbox": np.array([[0.0, 0.0, 2.0, 1.0]]),
+        },
+    ],
+)
+def test_prediction_builder__raise_value_error(kwargs):
+    with pytest.raises(ValueError):
+        PredictionBuilder().add_field("key", **kwargs)
+
+
+def test_prediction_builder__duplicate_key():
+    # Given
+    builder = PredictionBuilder().add_field("key", np.array([1]))
+
+    # Then
+    with pytest.raises(ValueError):
+        builder.add_field("key", np.array([2]))
@@ -0,0 +1,100 @@
+from letxbe.clue_geometry import resolve_word_clues
+from letxbe.page_store import PageStore, write_page_store
+from letxbe.type.clue import PageClue, WordClue
+from letxbe.type.label import LabelPrediction, Prediction
+from letxbe.type.lazy_page import LazyPages
+from letxbe.type.page import BBox
+
+
+def test_resolve_word_clues(page):
+    # Given
+    known = BBox(x0=0, x1=1, y0=0, y1=1)
+    prediction = Prediction(
+        result={
+            "name": LabelPrediction(
+                value="Niels Bohr",
+                clues=[
+                    WordClue(page_idx=0, line_idx=0, word_idx=0),
+                    WordClue(page_idx=0, line_idx=0, word_idx=1),
+                    PageClue(page_idx=0),
+                ],
+            ),
+            "year": [
+                LabelPrediction(
+                    value=1885,
+                    clues=[
+                        WordClue(page_idx=0, line_idx=1, word_idx=3),
+                        WordClue(page_idx=0, line_idx=1, word_idx=4),
+                        WordClue(page_idx=0, line_idx=7, word_idx=0),
+                        WordClue(page_idx=2, line_idx=0, word_idx=0),
+                        WordClue(page_idx=0, line_idx=1, word_idx=0, bbox=known),
+                    ],
+                )
+            ],
+        }
+    )
+    loaded = []
+    pages = LazyPages(lambda position: loaded.append(position) or page, 2)
+
+    # When
+    resolution = resolve_word_clues(prediction.result, pages)
+
+    # Then
+    result = prediction.result.__root__
+    assert resolution.resolved == 3
+    assert loaded == [0]
+    assert result["name"].clues[1].bbox == page.line_list[0].words[1].bbox
+    assert result["year"][0].clues[0].bbox == page.line_list[1].words[3].bbox
+    assert result["year"][0].clues[4].bbox == known
+    assert [(path, reason) for path, _, reason in resolution.unresolved] == [
+        ("year[0]", "word"),
+        ("year[0]", "line"),
+        ("year[0]", "page"),
+    ]
+    assert resolution.unresolved[0].clue.bbox is None
+
+
+def test_resolve_word_clues__overwrite(page):
+    # Given
+    label = LabelPrediction(
+        clues=[
+            WordClue(
+                page_idx=0, line_idx=1, word_idx=0, bbox=BBox(x0=0, x1=1, y0=0, y1=1)
+            )
+        ]
+    )
+    prediction = Prediction(result={"born": label})
+
+    # When
+    resolution = resolve_word_clues(prediction.result, [page], overwrite=True)
+
+    # Then
+    assert resolution.resolved == 1
+    assert label.clues[0].bbox == page.line_list[1].words[0].bbox
+
+
+def test_resolve_word_clues__page_store(page, tmp_path):
+    # Given pages whose indexes are not their positions
+    path = str(tmp_path / "pages.lxb")
+    write_page_store(
+        path, [page.copy(update={"page_idx": index}) for index in (7, 3, 5)]
+    )
+    label = LabelPrediction(
+        clues=[
+            WordClue(page_idx=3, line_idx=0, word_idx=1),
+            WordClue(page_idx=0, line_idx=0, word_idx=0),
+        ]
+    )
+    prediction = Prediction(result={"name": label})
+
+    with PageStore(path) as store:
+        pages = store.lazy_pages()
+
+        # When
+        resolution = resolve_word_clues(prediction.result, pages)
+
+    # Then only the referenced page is loaded
+    assert pages.cached == [1]
+    assert resolution.resolved == 1
+    assert label.clues[0].bbox == page.line_list[0].words[1].bbox
+    assert [reason for _, _, reason in resolution.unresolved] == ["page"]
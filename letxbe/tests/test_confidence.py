@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from letxbe.confidence import (
+    confidence_stats,
+    document_confidence,
+    histogram_edges,
+    region_histogram,
+)
+from letxbe.page_array import PageArray
+from letxbe.type.page import Page
+
+
+@pytest.fixture
+def pages(page):
+    empty = Page(file_uri="empty.png", page_idx=1, line_list=[])
+    return [page, empty, PageArray.from_page(page)]
+
+
+def test_confidence_stats__same_as_numpy():
+    # Given
+    confidences = np.random.default_rng(0).uniform(0, 100, 101)
+
+    # When
+    stats = confidence_stats(confidences, percentiles=(0, 10, 50, 99.5, 100))
+
+    # Then
+    assert stats.size == 101
+    assert stats.mean == pytest.approx(confidences.mean())
+    np.testing.assert_allclose(
+        stats.percentiles, np.percentile(confidences, (0, 10, 50, 99.5, 100))
+    )
+    assert stats.low_share == pytest.approx(np.mean(confidences < 50))
+    np.testing.assert_array_equal(
+        stats.histogram, np.histogram(confidences, histogram_edges())[0]
+    )
+
+
+def test_confidence_stats__empty():
+    # When
+    stats = confidence_stats([])
+
+    # Then
+    assert stats.size == 0
+    assert np.isnan(stats.mean) and np.isnan(stats.low_share)
+    assert np.isnan(stats.percentiles).all()
+    assert stats.histogram.sum() == 0
+
+
+def test_document_confidence__words(pages, page):
+    # Given
+    confidences = [word.confidence for line in page.line_list for word in line.words]
+
+    # When
+    stats = document_confidence(pages)
+
+    # Then
+    assert stats.size.tolist() == [len(confidences), 0, len(confidences)]
+    assert stats.mean[0] == pytest.approx(np.mean(confidences))
+    assert np.isnan(stats.mean[1])
+    np.testing.assert_allclose(
+        stats.percentiles[2], np.percentile(confidences, (5, 25, 50, 75, 95))
+    )
+    assert np.isnan(stats.percentiles[1]).all()
+    assert stats.low_share[0] == pytest.approx(np.mean(np.array(confidences) < 50))
+    np.testing.assert_array_equal(stats.histogram.sum(axis=0), stats.document.histogram)
+    assert stats.document.size == 2 * len(confidences)
+    assert stats.document.mean == pytest.approx(np.mean(confidences))
+
+
+def test_document_confidence__lines(pages, page):
+    # When
+    stats = document_confidence(pages, level="line")
+
+    # Then
+    assert stats.mean[0] == pytest.approx(
+        np.mean([line.confidence for line in page.line_list])
+    )
+
+
+def test_document_confidence__unknown_level(pages):
+    with pytest.raises(ValueError):
+        document_confidence(pages, level="character")
+
+
+def test_region_histogram(page):
+    # When
+    histogram = region_histogram(page, grid=(2, 3))
+    from_array = region_histogram(PageArray.from_page(page), grid=(2, 3))
+
+    # Then
+    word_count = sum(len(line.words) for line in page.line_list)
+    assert histogram.counts.shape == (2, 3, 10)
+    assert histogram.counts.sum() == word_count
+    np.testing.assert_array_equal(histogram.counts, from_array.counts)
+    filled = histogram.counts.sum(axis=2) > 0
+    assert np.isnan(histogram.mean[~filled]).all()
+    assert not np.isnan(histogram.mean[filled]).any()
+    assert np.nansum(histogram.mean * histogram.counts.sum(axis=2)) == pytest.approx(
+        sum(word.confidence for line in page.line_list for word in line.words)
+    )
@@ -0,0 +1,98 @@
+from letxbe.diff import diff_results
+from letxbe.result import iter_labels
+from letxbe.type.clue import PageClue
+from letxbe.type.label import Current, LabelPrediction, Prediction
+from letxbe.utils import generate_short_unique_id
+
+
+def test_diff_results__same_prediction(prediction_dict):
+    # When
+    diff = diff_results(
+        Prediction(**prediction_dict).result, Prediction(**prediction_dict).result
+    )
+
+    # Then
+    assert diff.is_empty
+
+
+def test_diff_results__new_lids_same_values(prediction_dict):
+    # Given
+    old = Prediction(**prediction_dict)
+    new = Prediction(**prediction_dict)
+    new.result.__root__["prenom"].lid = "new-lid"
+
+    # When
+    diff = diff_results(old.result, new.result, compare_lids=True)
+
+    # Then
+    assert diff.added == [] and diff.removed == []
+    assert [change.attributes for change in diff.changed] == [["lid"]]
+
+
+def test_diff_results__repredicted_is_empty(prediction_dict):
+    # Given two predictions of the same values, with their own lids
+    old = Prediction(**prediction_dict)
+    new = Prediction(**prediction_dict)
+    for _, label in iter_labels(new.result):
+        label.lid = generate_short_unique_id()
+
+    # When
+    diff = diff_results(old.result, new.result)
+
+    # Then
+    assert diff.is_empty
+
+
+def test_diff_results__changes(prediction_dict):
+    # Given
+    old = Prediction(**prediction_dict)
+    new = Prediction(**prediction_dict)
+    root = new.result.__root__
+    root["date"].value = 1
+    root["date"].lid = "other-lid"
+    root["prenom"].score = 50.0
+    root["prenom"].clues = [PageClue(page_idx=1)]
+    root["clients"][0].__root__["client_1"].value = True
+    del root["externe"]
+    root["new"] = [LabelPrediction(value="x"), LabelPrediction(value="y")]
+
+    # When
+    diff = diff_results(old.result, new.result, compare_lids=True)
+
+    # Then
+    assert [path for path, _ in diff.added] == ["new[0]", "new[1]"]
+    assert [path for path, _ in diff.removed] == ["externe.fournisseurs.fournisseur_1"]
+    changes = {change.new_path: change for change in diff.changed}
+    assert changes["prenom"].attributes == ["clues", "score"]
+    assert changes["prenom"].added_clues == [PageClue(page_idx=1)]
+    assert len(changes["prenom"].removed_clues) == 1
+    assert changes["date"].attributes == ["lid", "value"]
+    assert changes["clients[0].client_1"].attributes == ["value"]
+
+
+def test_diff_results__bool_is_not_int():
+    # Given
+    old = Prediction(result={"flags": [{"lid": "a", "value": 1}]})
+    new = Prediction(result={"flags": [{"lid": "b", "value": True}]})
+
+    # When
+    diff = diff_results(old.result, new.result)
+
+    # Then
+    assert len(diff.added) == 1 and len(diff.removed) == 1
+
+
+def test_diff_results__prediction_and_current(prediction_dict, current_dict):
+    # When
+    diff = diff_results(
+        Current(**current_dict).result,
+        Prediction(**prediction_dict).result,
+        compare_lids=True,
+    )
+
+    # Then
+    paths = {change.new_path: change.attributes for change in diff.changed}
+    assert paths["prenom"] == ["clues", "lid"]
+    assert paths["clients[0].client_1"] == ["lid", "value"]
+    assert [path for path, _ in diff.added] == ["externe.fournisseurs.fournisseur_1"]
+    assert [path for path, _ in diff.removed] == ["fournisseurs.fournisseur_1"]
@@ -0,0 +1,149 @@
+import pytest
+
+from letxbe.ensemble import MergeStrategy, merge_predictions
+from letxbe.type.label import Prediction
+
+
+def _label(value, score=None, lid=None, **kwargs):
+    label = {"value": value, "score": score, **kwargs}
+    if lid is not None:
+        label["lid"] = lid
+    return label
+
+
+@pytest.fixture
+def predictions():
+    return [
+        Prediction(
+            model_version="a",
+            result={
+                "date": _label(1, 80.0, lid="a-date"),
+                "names": [
+                    _label("Bohr", 60.0, clues=[{"page_idx": 0}]),
+                    _label("Curie", 70.0),
+                ],
+                "address": {"city": _label("Paris", 50.0)},
+                "rows": [{"amount": _label(10, 90.0)}],
+            },
+        ),
+        Prediction(
+            model_version="b",
+            result={
+                "date": _label(2, 90.0, lid="b-date"),
+                "names": [
+                    _label("Bohr", 90.0, clues=[{"page_idx": 1}]),
+                    _label("Bohr", 10.0),
+                    _label(True, 40.0),
+                ],
+                "address": {"city": _label("Paris", 70.0, model_version="b.1")},
+                "rows": [{"amount": _label(11, 30.0)}, {"amount": _label(5, 20.0)}],
+            },
+        ),
+    ]
+
+
+def test_merge_predictions__default_strategies(predictions):
+    # When
+    merged = merge_predictions(predictions)
+
+    # Then
+    assert merged.model_version == "a,b"
+    merged_dict = merged.dict()
+    assert Prediction(**merged_dict).dict() == merged_dict
+
+    root = merged.result.__root__
+    assert (root["date"].lid, root["date"].value, root["date"].score) == (
+        "b-date",
+        2,
+        90.0,
+    )
+    assert [(label.value, label.score) for label in root["names"]] == [
+        ("Bohr", 90.0),
+        ("Curie", 70.0),
+        (True, 40.0),
+    ]
+    assert [clue.page_idx for clue in root["names"][0].clues] == [0, 1]
+    assert root["names"][0].model_version == "a,b"
+    assert root["address"].__root__["city"].model_version == "a,b.1"
+    assert [row.__root__["amount"].value for row in root["rows"]] == [10, 5]
+
+
+def test_merge_predictions__weighted_vote(predictions):
+    # When
+    merged = merge_predictions(
+        predictions,
+        strategies={
+            "date": MergeStrategy.WEIGHTED_VOTE,
+            "names": MergeStrategy.WEIGHTED_VOTE,
+        },
+        weights=[3, 1],
+    )
+
+    # Then
+    root = merged.result.__root__
+    assert root["date"].value == 1
+    assert root["date"].score == pytest.approx(60.0)
+    assert [label.value for label in root["names"]] == ["Bohr", "Curie"]
+    assert [label.score for label in root["names"]] == pytest.approx([67.5, 52.5])
+
+
+def test_merge_predictions__max_score_multiple(predictions):
+    # Given
+    names = predictions[0].result.__root__["names"]
+
+    # When
+    merged = merge_predictions(predictions, strategies={"names": "max_score"})
+
+    # Then the labels of the model with the best mean score are kept as they are
+    merged_names = merged.result.__root__["names"]
+    assert [
+        (label.lid, label.value, label.score, label.clues) for label in merged_names
+    ] == [(label.lid, label.value, label.score, label.clues) for label in names]
+    assert [label.model_version for label in merged_names] == ["a", "a"]
+
+
+def test_merge_predictions__max_score_multiple_repeated_values():
+    # Given a best model predicting the same value twice
+    predictions = [
+        Prediction(
+            model_version="a",
+            result={
+                "names": [
+                    _label("Bohr", 60.0, lid="low", clues=[{"page_idx": 0}]),
+                    _label("Bohr", 90.0, lid="high", clues=[{"page_idx": 1}]),
+                    _label("Curie", 80.0),
+                ]
+            },
+        ),
+        Prediction(model_version="b", result={"names": [_label("Meitner", 10.0)]}),
+    ]
+
+    # When
+    merged = merge_predictions(predictions, strategies={"names": "max_score"})
+
+    # Then the field holds a single label per value, from the best model only
+    names = merged.result.__root__["names"]
+    assert [(label.value, label.score) for label in names] == [
+        ("Bohr", 90.0),
+        ("Curie", 80.0),
+    ]
+    assert names[0].lid == "high"
+    assert [clue.page_idx for clue in names[0].clues] == [0, 1]
+    assert [label.model_version for label in names] == ["a", "a"]
+    merged.assert_unique_values()
+
+
+def test_merge_predictions__raise_value_error(predictions):
+    with pytest.raises(ValueError):
+        merge_predictions(predictions, strategies={"date": MergeStrategy.UNION})
+
+    with pytest.raises(ValueError):
+        merge_predictions(predictions, weights=[1])
+
+    with pytest.raises(ValueError):
+        merge_predictions(
+            [
+                Prediction(result={"a": _label(1)}),
+                Prediction(result={"a": {"b": _label(1)}}),
+            ]
+        )
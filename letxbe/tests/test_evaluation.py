@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from letxbe.evaluation import build_evaluation_table, calibration, evaluate
+from letxbe.type.target import Target
+
+
+@pytest.fixture
+def evaluation_table(target_dict):
+    return build_evaluation_table([Target(**target_dict)])
+
+
+def test_build_evaluation_table(evaluation_table):
+    # Then
+    assert evaluation_table.fields == [
+        "prenom",
+        "date",
+        "clients",
+        "externe.fournisseurs.fournisseur_1",
+    ]
+    assert evaluation_table.field_idx.tolist() == [0, 1, 1, 2, 3]
+    assert evaluation_table.predicted.tolist() == [True, True, False, False, True]
+    assert evaluation_table.correct.tolist() == [True, False, True, True, True]
+    np.testing.assert_array_equal(
+        evaluation_table.score, [100.0, np.nan, np.nan, np.nan, 98.3]
+    )
+
+
+def test_build_evaluation_table__unreviewed_as_valid(target_dict):
+    # When
+    table = build_evaluation_table([Target(**target_dict)], unreviewed_as_valid=True)
+
+    # Then
+    assert "clients.client_1" in table.fields
+    assert len(table.score) == 7
+
+
+def test_evaluate__threshold_sweep(evaluation_table):
+    # When
+    metrics = evaluate(evaluation_table, thresholds=[99, 0])
+
+    # Then
+    np.testing.assert_array_equal(metrics.thresholds, [0, 99])
+    np.testing.assert_array_equal(
+        metrics.true_positive, [[1, 1], [0, 0], [0, 0], [1, 0]]
+    )
+    np.testing.assert_array_equal(
+        metrics.false_positive, [[0, 0], [1, 1], [0, 0], [0, 0]]
+    )
+    np.testing.assert_array_equal(
+        metrics.false_negative, [[0, 0], [1, 1], [1, 1], [0, 1]]
+    )
+    np.testing.assert_array_equal(
+        metrics.precision, [[1, 1], [0, 0], [np.nan, np.nan], [1, np.nan]]
+    )
+    np.testing.assert_array_equal(metrics.recall, [[1, 1], [0, 0], [0, 0], [1, 0]])
+
+
+def test_evaluate__many_documents(target_dict):
+    # Given
+    table = build_evaluation_table(Target(**target_dict) for _ in range(100))
+
+    # When
+    metrics = evaluate(table)
+
+    # Then
+    assert metrics.true_positive[:, 0].tolist() == [100, 0, 0, 100]
+
+
+def test_calibration(evaluation_table):
+    # When
+    curve = calibration(evaluation_table, bins=4)
+
+    # Then
+    assert curve.bin_count.tolist() == [0, 0, 0, 2]
+    assert curve.accuracy[3] == 100
+    assert curve.mean_score[3] == pytest.approx(99.15)
+    assert curve.expected_calibration_error == pytest.approx(0.85)
+    assert np.isnan(curve.accuracy[0])
+
+
+def test_calibration__field(evaluation_table):
+    # When
+    curve = calibration(evaluation_table, bins=2, field="prenom")
+
+    # Then
+    assert curve.bin_count.tolist() == [0, 1]
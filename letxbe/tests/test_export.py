@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from letxbe.export import EXPORT_DTYPE, iter_label_batches, write_parquet
+from letxbe.type.target import Target
+
+
+def test_iter_label_batches(target_dict):
+    # Given
+    target = Target(**target_dict)
+
+    # When
+    batches = list(iter_label_batches([target], sources=["prediction", "feedback"]))
+
+    # Then
+    assert len(batches) == 1
+    batch = batches[0]
+    assert batch.dtype == EXPORT_DTYPE
+    assert list(batch["path"]) == [
+        "prenom",
+        "date",
+        "clients[0].client_1",
+        "clients[0].client_2",
+        "externe.fournisseurs.fournisseur_1",
+        "prenom",
+        "date",
+        "clients[0]",
+        "externe.fournisseurs.fournisseur_1",
+    ]
+    assert set(batch["slug"]) == {"dkjsvkdfvdef"}
+    assert batch["score"][0] == 100.0
+    assert np.isnan(batch["score"][1])
+    assert batch["model_version"][0] == "v0.0"
+    assert batch["vote"][5] == "Valid"
+    assert batch["value_type"][1] == "int"
+
+
+def test_iter_label_batches__bounded_size(target_dict):
+    # Given
+    targets = (Target(**target_dict) for _ in range(3))
+
+    # When
+    batches = list(iter_label_batches(targets, batch_size=4))
+
+    # Then
+    sizes = [len(batch) for batch in batches]
+    assert sum(sizes) == 3 * 14
+    assert all(size <= 4 for size in sizes)
+
+
+def test_iter_label_batches__unknown_source(target_dict):
+    with pytest.raises(ValueError):
+        list(iter_label_batches([Target(**target_dict)], sources=["unknown"]))
+
+
+def test_write_parquet(target_dict, tmp_path):
+    # Given
+    parquet = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "labels.parquet")
+
+    # When
+    count = write_parquet([Target(**target_dict)], path, batch_size=5)
+
+    # Then
+    table = parquet.read_table(path)
+    assert count == table.num_rows == 14
+    assert table.column_names == list(EXPORT_DTYPE.names)
+    assert table.column("value").to_pylist()[1] == "1651363200000"
@@ -0,0 +1,239 @@
+from unittest.mock import Mock
+
+import pytest
+
+from letxbe.feedback import FeedbackBuffer, generate_feedback, merge_feedback_results
+from letxbe.result import iter_labels
+from letxbe.type.api import FeedbackResponse
+from letxbe.type.label import Current, Feedback
+
+
+@pytest.fixture
+def current_multiple():
+    return Current(
+        result={
+            "names": [
+                {"lid": "lid-bohr", "value": "Bohr"},
+                {"lid": "lid-einstein", "value": "Einstein"},
+                {"lid": "lid-one", "value": 1},
+            ],
+            "rows": [
+                {"a": {"lid": "lid-a0", "value": 0}},
+                {"a": {"lid": "lid-a1", "value": 1}},
+            ],
+        }
+    )
+
+
+def test_generate_feedback(current_dict):
+    # Given
+    current = Current(**current_dict)
+    corrected = {
+        "prenom": "Exemplaire",
+        "date": "2022",
+        "clients": [{"client_1": "QWE000", "client_2": None}],
+        "new": ["a", "b"],
+    }
+
+    # When
+    feedback = generate_feedback(current, corrected, source="M2M")
+
+    # Then
+    result = Feedback(**feedback.dict()).dict()["result"]
+    assert set(result) == {"prenom", "date", "clients", "new"}
+    assert result["prenom"]["vote"] == "Valid"
+    assert result["prenom"]["lid"] == "d66f48a0-980c-43ae-a60d-000a48628191"
+    assert result["prenom"]["source"] == "M2M"
+    assert (result["date"]["vote"], result["date"]["value"]) == ("Invalid", "2022")
+    client_2 = result["clients"][0]["client_2"]
+    assert (client_2["vote"], client_2["value"]) == ("Invalid", "QWE125")
+    assert [(label["value"], label["vote"]) for label in result["new"]] == [
+        ("a", "Valid"),
+        ("b", "Valid"),
+    ]
+
+
+def test_generate_feedback__multiple(current_multiple):
+    # When
+    feedback = generate_feedback(
+        current_multiple, {"names": ["Einstein", "Bohr", "Curie", True]}
+    )
+
+    # Then
+    names = feedback.result.__root__["names"]
+    assert [(label.value, label.vote) for label in names] == [
+        ("Einstein", "Valid"),
+        ("Bohr", "Valid"),
+        ("Curie", "Valid"),
+        (True, "Valid"),
+        (1, "Invalid"),
+    ]
+    assert names[0].lid == "lid-einstein"
+    assert names[4].lid == "lid-one"
+
+
+def test_generate_feedback__minimal(current_multiple):
+    # When
+    feedback = generate_feedback(
+        current_multiple,
+        {"names": ["Bohr", "Einstein", 1], "rows": [{"a": 0}]},
+        confirm_unchanged=False,
+    )
+
+    # Then
+    result = feedback.dict()["result"]
+    assert list(result) == ["rows"]
+    assert result["rows"][0] == {}
+    assert result["rows"][1]["a"]["lid"] == "lid-a1"
+    assert result["rows"][1]["a"]["vote"] == "Invalid"
+
+
+def test_generate_feedback__nothing_to_share(current_multiple):
+    # When
+    feedback = generate_feedback(
+        current_multiple, {"names": ["Bohr", "Einstein", 1]}, confirm_unchanged=False
+    )
+
+    # Then
+    assert feedback.dict()["result"] == {}
+
+
+@pytest.mark.parametrize(
+    "corrected",
+    [{"names": {"a": 1}}, {"rows": [1, 2]}, {"rows": "value"}],
+)
+def test_generate_feedback__raise_value_error(current_multiple, corrected):
+    with pytest.raises(ValueError):
+        generate_feedback(current_multiple, corrected)
+
+
+def _feedback(**result):
+    return Feedback(result=result)
+
+
+@pytest.fixture
+def mock_lxb__feedback():
+    lxb = Mock()
+    lxb.post_feedback.side_effect = lambda atms, doc, feedback: FeedbackResponse(
+        updated_labels=[label.lid for _, label in iter_labels(feedback.result)]
+    )
+    return lxb
+
+
+def test_merge_feedback_results():
+    # Given
+    old = _feedback(
+        a={"lid": "a", "value": 1},
+        names=[{"lid": "x", "value": "X"}, {"lid": "y", "value": "Y"}],
+        rows=[{"b": {"lid": "b0", "value": 0}}],
+    )
+    new = _feedback(
+        a={"lid": "a", "value": 2, "vote": "Invalid"},
+        names=[
+            {"lid": "y", "value": "Y", "vote": "Invalid"},
+            {"lid": "z", "value": "Z"},
+        ],
+        rows=[{"c": {"lid": "c0", "value": 0}}, {"b": {"lid": "b1", "value": 1}}],
+    )
+
+    # When
+    merged = merge_feedback_results(old.result, new.result)
+
+    # Then
+    assert [path for path, _ in iter_labels(merged)] == [
+        "a",
+        "names[0]",
+        "names[1]",
+        "names[2]",
+        "rows[0].b",
+        "rows[0].c",
+        "rows[1].b",
+    ]
+    root = merged.__root__
+    assert root["a"].value == 2
+    assert [(label.lid, label.vote) for label in root["names"]] == [
+        ("x", "Valid"),
+        ("y", "Invalid"),
+        ("z", "Valid"),
+    ]
+    assert old.result.__root__["names"][1].vote == "Valid"
+
+
+def test_feedback_buffer__flush_on_size(mock_lxb__feedback):
+    # Given
+    buffer = FeedbackBuffer(mock_lxb__feedback, max_feedbacks=3, max_age=3600)
+
+    # When
+    responses = [
+        buffer.add("atms", "doc", _feedback(a={"lid": "a", "value": i}))
+        for i in range(3)
+    ]
+
+    # Then
+    assert [response.updated_labels for response in responses] == [[], [], ["a"]]
+    mock_lxb__feedback.post_feedback.assert_called_once()
+    feedback = mock_lxb__feedback.post_feedback.call_args.args[2]
+    assert feedback.result.__root__["a"].value == 2
+    assert len(buffer) == 0
+
+
+def test_feedback_buffer__flush_on_age(mock_lxb__feedback):
+    # Given
+    buffer = FeedbackBuffer(mock_lxb__feedback, max_age=0)
+
+    # When
+    response = buffer.add("atms", "doc", _feedback(a={"lid": "a", "value": 1}))
+
+    # Then
+    assert response.updated_labels == ["a"]
+
+
+def test_feedback_buffer__flush(mock_lxb__feedback):
+    # Given
+    with FeedbackBuffer(mock_lxb__feedback, max_age=3600) as buffer:
+        buffer.add(
+            "atms", "doc-1", Feedback(comment="first", result={"a": {"lid": "a"}})
+        )
+        buffer.add(
+            "atms", "doc-1", Feedback(comment="second", result={"b": {"lid": "b"}})
+        )
+        buffer.add("atms", "doc-2", _feedback(c={"lid": "c"}))
+
+        # When
+        response = buffer.flush(document_slug="doc-1")
+
+        # Then
+        assert response.updated_labels == ["a", "b"]
+        feedback = mock_lxb__feedback.post_feedback.call_args.args[2]
+        assert feedback.comment == "first\nsecond"
+        assert len(buffer) == 1
+
+    assert mock_lxb__feedback.post_feedback.call_count == 2
+    assert len(buffer) == 0
+
+
+def test_feedback_buffer__keep_pending_on_error(mock_lxb__feedback):
+    # Given
+    buffer = FeedbackBuffer(mock_lxb__feedback, max_age=3600)
+    buffer.add("atms", "doc", _feedback(a={"lid": "a"}))
+    mock_lxb__feedback.post_feedback.side_effect = ValueError()
+
+    # Then
+    with pytest.raises(ValueError):
+        buffer.flush()
+    assert len(buffer) == 1
+
+
+def test_feedback_buffer__no_flush_on_exception(mock_lxb__feedback):
+    # Given
+    buffer = FeedbackBuffer(mock_lxb__feedback, max_age=3600)
+
+    # When
+    with pytest.raises(KeyError):
+        with buffer:
+            buffer.add("atms", "doc", _feedback(a={"lid": "a"}))
+            raise KeyError()
+
+    # Then
+    mock_lxb__feedback.post_feedback.assert_not_called()
+    assert len(buffer) == 1
@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from letxbe.fingerprint import FingerprintStore, fingerprint
+from letxbe.type.label import Feedback, Prediction
+
+
+def test_fingerprint__ignores_lids(prediction_dict):
+    # Given
+    prediction = Prediction(**prediction_dict)
+    other = Prediction(**prediction_dict)
+    other.result.__root__["prenom"].lid = "other-lid"
+
+    # Then
+    assert fingerprint(prediction) == fingerprint(other)
+
+
+def test_fingerprint__content_changes(prediction_dict, feedback_dict):
+    # Given
+    prediction = Prediction(**prediction_dict)
+    other = Prediction(**prediction_dict)
+    other.result.__root__["prenom"].score = 1.0
+
+    # Then
+    assert fingerprint(prediction) != fingerprint(other)
+    assert fingerprint(Feedback(**feedback_dict)) != fingerprint(prediction)
+
+
+def test_fingerprint__result_key_named_lid():
+    # Given
+    prediction = Prediction(result={"lid": {"value": 1}})
+    other = Prediction(result={"lid": {"value": 2}})
+
+    # Then
+    assert fingerprint(prediction) != fingerprint(other)
+
+
+def test_fingerprint_store(tmp_path):
+    # Given
+    path = str(tmp_path / "fingerprints.db")
+    store = FingerprintStore(path)
+
+    # When
+    store.set("prediction", "atms", "doc", "abc")
+    store.set("prediction", "atms", "doc", "def")
+    store.close()
+
+    # Then
+    store = FingerprintStore(path)
+    assert store.get("prediction", "atms", "doc") == "def"
+    assert store.get("feedback", "atms", "doc") is None
+
+
+def test_fingerprint_store__threads():
+    # Given
+    store = FingerprintStore(":memory:")
+
+    # When fingerprints are stored from worker threads
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(
+            executor.map(
+                lambda index: store.set("prediction", "atms", f"doc-{index}", "abc"),
+                range(20),
+            )
+        )
+
+    # Then
+    assert all(
+        store.get("prediction", "atms", f"doc-{index}") == "abc" for index in range(20)
+    )
@@ -0,0 +1,92 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from letxbe.geometry import (
+    bbox_areas,
+    bbox_centers,
+    contain_matrix,
+    iou_matrix,
+    x_overlap_matrix,
+    y_overlap_matrix,
+)
+from letxbe.page_array import PageArray, bboxes_to_array
+from letxbe.type.page import BBox
+
+
+def _words(page):
+    return [word.bbox for line in page.line_list for word in line.words]
+
+
+@pytest.fixture
+def bboxes(page):
+    return [line.bbox for line in page.line_list] + [
+        word.bbox for line in page.line_list for word in line.words
+    ]
+
+
+def test_pairwise_matrices__same_as_bbox(bboxes):
+    # Given
+    boxes = bboxes_to_array(bboxes)
+
+    # When
+    x_overlap = x_overlap_matrix(boxes, boxes)
+    y_overlap = y_overlap_matrix(boxes, boxes, threshold=0.5)
+    contains = contain_matrix(boxes, boxes)
+
+    # Then
+    for (i, a), (j, b) in itertools.product(enumerate(bboxes), repeat=2):
+        assert x_overlap[i, j] == a.x_overlap_with(b)
+        assert y_overlap[i, j] == a.y_overlap_with(b, threshold=0.5)
+        assert contains[i, j] == a.contain(b)
+
+
+def test_areas_and_centers(page):
+    # Given
+    boxes = PageArray.from_page(page).word_bbox
+
+    # Then
+    assert np.allclose(bbox_areas(boxes), [bbox.area for bbox in _words(page)])
+    assert np.allclose(bbox_centers(boxes), [bbox.center for bbox in _words(page)])
+
+
+def test_iou_matrix():
+    # Given
+    a = [[0, 0, 0.5, 0.5], [0, 0, 0, 0]]
+    b = [[0, 0, 0.5, 0.5], [0.25, 0, 0.75, 0.5], [0.6, 0.6, 1, 1]]
+
+    # When
+    iou = iou_matrix(a, b)
+
+    # Then
+    assert np.allclose(iou, [[1, 1 / 3, 0], [0, 0, 0]])
+
+
+def test_matrices__across_pages():
+    # Given
+    boxes = [[0, 0, 0.5, 0.5], [0, 0, 0.5, 0.5]]
+    pages = [0, 1]
+
+    # Then
+    assert x_overlap_matrix(
+        boxes, boxes, a_page_idx=pages, b_page_idx=pages
+    ).tolist() == [
+        [True, False],
+        [False, True],
+    ]
+    assert np.allclose(iou_matrix(boxes, boxes, pages, pages), np.eye(2))
+    with pytest.raises(ValueError):
+        contain_matrix(boxes, boxes, a_page_idx=pages)
+
+
+def test_as_boxes__wrong_shape():
+    with pytest.raises(ValueError):
+        bbox_areas([[0, 0, 1]])
+    assert bbox_areas([]).shape == (0,)
+
+
+def test_bboxes_to_array():
+    assert bboxes_to_array([BBox(x0=0.1, x1=0.2, y0=0.3, y1=0.4)]).tolist() == [
+        [0.1, 0.3, 0.2, 0.4]
+    ]
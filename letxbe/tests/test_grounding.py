@@ -0,0 +1,128 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from letxbe.grounding import ValueGrounder, date_variants, number_variants
+from letxbe.type.clue import PageClue
+from letxbe.type.label import LabelPrediction, Prediction
+from letxbe.type.page import BBox, Line, Page, Word
+
+
+def _amount_page(caption):
+    words = [
+        Word(
+            word_caption=part,
+            bbox=BBox(x0=0.1 * index, y0=0.1, x1=0.1 * index + 0.08, y1=0.12),
+            confidence=90,
+        )
+        for index, part in enumerate(["Total", *caption.split()])
+    ]
+    line = Line(
+        words=words,
+        line_caption=" ".join(word.word_caption for word in words),
+        bbox=BBox(x0=0, y0=0.1, x1=1, y1=0.12),
+        confidence=90,
+    )
+    return Page(file_uri="invoice.png", page_idx=0, line_list=[line])
+
+
+def test_variants():
+    assert number_variants(1234.5) == [
+        "1234.5",
+        "1234.50",
+        "1 234.50",
+        "1,234.50",
+        "1234,50",
+        "1 234,50",
+        "1.234,50",
+    ]
+    assert number_variants(12.5) == ["12.5", "12.50", "12,50"]
+    assert number_variants(1885)[:3] == ["1885", "1885.00", "1 885.00"]
+    assert "7 octobre 1885" in date_variants(datetime(1885, 10, 7))
+
+
+def test_value_grounder__find(page):
+    # Given
+    grounder = ValueGrounder([page], min_similarity=0.4)
+    birth = int(datetime(1885, 10, 7, tzinfo=timezone.utc).timestamp())
+
+    # When
+    exact = grounder.find("Niels BOHR")
+    approximate = grounder.find("Nils Bohr")
+    date = grounder.find(birth, field="birth")
+    grounder.date_fields.add("birth")
+    timestamp_date = grounder.find(birth, field="birth")
+
+    # Then
+    assert exact.similarity == 1
+    assert [(clue.value, clue.word_idx) for clue in exact.clues] == [
+        ("Niels", 0),
+        ("Bohr", 1),
+    ]
+    assert exact.clues[0].bbox == page.line_list[0].words[0].bbox
+    assert 0.4 < approximate.similarity < 1
+    assert [clue.value for clue in approximate.clues] == ["Niels", "Bohr"]
+    assert date is None
+    assert [clue.value for clue in timestamp_date.clues] == ["7", "October", "1885"]
+    assert [clue.value for clue in grounder.find("1885-10-07").clues] == [
+        "7",
+        "October",
+        "1885",
+    ]
+    assert grounder.find(1886) is None
+    assert grounder.find(18.85) is None
+    assert grounder.find(True) is None
+
+
+@pytest.mark.parametrize(
+    "caption", ["1234.50", "1 234.50", "1,234.50", "1234,50", "1 234,50", "1.234,50"]
+)
+def test_value_grounder__number_formats(caption):
+    # Given
+    grounder = ValueGrounder([_amount_page(caption)])
+
+    # When
+    match = grounder.find(1234.5)
+
+    # Then
+    assert [clue.value for clue in match.clues] == caption.split()
+    assert match.similarity == 1
+    assert grounder.find(123450) is None
+
+
+def test_value_grounder__timestamp_guard(page):
+    # Given
+    grounder = ValueGrounder([page], date_fields={"birth"})
+    birth = int(datetime(1885, 10, 7, tzinfo=timezone.utc).timestamp())
+
+    # When
+    milliseconds = grounder.find(birth * 1000, field="birth")
+    out_of_range = grounder.variants(10**20, field="birth")
+
+    # Then
+    assert [clue.value for clue in milliseconds.clues] == ["7", "October", "1885"]
+    assert out_of_range == number_variants(10**20)
+
+
+def test_value_grounder__ground(page):
+    # Given
+    prediction = Prediction(
+        result={
+            "name": LabelPrediction(value="Niels Bohr"),
+            "year": [LabelPrediction(value=1885), LabelPrediction(value=1886)],
+            "known": LabelPrediction(value="Bohr", clues=[PageClue(page_idx=0)]),
+        }
+    )
+    grounder = ValueGrounder([page])
+
+    # When
+    grounded = grounder.ground(prediction)
+
+    # Then
+    result = prediction.result.__root__
+    assert grounded == 2
+    assert len(result["name"].clues) == 2
+    assert result["year"][0].clues[0].word_idx == 3
+    assert result["year"][1].clues == []
+    assert result["known"].clues == [PageClue(page_idx=0)]
+    assert Prediction(**prediction.dict()) == prediction
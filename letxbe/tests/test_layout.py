@@ -0,0 +1,127 @@
+import math
+
+from letxbe.layout import build_lines, reading_order, rebuild_lines
+from letxbe.page_array import bboxes_to_array
+from letxbe.type.page import BBox, ImageProperties, Word
+
+
+def _word(caption, x0, y0, x1, y1):
+    return Word(
+        word_caption=caption,
+        bbox=BBox(x0=x0, y0=y0, x1=x1, y1=y1),
+        confidence=90,
+    )
+
+
+def test_rebuild_lines(page):
+    # Given
+    shuffled = page.copy(
+        update={
+            "line_list": [
+                line.copy(update={"words": line.words[::-1]})
+                for line in page.line_list[::-1]
+            ]
+        }
+    )
+
+    # When
+    rebuilt = rebuild_lines(shuffled)
+
+    # Then
+    assert [line.line_caption for line in rebuilt.line_list] == [
+        "Niels Bohr",
+        "born 7 October 1885",
+    ]
+    assert rebuilt.line_list[1].bbox == page.line_list[1].bbox
+    assert rebuilt.line_list[0].confidence == 95
+    assert rebuilt.line_list[1].rotation is None
+
+
+def test_build_lines__columns():
+    # Given
+    words = [
+        _word("Title", 0.1, 0.05, 0.9, 0.08),
+        _word("left", 0.1, 0.1, 0.2, 0.12),
+        _word("one", 0.22, 0.1, 0.3, 0.12),
+        _word("right", 0.6, 0.1, 0.7, 0.12),
+        _word("one", 0.72, 0.1, 0.8, 0.12),
+        _word("left", 0.1, 0.15, 0.2, 0.17),
+        _word("two", 0.22, 0.15, 0.3, 0.17),
+        _word("right", 0.6, 0.15, 0.7, 0.17),
+        _word("two", 0.72, 0.15, 0.8, 0.17),
+    ]
+
+    # When
+    lines = build_lines(words[::-1])
+    rows = build_lines(words, max_word_gap=None)
+
+    # Then
+    assert [line.line_caption for line in lines] == [
+        "Title",
+        "left one",
+        "left two",
+        "right one",
+        "right two",
+    ]
+    assert [line.line_caption for line in rows] == [
+        "Title",
+        "left one right one",
+        "left two right two",
+    ]
+
+
+def test_build_lines__rotation():
+    # Given words along two lines rotated by 10 degrees counter-clockwise
+    angle = math.radians(10)
+    words = []
+    for row, y in enumerate((0.3, 0.5)):
+        for index in range(4):
+            x = 0.2 + 0.15 * index
+            center_y = y - (x - 0.2) * math.tan(angle)
+            words.append(
+                _word(f"{row}{index}", x, center_y - 0.01, x + 0.1, center_y + 0.01)
+            )
+    properties = ImageProperties(size=[1000, 1000], rotation=10)
+
+    # When
+    lines = build_lines(words, properties)
+
+    # Then
+    assert len(build_lines(words)) > 2
+    assert [line.line_caption for line in lines] == ["00 01 02 03", "10 11 12 13"]
+    assert lines[0].rotation == 10
+
+
+def test_reading_order():
+    boxes = bboxes_to_array(
+        [
+            BBox(x0=0.6, y0=0.1, x1=0.9, y1=0.2),
+            BBox(x0=0.1, y0=0.3, x1=0.4, y1=0.4),
+            BBox(x0=0.1, y0=0.1, x1=0.4, y1=0.2),
+        ]
+    )
+    assert reading_order(boxes).tolist() == [2, 1, 0]
+    assert reading_order(boxes, columns=False).tolist() == [2, 0, 1]
+
+
+def test_build_lines__tall_word_and_many_rows():
+    # Given a title, two columns of many rows, and a word as tall as half the page
+    # below them
+    row_count = 2000
+    height = 0.4 / row_count
+    words = [_word("Title", 0.0, 0.0, 0.9, 0.02), _word("tall", 0.0, 0.5, 0.02, 1.0)]
+    for row in range(row_count):
+        y0 = 0.05 + row * height
+        words.append(_word(f"l{row}", 0.1, y0, 0.3, y0 + height * 0.8))
+        words.append(_word(f"r{row}", 0.6, y0, 0.8, y0 + height * 0.8))
+
+    # When
+    lines = build_lines(words)
+
+    # Then
+    captions = [line.line_caption for line in lines]
+    assert len(captions) == 2 * row_count + 2
+    assert captions[0] == "Title"
+    assert captions[1 : row_count + 1] == [f"l{row}" for row in range(row_count)]
+    assert captions[row_count + 1 : -1] == [f"r{row}" for row in range(row_count)]
+    assert captions[-1] == "tall"
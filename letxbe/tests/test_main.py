@@ -6,7 +6,7 @@ from requests import Response
 
 from letxbe.exception import UnauthorizedError
 from letxbe.main import LXB
-from letxbe.type import Metadata
+from letxbe.type import Feedback, Metadata, Prediction
 
 
 @patch("letxbe.main.requests.post")
@@ -77,3 +77,49 @@ def test_lxb___verify_status_code_success(mock_lxb):
         mock_lxb._verify_status_code(resp)
 
     assert f"Request failed with code {resp.status_code}" in str(exc_info.value)
+
+
+def test_lxb__post_prediction__skip_if_unchanged(
+    mock_lxb__fingerprint_store, mock_session__post, prediction_dict
+):
+    # Given
+    prediction = Prediction(**prediction_dict)
+    other = Prediction(**prediction_dict)
+    other.result.__root__["prenom"].lid = "other-lid"
+
+    # When
+    mock_lxb__fingerprint_store.post_prediction("atms", "doc", prediction)
+    mock_lxb__fingerprint_store.post_prediction(
+        "atms", "doc", other, skip_if_unchanged=True
+    )
+    mock_lxb__fingerprint_store.post_prediction(
+        "atms", "other-doc", other, skip_if_unchanged=True
+    )
+
+    # Then
+    assert mock_session__post.call_count == 2
+
+
+@patch("letxbe.main.FeedbackResponse.parse_obj")
+def test_lxb__post_feedback__skip_if_unchanged(
+    mock_parse_obj, mock_lxb__fingerprint_store, feedback_dict
+):
+    # Given
+    feedback = Feedback(**feedback_dict)
+
+    # When
+    mock_lxb__fingerprint_store.post_feedback("atms", "doc", feedback)
+    response = mock_lxb__fingerprint_store.post_feedback(
+        "atms", "doc", feedback, skip_if_unchanged=True
+    )
+
+    # Then
+    mock_parse_obj.assert_called_once()
+    assert response.updated_labels == []
+
+
+def test_lxb__post_prediction__skip_without_store(mock_lxb__mocked_session):
+    with pytest.raises(ValueError):
+        mock_lxb__mocked_session.post_prediction(
+            "atms", "doc", Prediction(), skip_if_unchanged=True
+        )
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from letxbe.page_array import PageArray, StringTable, stack_words
+
+
+def test_string_table():
+    # When
+    table = StringTable.from_strings(["Niels", "", "Bohr"])
+
+    # Then
+    assert len(table) == 3
+    assert table.text == "NielsBohr"
+    assert table[0] == "Niels"
+    assert table[1] == ""
+    assert table[-1] == "Bohr"
+    assert list(table) == ["Niels", "", "Bohr"]
+    with pytest.raises(IndexError):
+        _ = table[3]
+
+
+def test_page_array__round_trip(page, page_dict):
+    # When
+    page_array = PageArray.from_page(page)
+
+    # Then
+    assert page_array.line_count == 3
+    assert page_array.word_count == 6
+    assert page_array.word_bbox.shape == (6, 4)
+    assert page_array.word_bbox[1].tolist() == [0.25, 0.1, 0.4, 0.15]
+    assert np.isnan(page_array.line_rotation[0])
+    assert page_array.word_line_idx.tolist() == [0, 0, 1, 1, 1, 1]
+    assert page_array.word_idx.tolist() == [0, 1, 0, 1, 2, 3]
+    assert page_array.word_captions[page_array.word_position(1, 2)] == "October"
+    assert page_array.to_page() == page
+    assert page_array.to_page().dict(by_alias=True) == page_dict
+
+
+def test_stack_words(page):
+    # Given
+    page_array = PageArray.from_page(page)
+
+    # When
+    boxes, positions = stack_words([page_array, page_array])
+
+    # Then
+    assert boxes.shape == (12, 4)
+    assert positions[7].tolist() == [1, 0, 1]
@@ -0,0 +1,85 @@
+import pytest
+
+from letxbe.page_store import PageStore, write_page_store
+from letxbe.type.page import Page
+
+
+@pytest.fixture
+def pages(page_dict):
+    second_page = dict(page_dict, page_idx=4, image_properties=None)
+    second_page["line_list"] = page_dict["line_list"][1:]
+    return [Page(**page_dict), Page(**second_page)]
+
+
+def test_page_store__round_trip(pages, tmp_path):
+    # Given
+    path = str(tmp_path / "pages.lxb")
+
+    # When
+    count = write_page_store(path, pages)
+
+    # Then
+    assert count == 2
+    with PageStore(path) as store:
+        assert len(store) == 2
+        assert [store[0], store[1]] == pages
+        assert store[1].dict(by_alias=True) == pages[1].dict(by_alias=True)
+        assert store.position(4) == 1
+        assert store.word_captions(0, start=1, stop=4) == ["Bohr", "born", "7"]
+        assert store.word_range(1, start=-1)["confidence"].tolist() == [88.5]
+        with pytest.raises(IndexError):
+            store.page(2)
+
+
+def test_page_store__chunks(pages, tmp_path):
+    # Given
+    many_pages = pages * 10
+    path = tmp_path / "pages.lxb"
+    chunked_path = tmp_path / "chunked.lxb"
+    write_page_store(str(path), many_pages)
+
+    # When pages are streamed and records written by chunks of 3
+    count = write_page_store(str(chunked_path), iter(many_pages), chunk_size=3)
+
+    # Then
+    assert count == 20
+    assert chunked_path.read_bytes() == path.read_bytes()
+    with PageStore(str(chunked_path)) as store:
+        assert store[19] == pages[1]
+    assert sorted(tmp_path.iterdir()) == [chunked_path, path]
+
+
+def test_page_store__not_a_store(tmp_path):
+    # Given
+    path = tmp_path / "pages.json"
+    path.write_bytes(b"[]" * 40)
+
+    # Then
+    with pytest.raises(ValueError):
+        PageStore(str(path))
+
+
+def test_page_store__empty(tmp_path):
+    # Given
+    path = str(tmp_path / "pages.lxb")
+
+    # When
+    write_page_store(path, [])
+
+    # Then
+    assert len(PageStore(path)) == 0
+
+
+def test_page_store__lazy_pages(pages, tmp_path):
+    # Given
+    path = str(tmp_path / "pages.lxb")
+    write_page_store(path, pages)
+
+    # When
+    lazy_pages = PageStore(path).lazy_pages(max_cached=1, validate=True)
+
+    # Then
+    assert lazy_pages.cached == []
+    assert lazy_pages[1] == pages[1]
+    assert lazy_pages.cached == [1]
+    assert list(lazy_pages) == pages
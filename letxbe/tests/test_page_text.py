@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from letxbe.page_array import PageArray
+from letxbe.page_text import PageTextRenderer, join_rendered, render_page
+from letxbe.type.page import Page
+
+
+@pytest.fixture
+def empty_page():
+    return Page(file_uri="empty.png", page_idx=1, line_list=[])
+
+
+def _expected_text(page):
+    return "\n".join(
+        " ".join(word.word_caption for word in line.words) for line in page.line_list
+    )
+
+
+def test_render_page(page):
+    # When
+    rendered = render_page(page)
+
+    # Then
+    assert rendered.text == _expected_text(page)
+    for start, end, (page_idx, line_idx, word_idx) in zip(
+        rendered.word_start.tolist(),
+        rendered.word_end.tolist(),
+        rendered.positions.tolist(),
+    ):
+        word = page.line_list[line_idx].words[word_idx]
+        assert rendered.text[start:end] == word.word_caption
+        assert page_idx == page.page_idx
+
+
+def test_render_page__page_array_and_empty_page(page, empty_page):
+    assert render_page(PageArray.from_page(page)).text == render_page(page).text
+    assert render_page(empty_page).text == ""
+    assert len(render_page(empty_page)) == 0
+
+
+def test_render_page__reorder(page):
+    # Given the lines in reverse order
+    reversed_page = page.copy(update={"line_list": page.line_list[::-1]})
+
+    # When
+    rendered = render_page(reversed_page, reorder=True)
+
+    # Then
+    assert rendered.text == render_page(page, reorder=True).text
+    assert np.all(np.diff(rendered.word_start) > 0)
+
+
+def test_rendered_text__locate_and_search(page):
+    # Given
+    rendered = render_page(page)
+    start = rendered.text.index("October")
+
+    # Then
+    assert rendered.locate(start + 2) == (page.page_idx, 1, 2)
+    assert rendered.locate(start - 1) is None
+
+    (clues,) = rendered.search(r"\d+ October")
+    assert [(clue.line_idx, clue.word_idx) for clue in clues] == [(1, 1), (1, 2)]
+    assert clues[0].bbox == page.line_list[1].words[1].bbox
+
+
+def test_render_document(page, empty_page):
+    # Given
+    renderer = PageTextRenderer()
+    second = page.copy(update={"page_idx": 2})
+
+    # When
+    rendered = renderer.render_document([page, empty_page, second])
+
+    # Then
+    assert rendered.text == "\f".join(
+        [_expected_text(page), "", _expected_text(second)]
+    )
+    assert rendered.page_start.tolist() == [
+        0,
+        len(_expected_text(page)) + 1,
+        len(_expected_text(page)) + 2,
+    ]
+    assert [clue.page_idx for clues in rendered.search("Bohr") for clue in clues] == [
+        0,
+        2,
+    ]
+    assert join_rendered([]).text == ""
+
+
+def test_page_text_renderer__cache(page):
+    # Given
+    renderer = PageTextRenderer(max_cached=1)
+
+    # Then
+    assert renderer.render(page) is renderer.render(page)
+    first = renderer.render(page)
+    renderer.render(page.copy())
+    assert renderer.render(page) is not first
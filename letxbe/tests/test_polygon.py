@@ -0,0 +1,171 @@
+import numpy as np
+import pytest
+
+from letxbe.geometry import bbox_centers
+from letxbe.page_array import PageArray
+from letxbe.polygon import Polygon
+from letxbe.type.clue import ShapeClue
+from letxbe.type.page import BBox
+
+# L-shaped polygon, of area 0.3 * 0.1 + 0.1 * 0.2
+L_SHAPE = [(0.1, 0.1), (0.4, 0.1), (0.4, 0.2), (0.2, 0.2), (0.2, 0.4), (0.1, 0.4)]
+
+
+@pytest.fixture
+def shape_clue():
+    return ShapeClue(
+        page_idx=0,
+        value="",
+        bbox=BBox(x0=0.1, y0=0.1, x1=0.4, y1=0.4),
+        polygon=L_SHAPE,
+    )
+
+
+def test_polygon__area_and_bounds(shape_clue):
+    # When
+    polygon = Polygon.from_shape_clue(shape_clue)
+
+    # Then
+    assert len(polygon) == 6
+    assert polygon.area == pytest.approx(0.05)
+    assert polygon.bounds == shape_clue.bbox
+
+
+def test_polygon__empty_polygon_is_bbox():
+    # Given
+    bbox = BBox(x0=0.1, y0=0.2, x1=0.5, y1=0.4)
+    shape_clue = ShapeClue(page_idx=0, value="", bbox=bbox)
+
+    # When
+    polygon = Polygon.from_shape_clue(shape_clue)
+
+    # Then
+    assert polygon.area == pytest.approx(bbox.area)
+    assert polygon.bounds == bbox
+
+
+def test_polygon__round_trip(shape_clue):
+    # Given
+    polygon = Polygon.from_shape_clue(shape_clue)
+
+    # When
+    copy = polygon.to_shape_clue(page_idx=0)
+
+    # Then
+    assert copy.json() == shape_clue.json()
+    assert ShapeClue.parse_raw(copy.json()) == shape_clue
+
+
+def test_polygon__round_trip_flat_coco():
+    # Given coordinates of a flat COCO sequence
+    flat = [(coordinate,) for point in L_SHAPE for coordinate in point]
+    shape_clue = ShapeClue(
+        page_idx=0, value="", bbox=BBox(x0=0.1, y0=0.1, x1=0.4, y1=0.4), polygon=flat
+    )
+
+    # When
+    polygon = Polygon.from_shape_clue(shape_clue)
+
+    # Then
+    assert polygon.points.tolist() == [list(point) for point in L_SHAPE]
+    assert polygon.to_polygon() == flat
+    assert polygon.to_shape_clue(page_idx=0) == shape_clue
+    assert Polygon(polygon.points).to_polygon() == L_SHAPE
+
+
+def test_polygon__to_shape_clue_keeps_validation():
+    with pytest.raises(ValueError):
+        Polygon([(0.1, 0.1), (0.2, 0.2)]).to_shape_clue(page_idx=0)
+
+    with pytest.raises(ValueError):
+        Polygon([0.1, 0.2, 0.3])
+
+
+def test_polygon__contains_points():
+    # Given
+    polygon = Polygon(L_SHAPE)
+    points = [(0.3, 0.15), (0.15, 0.3), (0.3, 0.3), (0.5, 0.15), (0.15, 0.05)]
+
+    # When
+    inside = polygon.contains_points(points)
+
+    # Then
+    assert inside.tolist() == [True, True, False, False, False]
+
+
+def test_polygon__contains_word_centers(page):
+    # Given
+    page_array = PageArray.from_page(page)
+    bbox = page.line_list[0].bbox
+    polygon = Polygon.from_bbox(bbox)
+    expected = [
+        bbox.x0 < word.bbox.center[0] < bbox.x1
+        and bbox.y0 < word.bbox.center[1] < bbox.y1
+        for line in page.line_list
+        for word in line.words
+    ]
+
+    # When
+    inside = polygon.contains_points(bbox_centers(page_array.word_bbox))
+
+    # Then
+    assert inside.tolist() == expected
+    assert any(expected)
+
+
+def test_polygon__intersection_area():
+    # Given
+    polygon = Polygon(L_SHAPE)
+
+    # Then
+    assert polygon.intersection_area(
+        BBox(x0=0.0, y0=0.0, x1=1.0, y1=1.0)
+    ) == pytest.approx(polygon.area)
+    assert polygon.intersection_area(
+        BBox(x0=0.15, y0=0.15, x1=0.3, y1=0.3)
+    ) == pytest.approx(0.05 * 0.15 + 0.05 * 0.1)
+    assert polygon.intersection_area(BBox(x0=0.25, y0=0.25, x1=0.5, y1=0.5)) == 0
+
+
+def test_polygon__intersects():
+    # Given
+    polygon = Polygon(L_SHAPE)
+    boxes = np.array(
+        [
+            [0.3, 0.12, 0.35, 0.18],
+            [0.25, 0.25, 0.5, 0.5],
+            [0.6, 0.6, 0.7, 0.7],
+            [0.0, 0.0, 0.15, 0.15],
+        ]
+    )
+
+    # When
+    intersects = polygon.intersects(boxes)
+
+    # Then
+    assert intersects.tolist() == [True, False, False, True]
+
+
+def test_polygon__intersects_matches_clipping():
+    # Given boxes crossing, touching, containing and inside the polygon
+    polygon = Polygon(L_SHAPE)
+    rng = np.random.default_rng(0)
+    corners = np.round(rng.uniform(0, 0.5, (500, 2, 2)), 1)
+    boxes = np.concatenate((corners.min(axis=1), corners.max(axis=1)), axis=1)
+
+    # When
+    intersects = polygon.intersects(boxes)
+
+    # Then, where the clipping is not within rounding errors of 0
+    areas = [
+        (
+            polygon.intersection_area(BBox.construct(x0=x0, y0=y0, x1=x1, y1=y1))
+            if x0 < x1 and y0 < y1
+            else 0.0
+        )
+        for x0, y0, x1, y1 in boxes.tolist()
+    ]
+    clear = [area == 0 or area > 1e-12 for area in areas]
+    expected = [area > 0 for area in areas]
+    assert intersects[clear].tolist() == np.array(expected)[clear].tolist()
+    assert any(expected) and not all(expected)
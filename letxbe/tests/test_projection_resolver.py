@@ -0,0 +1,95 @@
+import pytest
+
+from letxbe.projection_resolver import ProjectionResolver
+from letxbe.type.clue import PageClue, ProjectionClue, WordClue
+from letxbe.type.label import LabelPrediction
+from letxbe.type.projection import ProjectionRoot
+
+
+@pytest.fixture
+def projections():
+    return {
+        "people": [
+            ProjectionRoot.parse_obj(
+                {
+                    "xid": "bohr",
+                    "result": {
+                        "name": {"value": "Niels Bohr"},
+                        "born": {"value": 1885},
+                        "address": {"result": {"cities": [{"value": "Copenhagen"}]}},
+                    },
+                }
+            ),
+            ProjectionRoot.parse_obj(
+                {"xid": "bohr", "result": {"name": {"value": "Duplicate"}}}
+            ),
+        ],
+        "places": [ProjectionRoot.parse_obj({"xid": "bohr", "result": {}})],
+    }
+
+
+def _clue(xid="bohr", projection_entry="name", pkey="people", **kwargs):
+    return ProjectionClue(
+        pkey=pkey, xid=xid, projection_entry=projection_entry, **kwargs
+    )
+
+
+def test_projection_resolver__resolve(projections):
+    # Given
+    resolver = ProjectionResolver(projections)
+
+    # Then
+    assert len(resolver) == 2
+    assert resolver.root("people", "bohr") is projections["people"][0]
+
+    resolved = resolver.resolve(_clue(token_idx=6, length=4))
+    assert resolved.field.value == "Niels Bohr"
+    assert resolved.token == "Bohr"
+    assert resolver.resolve(_clue()).token == "Niels Bohr"
+    assert resolver.resolve(_clue(projection_entry="born")).token == 1885
+    city = resolver.resolve(_clue(projection_entry="address.cities[0]"))
+    assert city.token == "Copenhagen"
+
+
+@pytest.mark.parametrize(
+    "clue",
+    [
+        _clue(pkey="animals"),
+        _clue(xid="einstein"),
+        _clue(pkey="places"),
+        _clue(projection_entry="address"),
+    ],
+)
+def test_projection_resolver__unresolved(projections, clue):
+    # Given
+    resolver = ProjectionResolver(projections)
+
+    # Then
+    with pytest.raises(KeyError):
+        resolver.resolve(clue)
+
+
+def test_projection_resolver__resolve_many(projections):
+    # Given a label with clues of several types
+    label = LabelPrediction(
+        value="Niels Bohr",
+        clues=[
+            PageClue(page_idx=0),
+            _clue(),
+            WordClue(page_idx=0, line_idx=0, word_idx=1),
+            _clue(xid="einstein"),
+            _clue(projection_entry="born"),
+        ],
+    )
+    resolver = ProjectionResolver(projections)
+
+    # When
+    resolved = resolver.resolve_many(label.clues)
+
+    # Then entries are aligned with the clues
+    assert len(resolved) == len(label.clues)
+    assert [entry is None for entry in resolved] == [True, False, True, True, False]
+    assert resolved[1].clue is label.clues[1]
+    assert resolved[1].token == "Niels Bohr"
+    assert resolved[4].clue is label.clues[4]
+    assert resolved[4].token == 1885
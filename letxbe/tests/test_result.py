@@ -0,0 +1,66 @@
+import pytest
+
+from letxbe.result import field_of, iter_labels, join_path
+from letxbe.type.label import Current, Prediction, PredictionResultType
+
+
+def test_iter_labels(prediction_dict):
+    # Given
+    prediction = Prediction(**prediction_dict)
+
+    # When
+    labels = list(iter_labels(prediction.result))
+
+    # Then
+    assert [path for path, _ in labels] == [
+        "prenom",
+        "date",
+        "clients[0].client_1",
+        "clients[0].client_2",
+        "externe.fournisseurs.fournisseur_1",
+    ]
+    assert labels[2][1].value == "QWE123"
+
+
+def test_iter_labels__table(current_dict):
+    # Given
+    current = Current(**current_dict)
+    current.result.__root__["table"] = [[current.result.__root__["prenom"]]]
+
+    # When
+    paths = [path for path, _ in iter_labels(current.result)]
+
+    # Then
+    assert paths[-1] == "table[0][0]"
+
+
+def test_iter_labels__deep_result():
+    # Given
+    result = PredictionResultType(__root__={"leaf": {"value": 0}})
+    for _ in range(5000):
+        result = PredictionResultType.construct(__root__={"node": result})
+
+    # When
+    labels = list(iter_labels(result))
+
+    # Then
+    assert len(labels) == 1
+    assert labels[0][0].endswith("node.leaf")
+
+
+@pytest.mark.parametrize(
+    "path, field",
+    [
+        ("prenom", "prenom"),
+        ("first names[1]", "first names"),
+        ("clients[0].client_1", "clients.client_1"),
+        ("tables[0][3]", "tables"),
+    ],
+)
+def test_field_of(path, field):
+    assert field_of(path) == field
+
+
+def test_join_path():
+    assert join_path(None, "a") == "a"
+    assert join_path("a[0]", "b") == "a[0].b"
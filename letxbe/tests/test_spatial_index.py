@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from letxbe.geometry import contain_matrix, x_overlap_matrix, y_overlap_matrix
+from letxbe.spatial_index import SpatialIndex
+from letxbe.type.clue import WordClue
+from letxbe.type.page import BBox
+
+
+@pytest.fixture
+def random_index():
+    rng = np.random.default_rng(0)
+    corners = rng.uniform(0, 1, size=(2000, 2))
+    sizes = rng.uniform(0, 0.05, size=(2000, 2))
+    boxes = np.column_stack((corners, np.minimum(corners + sizes, 1)))
+    positions = np.column_stack((np.repeat([0, 3], 1000), np.arange(2000)))
+    return SpatialIndex(boxes, positions)
+
+
+def test_spatial_index__same_as_brute_force(random_index):
+    # Given
+    query = (0.2, 0.3, 0.45, 0.5)
+    on_page = random_index.positions[:, 0] == 3
+    boxes = random_index.boxes[on_page]
+
+    # When
+    intersecting = random_index.intersecting(query, page_idx=3)
+    contained = random_index.contained_in(BBox.from_tuple(query), page_idx=3)
+    overlapping = random_index.overlapping(query, page_idx=3, threshold=0.5)
+
+    # Then
+    assert random_index.grid_size > 1
+    expected = (
+        (boxes[:, 0] <= 0.45)
+        & (boxes[:, 2] >= 0.2)
+        & (boxes[:, 1] <= 0.5)
+        & (boxes[:, 3] >= 0.3)
+    )
+    assert intersecting.tolist() == random_index.positions[on_page][expected].tolist()
+    expected = contain_matrix([query], boxes)[0]
+    assert contained.tolist() == random_index.positions[on_page][expected].tolist()
+    expected = (
+        x_overlap_matrix([query], boxes, 0.5) & y_overlap_matrix([query], boxes, 0.5)
+    )[0]
+    assert overlapping.tolist() == random_index.positions[on_page][expected].tolist()
+    assert len(random_index.intersecting(query, page_idx=1)) == 0
+
+
+def test_spatial_index__nearest(random_index):
+    # Given
+    boxes = random_index.boxes[:1000]
+    dx = np.maximum(np.maximum(boxes[:, 0] - 0.5, 0), 0.5 - boxes[:, 2])
+    dy = np.maximum(np.maximum(boxes[:, 1] - 0.1, 0), 0.1 - boxes[:, 3])
+    expected = np.sort(np.hypot(dx, dy))[:5]
+
+    # When
+    hits, distances = random_index.nearest(0.5, 0.1, page_idx=0, k=5)
+
+    # Then
+    assert np.allclose(distances, expected)
+    assert (hits[:, 0] == 0).all()
+    assert len(random_index.nearest(0.5, 0.1, page_idx=0, k=5000)[0]) == 1000
+
+
+def test_spatial_index__words(page):
+    # Given
+    index = SpatialIndex.words([page])
+
+    # When
+    hits = index.contained_in((0.2, 0.15, 0.6, 0.3), page_idx=0)
+    clues = index.to_word_clues(hits)
+
+    # Then
+    assert hits.tolist() == [[0, 1, 1], [0, 1, 2]]
+    assert clues[0] == WordClue(
+        page_idx=0, line_idx=1, word_idx=1, bbox=page.line_list[1].words[1].bbox
+    )
+    assert index.containing(0.3, 0.12, page_idx=0).tolist() == [[0, 0, 1]]
+
+
+def test_spatial_index__lines(page):
+    # Given
+    index = SpatialIndex.lines([page])
+
+    # When
+    hits, distances = index.nearest(0.9, 0.22, page_idx=0)
+
+    # Then
+    assert hits.tolist() == [[0, 1]]
+    assert np.allclose(distances, [0.2])
+    with pytest.raises(ValueError):
+        index.to_word_clues(hits)
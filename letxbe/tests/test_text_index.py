@@ -0,0 +1,104 @@
+from unittest.mock import patch
+
+import pytest
+
+from letxbe.text_index import TextIndex, normalize_token, tokenize
+from letxbe.type.clue import WordClue
+from letxbe.type.page import Page
+
+
+@pytest.fixture
+def pages(page_dict):
+    second_page = Page(**page_dict).copy(update={"page_idx": 1})
+    return [Page(**page_dict), second_page]
+
+
+def test_normalize_token():
+    assert normalize_token("Société,") == "societe"
+    assert normalize_token("—") == ""
+    assert normalize_token("1,234.50.") == "1,234.50"
+    assert normalize_token("1234.50") != normalize_token("123450")
+    assert tokenize(" 7  October, 1885 ") == ["7", "october", "1885"]
+
+
+def test_text_index__phrase(pages):
+    # Given
+    index = TextIndex.from_pages(pages)
+
+    # When
+    spans = index.find("october 1885")
+    clues = index.search("7 OCTOBER")
+
+    # Then
+    assert spans == [(4, 6), (10, 12)]
+    assert len(clues) == 2
+    assert clues[1] == [
+        WordClue(
+            page_idx=1, line_idx=1, word_idx=1, bbox=pages[1].line_list[1].words[1].bbox
+        ),
+        WordClue(
+            page_idx=1, line_idx=1, word_idx=2, bbox=pages[1].line_list[1].words[2].bbox
+        ),
+    ]
+    # words of the same phrase must be on the same page
+    assert index.find("1885 niels") == []
+    assert index.find("bohr born") == [(1, 3), (7, 9)]
+
+
+def test_text_index__prefix(pages):
+    # Given
+    index = TextIndex.from_pages(pages)
+
+    # Then
+    assert index.tokens_with_prefix("Oct") == ["october"]
+    assert index.find("born 7 oct", prefix=True) == [(2, 5), (8, 11)]
+    assert index.find("born 7 nov", prefix=True) == []
+
+
+def test_text_index__similar_tokens(pages):
+    # Given
+    index = TextIndex.from_pages(pages, ngram_size=3)
+
+    # When
+    similar = index.similar_tokens("Octobre", min_similarity=0.4)
+
+    # Then
+    assert [token for token, _ in similar] == ["october"]
+    with pytest.raises(ValueError):
+        TextIndex.from_pages(pages).similar_tokens("octobre")
+
+
+def test_text_index__save_and_load(pages, tmp_path):
+    # Given
+    index = TextIndex.from_pages(pages, ngram_size=3)
+    path = str(tmp_path / "index.npz")
+
+    # When
+    index.save(path)
+    loaded = TextIndex.load(path)
+
+    # Then
+    assert loaded.vocabulary == index.vocabulary
+    assert loaded.ngram_size == 3
+    assert loaded.search("niels bohr") == index.search("niels bohr")
+
+
+def test_text_index__load_without_rebuilding(pages, tmp_path):
+    # Given a path without the `.npz` extension
+    index = TextIndex.from_pages(pages, ngram_size=3)
+    path = str(tmp_path / "index")
+
+    # When
+    index.save(path)
+    with patch.object(TextIndex, "__init__", side_effect=AssertionError):
+        loaded = TextIndex.load(path)
+
+    # Then
+    assert sorted(tmp_path.iterdir()) == [tmp_path / "index"]
+    assert loaded.vocabulary == index.vocabulary
+    assert loaded.tokens.to_list() == index.tokens.to_list()
+    assert loaded.postings("bohr").tolist() == index.postings("bohr").tolist()
+    assert loaded.similar_tokens("octobre", 0.4) == index.similar_tokens("octobre", 0.4)
+    assert loaded.search("7 oct", prefix=True) == index.search("7 oct", prefix=True)
+    TextIndex.from_pages(pages).save(path)
+    assert TextIndex.load(path).ngram_size is None
@@ -0,0 +1,146 @@
+import numpy as np
+import pytest
+
+from letxbe.page_array import PageArray
+from letxbe.transform import (
+    clip_boxes,
+    deskew_boxes,
+    deskew_page_array,
+    deskew_words,
+    from_pixels,
+    rotate_page_boxes,
+    skew_boxes,
+    to_pixels,
+)
+from letxbe.type.page import ImageProperties
+
+
+@pytest.fixture
+def boxes():
+    return np.array([[0.1, 0.2, 0.3, 0.25], [0.4, 0.4, 0.6, 0.45]])
+
+
+def test_to_pixels__round_trip(boxes):
+    # When
+    pixels = to_pixels(boxes, [1000, 2000])
+
+    # Then
+    np.testing.assert_allclose(pixels[0], [100, 400, 300, 500])
+    np.testing.assert_allclose(from_pixels(pixels, [1000, 2000]), boxes)
+
+
+def test_clip_boxes():
+    np.testing.assert_allclose(
+        clip_boxes([[-0.1, 0.2, 1.2, 0.5]]), [[0.0, 0.2, 1.0, 0.5]]
+    )
+
+
+def test_rotate_page_boxes__quarter_turn():
+    # Given a square page and a box on the right of its center
+    boxes = [[0.7, 0.45, 0.8, 0.55]]
+
+    # When rotating counter-clockwise as displayed
+    rotated = rotate_page_boxes(boxes, 90, [100, 100])
+
+    # Then the box is above the center, with the same size
+    np.testing.assert_allclose(rotated, [[0.45, 0.2, 0.55, 0.3]], atol=1e-12)
+
+
+def test_rotate_page_boxes__quarter_turn_swaps_sizes():
+    # Given a box wider than high on the right of the center of the page
+    boxes = [[0.7, 0.45, 0.9, 0.5]]
+
+    # When
+    rotated = rotate_page_boxes(boxes, 90, [100, 100])
+    restored = rotate_page_boxes(rotated, -90, [100, 100])
+
+    # Then the box is above the center, higher than wide
+    np.testing.assert_allclose(rotated, [[0.45, 0.1, 0.5, 0.3]], atol=1e-12)
+    np.testing.assert_allclose(restored, boxes, atol=1e-12)
+
+
+def test_deskew_boxes__inverse(boxes):
+    # Given
+    image_properties = ImageProperties(size=[1000, 2000], rotation=10)
+
+    # When
+    deskewed = deskew_boxes(boxes, image_properties)
+
+    # Then
+    assert not np.allclose(deskewed, boxes)
+    np.testing.assert_allclose(skew_boxes(deskewed, image_properties), boxes)
+    np.testing.assert_allclose(
+        deskewed[:, 2:] - deskewed[:, :2], boxes[:, 2:] - boxes[:, :2]
+    )
+
+
+def test_deskew_boxes__preserve_angles():
+    # Given two boxes aligned along a line at 30 degrees in pixels
+    size = [400, 200]
+    angle = np.radians(30)
+    centers = np.array([[100.0, 150.0], [100 + 100 * np.cos(angle), 0.0]])
+    centers[1, 1] = 150 - 100 * np.sin(angle)
+    pixels = np.hstack((centers - 5, centers + 5))
+    image_properties = ImageProperties(size=size, rotation=30)
+
+    # When
+    deskewed = to_pixels(
+        deskew_boxes(from_pixels(pixels, size), image_properties), size
+    )
+
+    # Then the boxes are on the same horizontal line
+    assert deskewed[0, 1] == pytest.approx(deskewed[1, 1])
+
+
+def test_deskew_page_array(page):
+    # Given
+    page_array = PageArray.from_page(page)
+    page_array.image_properties = ImageProperties(size=[1000, 2000], rotation=5)
+
+    # When
+    clipped = deskew_page_array(page_array)
+    deskewed = deskew_page_array(page_array, clip=False)
+    twice = deskew_page_array(deskewed, clip=False)
+    restored = deskew_page_array(deskewed, inverse=True, clip=False, rotation=5)
+
+    # Then
+    assert ((clipped.word_bbox >= 0) & (clipped.word_bbox <= 1)).all()
+    assert deskewed.word_captions is page_array.word_captions
+    assert not np.allclose(deskewed.word_bbox, page_array.word_bbox)
+    assert deskewed.image_properties.rotation == 0
+    assert page_array.image_properties.rotation == 5
+    np.testing.assert_array_equal(twice.word_bbox, deskewed.word_bbox)
+    np.testing.assert_array_equal(twice.line_bbox, deskewed.line_bbox)
+    np.testing.assert_allclose(restored.word_bbox, page_array.word_bbox)
+    np.testing.assert_allclose(restored.line_bbox, page_array.line_bbox)
+    assert restored.image_properties == page_array.image_properties
+
+
+def test_deskew_words__lines_without_rotation_unchanged(page):
+    # Given
+    page_array = PageArray.from_page(page)
+    rotated_line = page_array.word_line_idx == 1
+
+    # When
+    deskewed = deskew_words(page_array)
+
+    # Then
+    np.testing.assert_allclose(
+        deskewed[~rotated_line], page_array.word_bbox[~rotated_line]
+    )
+    assert not np.allclose(deskewed[rotated_line], page_array.word_bbox[rotated_line])
+    page_array.word_bbox = deskewed
+    np.testing.assert_allclose(
+        deskew_words(page_array, inverse=True), PageArray.from_page(page).word_bbox
+    )
+
+
+def test_deskew_page_array__inverse_without_rotation(page):
+    # Given
+    page_array = PageArray.from_page(page)
+    page_array.image_properties = ImageProperties(size=[1000, 2000], rotation=5)
+    deskewed = deskew_page_array(page_array)
+
+    # When / Then
+    with pytest.raises(ValueError):
+        deskew_page_array(deskewed, inverse=True)
@@ -1,4 +1,15 @@
-from letxbe.utils import generate_short_unique_id
+import os
+
+import pytest
+
+from letxbe.type.label import LabelPrediction
+from letxbe.utils import (
+    ALPHABET,
+    ShortUniqueIdGenerator,
+    generate_short_unique_id,
+    generate_short_unique_ids,
+    unique_lids,
+)
 
 
 def test_generate_short_unique_id():
@@ -8,3 +19,66 @@ def test_generate_short_unique_id():
     # Then
     assert isinstance(short_id, str)
     assert len(short_id) == 12
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_generate_short_unique_id__fork():
+    # Given ids already drawn in the parent
+    generate_short_unique_id()
+    read_fd, write_fd = os.pipe()
+
+    # When
+    pid = os.fork()
+    if pid == 0:
+        try:
+            ids = [generate_short_unique_id() for _ in range(100)]
+            os.write(write_fd, "".join(ids).encode())
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as reader:
+        text = reader.read()
+    os.waitpid(pid, 0)
+    parent_ids = {generate_short_unique_id() for _ in range(100)}
+
+    # Then
+    child_ids = {text[i : i + 12] for i in range(0, len(text), 12)}
+    assert len(child_ids) == 100
+    assert not child_ids & parent_ids
+
+
+def test_generate_short_unique_ids():
+    # When
+    ids = generate_short_unique_ids(10000, exclude=["aaaaaaaaaaaa"])
+
+    # Then
+    assert len(set(ids)) == 10000
+    assert "aaaaaaaaaaaa" not in ids
+    assert all(len(short_id) == 12 for short_id in ids)
+    assert set("".join(ids)) <= set(ALPHABET)
+
+
+def test_short_unique_id_generator():
+    # Given
+    generator = ShortUniqueIdGenerator(exclude=["aaaaaaaaaaaa"], batch_size=10)
+
+    # When
+    ids = [generator() for _ in range(25)] + generator.generate(100)
+
+    # Then
+    assert len(set(ids)) == 125
+    assert generator.issued == set(ids) | {"aaaaaaaaaaaa"}
+
+
+def test_unique_lids():
+    # Given
+    generator = ShortUniqueIdGenerator()
+
+    # When
+    with unique_lids(generator):
+        labels = [LabelPrediction(value=i) for i in range(10)]
+    outside = LabelPrediction(value=0)
+
+    # Then
+    assert {label.lid for label in labels} == generator.issued
+    assert outside.lid not in generator.issued
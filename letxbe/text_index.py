@@ -0,0 +1,356 @@
+"""
+
+Inverted index over the word captions of the pages of a document.
+
+Each word is reduced to a single normalized token, see `normalize_token`. Words
+whose token is empty, e.g. punctuation, are left out, so that phrases match across
+them. The index keeps, for every token of the vocabulary, the sorted positions of
+the words holding it in the sequence of indexed words, stored as sorted arrays.
+
+Phrases are matched on consecutive indexed words of the same page, and returned as
+`WordClue` objects with their `BBox`. With `ngram_size`, tokens can also be searched
+approximately, see `TextIndex.similar_tokens`.
+
+"""
+
+import bisect
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from letxbe.page_array import PageArray, StringTable, array_to_bboxes, stack_words
+from letxbe.type.clue import WordClue
+from letxbe.type.page import Page
+
+# decimal separators are kept between digits, so that "1234.50" and "123450" differ
+_DECIMAL_SEPARATOR = re.compile(r"(?<=\d)[.,](?=\d)")
+
+
+def normalize_token(text: str) -> str:
+    """Normalize a word for search: case-folded, without diacritics, and made of
+    letters and digits only, and of the decimal separators between digits.
+
+    Example:
+        normalize_token("Société,") == "societe"
+        normalize_token("1234.50,") == "1234.50"
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(
+        char
+        for position, char in enumerate(decomposed)
+        if char.isalnum() or _DECIMAL_SEPARATOR.match(decomposed, position)
+    )
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a text on whitespaces into normalized tokens, dropping empty ones."""
+    tokens = (normalize_token(part) for part in text.split())
+    return [token for token in tokens if token]
+
+
+def _ngrams(token: str, size: int) -> List[str]:
+    """Distinct character n-grams of a token padded with spaces."""
+    padded = f" {token} "
+    return list(
+        dict.fromkeys(padded[i : i + size] for i in range(len(padded) - size + 1))
+    )
+
+
+def _group(keys: np.ndarray, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Group row indexes by key, as a sorted array of rows and `count + 1` offsets."""
+    rows = np.argsort(keys, kind="stable").astype(np.intp)
+    offsets = np.zeros(count + 1, dtype=np.intp)
+    np.cumsum(np.bincount(keys, minlength=count), out=offsets[1:])
+    return rows, offsets
+
+
+class TextIndex:
+    """Inverted index of words, see the module documentation.
+
+    Attributes:
+        positions (np.ndarray): `(N, 3)` (page_idx, line_idx, word_idx) of the
+            indexed words, where `page_idx` is `Page.page_idx`.
+        boxes (np.ndarray): `(N, 4)` boxes of the indexed words.
+        tokens (StringTable): Token of each indexed word.
+        vocabulary (List[str]): Sorted distinct tokens.
+        ngram_size (int, optional): Size of the character n-grams indexed for
+            approximate search, None if not indexed.
+    """
+
+    def __init__(
+        self,
+        positions: npt.ArrayLike,
+        boxes: npt.ArrayLike,
+        tokens: Union[Sequence[str], StringTable],
+        ngram_size: Optional[int] = None,
+    ):
+        """
+        Args:
+            positions (ArrayLike): `(N, 3)` positions of the words, in reading order.
+            boxes (ArrayLike): `(N, 4)` boxes of the words.
+            tokens (Sequence[str] or StringTable): Non-empty normalized token of
+                each word.
+            ngram_size (int, optional): Size of the character n-grams to index.
+        """
+        self.positions = np.asarray(positions, dtype=np.intp).reshape(-1, 3)
+        self.boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+        self.tokens = (
+            tokens
+            if isinstance(tokens, StringTable)
+            else StringTable.from_strings(tokens)
+        )
+        self.ngram_size = ngram_size
+
+        vocabulary, token_ids = np.unique(
+            np.array(self.tokens.to_list(), dtype=object), return_inverse=True
+        )
+        self.vocabulary: List[str] = list(vocabulary.tolist())
+        self.__token_ids: Dict[str, int] = {
+            token: i for i, token in enumerate(self.vocabulary)
+        }
+        self.__postings, self.__posting_offsets = _group(
+            token_ids.astype(np.intp), len(self.vocabulary)
+        )
+
+        self.__ngram_ids: Dict[str, int] = {}
+        if ngram_size is not None:
+            gram_keys: List[int] = []
+            gram_tokens: List[int] = []
+            self.__ngram_counts = np.zeros(len(self.vocabulary), dtype=np.intp)
+            for token_id, token in enumerate(self.vocabulary):
+                grams = _ngrams(token, ngram_size)
+                self.__ngram_counts[token_id] = len(grams)
+                for gram in grams:
+                    gram_keys.append(
+                        self.__ngram_ids.setdefault(gram, len(self.__ngram_ids))
+                    )
+                    gram_tokens.append(token_id)
+            rows, self.__ngram_offsets = _group(
+                np.array(gram_keys, dtype=np.intp), len(self.__ngram_ids)
+            )
+            self.__ngram_tokens = np.array(gram_tokens, dtype=np.intp)[rows]
+
+    @classmethod
+    def from_pages(
+        cls, pages: Sequence[Union[Page, PageArray]], ngram_size: Optional[int] = None
+    ) -> "TextIndex":
+        """Index the words of a document, in one pass over the words.
+
+        Args:
+            pages (Sequence[Page or PageArray]): Pages of the document.
+            ngram_size (int, optional): Size of the character n-grams to index for
+                approximate search, e.g. 3.
+
+        Returns:
+            TextIndex: The index.
+        """
+        page_arrays = [
+            page if isinstance(page, PageArray) else PageArray.from_page(page)
+            for page in pages
+        ]
+        boxes, positions = stack_words(page_arrays)
+        page_idx = np.array([page.page_idx for page in page_arrays], dtype=np.intp)
+        positions[:, 0] = page_idx[positions[:, 0]]
+
+        tokens = [
+            normalize_token(caption)
+            for page in page_arrays
+            for caption in page.word_captions
+        ]
+        kept = np.array([bool(token) for token in tokens], dtype=bool)
+        return cls(
+            positions[kept],
+            boxes[kept],
+            [token for token in tokens if token],
+            ngram_size,
+        )
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def postings(self, token: str) -> np.ndarray:
+        """Sorted rows of the words holding an already normalized token."""
+        token_id = self.__token_ids.get(token)
+        if token_id is None:
+            return np.empty(0, dtype=np.intp)
+        start, end = self.__posting_offsets[token_id : token_id + 2]
+        rows: np.ndarray = self.__postings[start:end]
+        return rows
+
+    def tokens_with_prefix(self, prefix: str) -> List[str]:
+        """Tokens of the vocabulary starting with the normalized `prefix`."""
+        prefix = normalize_token(prefix)
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        end = start
+        while end < len(self.vocabulary) and self.vocabulary[end].startswith(prefix):
+            end += 1
+        return self.vocabulary[start:end]
+
+    def similar_tokens(
+        self, token: str, min_similarity: float = 0.5
+    ) -> List[Tuple[str, float]]:
+        """Tokens of the vocabulary sharing character n-grams with `token`.
+
+        The similarity is the Dice coefficient of the sets of n-grams, from 0 to 1.
+
+        Args:
+            token (str): Token to search, normalized with `normalize_token`.
+            min_similarity (float): Minimum similarity of the returned tokens.
+
+        Returns:
+            List[Tuple[str, float]]: Tokens and similarities, the most similar first.
+
+        Raises:
+            ValueError: N-grams are not indexed.
+        """
+        if self.ngram_size is None:
+            raise ValueError("N-grams are not indexed, see `ngram_size`.")
+        grams = _ngrams(normalize_token(token), self.ngram_size)
+        matches = [
+            self.__ngram_tokens[self.__ngram_offsets[i] : self.__ngram_offsets[i + 1]]
+            for i in (self.__ngram_ids.get(gram) for gram in grams)
+            if i is not None
+        ]
+        if not matches:
+            return []
+
+        shared = np.bincount(np.concatenate(matches), minlength=len(self.vocabulary))
+        candidates = np.flatnonzero(shared)
+        similarity = (
+            2 * shared[candidates] / (len(grams) + self.__ngram_counts[candidates])
+        )
+        order = np.argsort(-similarity, kind="stable")
+        return [
+            (self.vocabulary[candidates[i]], float(similarity[i]))
+            for i in order
+            if similarity[i] >= min_similarity
+        ]
+
+    def find(self, phrase: str, prefix: bool = False) -> List[Tuple[int, int]]:
+        """Find the spans of consecutive words of a page matching a phrase.
+
+        Args:
+            phrase (str): Words separated by whitespaces, normalized with `tokenize`.
+            prefix (bool): If True, the last word of the phrase matches any token it
+                is a prefix of.
+
+        Returns:
+            List[Tuple[int, int]]: `(start, stop)` rows of each matching span, in
+            reading order.
+        """
+        tokens = tokenize(phrase)
+        if not tokens:
+            return []
+
+        def _rows(index: int) -> np.ndarray:
+            if not (prefix and index == len(tokens) - 1):
+                return self.postings(tokens[index])
+            postings = [self.postings(t) for t in self.tokens_with_prefix(tokens[-1])]
+            if not postings:
+                return np.empty(0, dtype=np.intp)
+            return np.sort(np.concatenate(postings))
+
+        starts = _rows(0)
+        for index in range(1, len(tokens)):
+            starts = starts[np.isin(starts + index, _rows(index), assume_unique=True)]
+
+        stops = starts + len(tokens)
+        pages = self.positions[:, 0]
+        same_page = pages[starts] == pages[stops - 1]
+        return list(zip(starts[same_page].tolist(), stops[same_page].tolist()))
+
+    def span_clues(self, start: int, stop: int) -> List[WordClue]:
+        """`WordClue` objects, with their `bbox`, of the words of a span."""
+        return [
+            WordClue.construct(
+                page_idx=page_idx, line_idx=line_idx, word_idx=word_idx, bbox=bbox
+            )
+            for (page_idx, line_idx, word_idx), bbox in zip(
+                self.positions[start:stop].tolist(),
+                array_to_bboxes(self.boxes[start:stop]),
+            )
+        ]
+
+    def search(self, phrase: str, prefix: bool = False) -> List[List[WordClue]]:
+        """Find the words matching a phrase, see `TextIndex.find`.
+
+        Returns:
+            List[List[WordClue]]: Clues of the words of each matching span.
+        """
+        return [
+            self.span_clues(start, stop) for start, stop in self.find(phrase, prefix)
+        ]
+
+    def save(self, path: str) -> None:
+        """Save the index, with its built tables, in a NumPy `.npz` file.
+
+        Args:
+            path (str): Path of the file, written as is, even without the `.npz`
+                extension.
+        """
+        vocabulary = StringTable.from_strings(self.vocabulary)
+        arrays: Dict[str, Any] = {
+            "positions": self.positions,
+            "boxes": self.boxes,
+            "tokens_text": np.array(self.tokens.text),
+            "tokens_offsets": self.tokens.offsets,
+            "ngram_size": np.array(-1 if self.ngram_size is None else self.ngram_size),
+            "vocabulary_text": np.array(vocabulary.text),
+            "vocabulary_offsets": vocabulary.offsets,
+            "postings": self.__postings,
+            "posting_offsets": self.__posting_offsets,
+        }
+        if self.ngram_size is not None:
+            ngrams = StringTable.from_strings(self.__ngram_ids)
+            arrays.update(
+                ngrams_text=np.array(ngrams.text),
+                ngrams_offsets=ngrams.offsets,
+                ngram_offsets=self.__ngram_offsets,
+                ngram_tokens=self.__ngram_tokens,
+                ngram_counts=self.__ngram_counts,
+            )
+        # through a file object, so that numpy does not append `.npz` to the path
+        with open(path, "wb") as file:
+            np.savez(file, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "TextIndex":
+        """Load an index saved with `TextIndex.save`, without rebuilding its
+        tables.
+
+        Args:
+            path (str): Path of the file.
+
+        Returns:
+            TextIndex: The index.
+        """
+        with np.load(path, allow_pickle=False) as arrays:
+            ngram_size = int(arrays["ngram_size"])
+            index = cls.__new__(cls)
+            index.positions = arrays["positions"]
+            index.boxes = arrays["boxes"]
+            index.tokens = StringTable(
+                str(arrays["tokens_text"]), arrays["tokens_offsets"]
+            )
+            index.ngram_size = None if ngram_size < 0 else ngram_size
+
+            index.vocabulary = StringTable(
+                str(arrays["vocabulary_text"]), arrays["vocabulary_offsets"]
+            ).to_list()
+            index.__token_ids = {token: i for i, token in enumerate(index.vocabulary)}
+            index.__postings = arrays["postings"]
+            index.__posting_offsets = arrays["posting_offsets"]
+
+            index.__ngram_ids = {}
+            if index.ngram_size is not None:
+                ngrams = StringTable(
+                    str(arrays["ngrams_text"]), arrays["ngrams_offsets"]
+                )
+                index.__ngram_ids = {gram: i for i, gram in enumerate(ngrams)}
+                index.__ngram_offsets = arrays["ngram_offsets"]
+                index.__ngram_tokens = arrays["ngram_tokens"]
+                index.__ngram_counts = arrays["ngram_counts"]
+        return index
@@ -0,0 +1,228 @@
+"""
+
+Vectorized transforms of the boxes of a page: rotation, scaling to pixels and
+clipping, each with its inverse.
+
+Boxes are `(N, 4)` arrays (x0, y0, x1, y1), see `letxbe.geometry`, normalized to
+`BBOX_SCALE` unless stated otherwise. Pixel boxes are scaled by
+`ImageProperties.size`, (width, height).
+
+Angles are in degrees counter-clockwise as displayed, as `ImageProperties.rotation`
+and `Line.rotation`, with the y axis pointing down. A box is rotated by rotating its
+center, keeping its width and height, swapped when the angle is closer to a quarter
+turn than to a half turn, so that a rotation followed by the opposite rotation gives
+back the same boxes. Rotations are computed in pixels when the size
+of the image is known, so that angles are preserved.
+
+Clipping to `[0, BBOX_SCALE]` is not reversible: boxes moved out of the page by a
+rotation only come back unchanged when they are not clipped.
+
+"""
+
+import copy
+from typing import Optional, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from letxbe.geometry import as_boxes
+from letxbe.page_array import PageArray
+from letxbe.type.page import BBOX_SCALE, ImageProperties
+
+
+def _scale(size: Sequence[int]) -> np.ndarray:
+    width, height = size
+    return np.array([width, height, width, height], dtype=float) / BBOX_SCALE
+
+
+def to_pixels(boxes: npt.ArrayLike, size: Sequence[int]) -> np.ndarray:
+    """Scale normalized boxes to pixels.
+
+    Args:
+        boxes (ArrayLike): `(N, 4)` normalized boxes.
+        size (Sequence[int]): (width, height) of the image, see
+            `ImageProperties.size`.
+    """
+    pixels: np.ndarray = as_boxes(boxes) * _scale(size)
+    return pixels
+
+
+def from_pixels(
+    boxes: npt.ArrayLike, size: Sequence[int], clip: bool = True
+) -> np.ndarray:
+    """Scale pixel boxes back to `BBOX_SCALE`, inverse of `to_pixels`.
+
+    Args:
+        boxes (ArrayLike): `(N, 4)` pixel boxes.
+        size (Sequence[int]): (width, height) of the image.
+        clip (bool): If True, clip the boxes to the page, see `clip_boxes`.
+    """
+    normalized: np.ndarray = as_boxes(boxes) / _scale(size)
+    return clip_boxes(normalized) if clip else normalized
+
+
+def clip_boxes(boxes: npt.ArrayLike) -> np.ndarray:
+    """Clip boxes to `[0, BBOX_SCALE]`, the range accepted by `BBox`."""
+    clipped: np.ndarray = np.clip(as_boxes(boxes), 0, BBOX_SCALE)
+    return clipped
+
+
+def rotate_boxes(
+    boxes: npt.ArrayLike, angle: npt.ArrayLike, origin: npt.ArrayLike
+) -> np.ndarray:
+    """Rotate boxes around an origin, see the module documentation.
+
+    Args:
+        boxes (ArrayLike): `(N, 4)` boxes, with the same unit on both axes.
+        angle (ArrayLike): Angle in degrees, or `(N,)` angles, one per box.
+        origin (ArrayLike): (x, y) center of the rotation, or `(N, 2)` centers.
+
+    Returns:
+        np.ndarray: `(N, 4)` rotated boxes. The inverse is the rotation by `-angle`.
+    """
+    array = as_boxes(boxes)
+    radians = np.radians(np.asarray(angle, dtype=float))
+    cos, sin = np.cos(radians), np.sin(radians)
+    center = np.asarray(origin, dtype=float)
+
+    half_sizes = (array[:, 2:] - array[:, :2]) / 2
+    shifted = (array[:, :2] + half_sizes) - center
+    # counter-clockwise as displayed, with the y axis pointing down
+    rotated = np.column_stack(
+        (
+            shifted[:, 0] * cos + shifted[:, 1] * sin,
+            shifted[:, 1] * cos - shifted[:, 0] * sin,
+        )
+    )
+    rotated += center
+    quarter_turn = np.round(radians / (np.pi / 2)) % 2 == 1
+    half_sizes = np.where(quarter_turn[..., None], half_sizes[:, ::-1], half_sizes)
+    return np.hstack((rotated - half_sizes, rotated + half_sizes))
+
+
+def rotate_page_boxes(
+    boxes: npt.ArrayLike,
+    angle: npt.ArrayLike,
+    size: Optional[Sequence[int]] = None,
+    origin: Optional[npt.ArrayLike] = None,
+    clip: bool = True,
+) -> np.ndarray:
+    """Rotate normalized boxes, in pixels if the size of the image is given.
+
+    Args:
+        boxes (ArrayLike): `(N, 4)` normalized boxes.
+        angle (ArrayLike): Angle in degrees, or `(N,)` angles.
+        size (Sequence[int], optional): (width, height) of the image.
+        origin (ArrayLike, optional): Normalized (x, y) center of the rotation, or
+            `(N, 2)` centers. Defaults to the center of the page.
+        clip (bool): If True, clip the boxes to the page.
+
+    Returns:
+        np.ndarray: `(N, 4)` normalized boxes.
+    """
+    scale = np.ones(4) if size is None else _scale(size)
+    center = np.full(2, BBOX_SCALE / 2) if origin is None else np.asarray(origin, float)
+    rotated = rotate_boxes(as_boxes(boxes) * scale, angle, center * scale[:2]) / scale
+    return clip_boxes(rotated) if clip else rotated
+
+
+def deskew_boxes(
+    boxes: npt.ArrayLike, image_properties: ImageProperties, clip: bool = True
+) -> np.ndarray:
+    """Undo `ImageProperties.rotation`, rotating boxes around the center of the page
+    into the frame of the text.
+
+    Args:
+        boxes (ArrayLike): `(N, 4)` normalized boxes of the page.
+        image_properties (ImageProperties): Properties of the page image.
+        clip (bool): If True, clip the boxes to the page.
+    """
+    return rotate_page_boxes(
+        boxes, -image_properties.rotation, image_properties.size, clip=clip
+    )
+
+
+def skew_boxes(
+    boxes: npt.ArrayLike, image_properties: ImageProperties, clip: bool = True
+) -> np.ndarray:
+    """Apply `ImageProperties.rotation`, inverse of `deskew_boxes`."""
+    return rotate_page_boxes(
+        boxes, image_properties.rotation, image_properties.size, clip=clip
+    )
+
+
+def deskew_words(
+    page_array: PageArray, inverse: bool = False, clip: bool = True
+) -> np.ndarray:
+    """Undo `Line.rotation` on the words of each line, rotating them around the
+    center of their line. Words of lines without rotation are unchanged.
+
+    Args:
+        page_array (PageArray): The page.
+        inverse (bool): If True, apply the rotations of the lines instead.
+        clip (bool): If True, clip the boxes to the page.
+
+    Returns:
+        np.ndarray: `(W, 4)` normalized boxes of the words.
+    """
+    line_idx = page_array.word_line_idx
+    angles = np.nan_to_num(page_array.line_rotation[line_idx])
+    line_bbox = page_array.line_bbox[line_idx]
+    centers = (line_bbox[:, :2] + line_bbox[:, 2:]) / 2
+    size = (
+        None
+        if page_array.image_properties is None
+        else page_array.image_properties.size
+    )
+    return rotate_page_boxes(
+        page_array.word_bbox,
+        angles if inverse else -angles,
+        size,
+        origin=centers,
+        clip=clip,
+    )
+
+
+def deskew_page_array(
+    page_array: PageArray,
+    inverse: bool = False,
+    clip: bool = True,
+    rotation: Optional[float] = None,
+) -> PageArray:
+    """Undo `ImageProperties.rotation` on all the lines and words of a page at once.
+
+    The rotation of the image of the copy is set to 0, so that deskewing it again
+    does nothing, and set back to `rotation` by the inverse.
+
+    Args:
+        page_array (PageArray): The page, unchanged.
+        inverse (bool): If True, apply the rotation to a deskewed page instead.
+        clip (bool): If True, clip the boxes to the page.
+        rotation (float, optional): Rotation of the image, `ImageProperties.rotation`
+            by default. Required by the inverse, as a deskewed page has no rotation.
+
+    Returns:
+        PageArray: A copy of the page with the new boxes and image properties,
+        sharing the other arrays.
+
+    Raises:
+        ValueError: If `inverse` is set without `rotation`.
+    """
+    if inverse and rotation is None:
+        raise ValueError("The inverse of a deskew needs the original rotation.")
+    result = copy.copy(page_array)
+    properties = page_array.image_properties
+    if rotation is None:
+        rotation = properties.rotation if properties is not None else 0.0
+    if properties is None or not rotation:
+        return result
+
+    boxes = np.vstack((page_array.line_bbox, page_array.word_bbox))
+    angle = rotation if inverse else -rotation
+    rotated = rotate_page_boxes(boxes, angle, properties.size, clip=clip)
+    result.image_properties = properties.copy(
+        update={"rotation": rotation if inverse else 0.0}
+    )
+    result.line_bbox = rotated[: page_array.line_count]
+    result.word_bbox = rotated[page_array.line_count :]
+    return result
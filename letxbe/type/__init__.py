@@ -5,12 +5,13 @@ from .artefact import Artefact
 from .document import Form, ParentDocument
 from .enum import ClientEnv
 from .label import Feedback, Prediction
+from .lazy_page import LazyPages
 from .page import BBox, ImageFormat, Page
 from .projection import ProjectionRoot
 from .target import Document, Target
 from .upload import Metadata
 
-SaverArgType = Union[List[Page], List[ProjectionRoot], Prediction, bytes]
+SaverArgType = Union[List[Page], LazyPages, List[ProjectionRoot], Prediction, bytes]
 
 __all__ = [
     "Artefact",
@@ -24,6 +25,7 @@ __all__ = [
     "ParentDocument",
     "Document",
     "Page",
+    "LazyPages",
     "BBox",
     "ImageFormat",
     "ProjectionRoot",
@@ -1,5 +1,5 @@
 import re
-from typing import Any, Union
+from typing import Any, Iterator, List, Optional, Tuple, Union
 
 from pydantic import BaseModel, StrictBool, StrictFloat, StrictInt, StrictStr, validator
 
@@ -25,6 +25,65 @@ def assert_type_and_value_equality(value_1: ValueType, value_2: ValueType) -> No
     assert value_1 == value_2
 
 
+def value_key(value: Optional[ValueType]) -> Tuple[bool, Optional[ValueType]]:
+    """Hashable key of a value, such that two values share the same key if and only if
+    they pass `assert_type_and_value_equality`, e.g. `True` and `1` have different keys.
+
+    Args:
+        value (ValueType, optional):
+
+    Returns:
+        Tuple[bool, ValueType or None]: Key usable in sets and dict indexes.
+    """
+    return isinstance(value, bool), value
+
+
+def join_path(path: Optional[str], key: str) -> str:
+    """Append a key to a label path.
+
+    Args:
+        path (str, optional): Path of the parent, None at the root of a result.
+        key (str): Key of the child.
+
+    Returns:
+        str: Path of the child.
+    """
+    return key if path is None else f"{path}.{key}"
+
+
+def iter_nodes(result: Any) -> Iterator[Tuple[Optional[str], Any]]:
+    """Iterate over every node of a result tree, depth first and in key order.
+
+    Lists and models whose `__root__` is a dict are walked into. The tree is walked
+    with an explicit stack, so deep results do not hit the recursion limit, and a
+    node is yielded before its children are read, so that it can be modified in
+    place.
+
+    Args:
+        result (Any): `Prediction.result`, `Feedback.result` or `Current.result`.
+
+    Yields:
+        Tuple[str or None, Any]: Path of the node, see `letxbe.result`, None for the
+        root, and the node itself.
+    """
+    stack: List[Tuple[Optional[str], Any]] = [(None, result)]
+    while stack:
+        path, node = stack.pop()
+        yield path, node
+        if isinstance(node, list):
+            stack.extend(
+                (f"{path}[{index}]", element)
+                for index, element in reversed(list(enumerate(node)))
+            )
+        elif isinstance(node, BaseModel):
+            root = getattr(node, "__root__", None)
+            if isinstance(root, dict):
+                stack.extend(
+                    (join_path(path, key), child)
+                    for key, child in reversed(list(root.items()))
+                )
+
+
 slug_regex = re.compile(r"[a-zA-Z\-0-9]+")
 low_key_regex = re.compile(r"[a-zA-Z\_0-9]+")
 
@@ -1,12 +1,12 @@
 from enum import Enum
-from typing import Dict, List, Literal, Optional, Union
+from typing import Any, Dict, Iterator, List, Literal, Optional, Set, Tuple, Union
 
 from pydantic import BaseModel, Field
 
 from letxbe.type.clue import ClueType
 from letxbe.utils import generate_short_unique_id
 
-from .base import ValueType
+from .base import ValueType, iter_nodes, value_key
 from .enum import FeedbackVote
 
 
@@ -49,6 +49,116 @@ class Label(BaseModel):
         smart_union = True
 
 
+def find_duplicate_values(labels: List[Label]) -> List[int]:
+    """Find the labels of a multiple-value field whose value is already held by a
+    previous label, see `assert_type_and_value_equality`. Values are compared with a
+    hash index, in linear time.
+
+    Args:
+        labels (List[Label]): Labels of a multiple-value field.
+
+    Returns:
+        List[int]: Indexes of the duplicate labels.
+    """
+    seen = set()
+    duplicates = []
+    for index, label in enumerate(labels):
+        key = value_key(label.value)
+        if key in seen:
+            duplicates.append(index)
+        else:
+            seen.add(key)
+    return duplicates
+
+
+def iter_label_lists(result: Any) -> Iterator[Tuple[str, List[Label]]]:
+    """Iterate over the multiple-value fields of a result tree, in the order of
+    `letxbe.result.iter_labels`.
+
+    Args:
+        result (Any): `Prediction.result`, `Feedback.result` or `Current.result`.
+
+    Yields:
+        Tuple[str, List[Label]]: Path of the field and its list of labels, which
+        can be modified in place.
+    """
+    for path, node in iter_nodes(result):
+        if (
+            isinstance(node, list)
+            and node
+            and all(isinstance(element, Label) for element in node)
+        ):
+            yield str(path), node
+
+
+class UniqueValuesMixin:
+    """Check the values of the multiple-value fields of a `result`, see
+    `assert_type_and_value_equality`."""
+
+    result: Any
+
+    def _check_duplicate(self, path: str, kept: Label, duplicate: Label) -> None:
+        """Called before dropping a label whose value is held by a previous one.
+
+        Raises:
+            ValueError: The duplicate cannot be dropped.
+        """
+
+    def duplicate_values(self) -> Dict[str, List[Optional[ValueType]]]:
+        """Find the values held by several labels of the same multiple-value field.
+
+        Returns:
+            Dict[str, List[ValueType]]: Duplicate values per path of field, see
+            `letxbe.result.iter_labels` for the path format.
+        """
+        duplicates = {}
+        for path, labels in iter_label_lists(self.result):
+            indexes = find_duplicate_values(labels)
+            if indexes:
+                duplicates[path] = [labels[index].value for index in indexes]
+        return duplicates
+
+    def assert_unique_values(self) -> None:
+        """Validate that there is only one `Label` with the same `value` in each
+        multiple-value field.
+
+        Raises:
+            ValueError: A multiple-value field holds several labels with the same value.
+        """
+        duplicates = self.duplicate_values()
+        if duplicates:
+            raise ValueError(
+                "Multiple-value fields hold several labels with the same value: "
+                f"{duplicates}"
+            )
+
+    def drop_duplicate_values(self) -> int:
+        """Remove, in place, the labels whose value is already held by a previous
+        label of the same multiple-value field.
+
+        Returns:
+            int: Number of removed labels.
+        """
+        # every duplicate is checked before any list is modified
+        to_drop: List[Tuple[List[Label], Set[int]]] = []
+        for path, labels in iter_label_lists(self.result):
+            indexes = find_duplicate_values(labels)
+            if not indexes:
+                continue
+            kept: Dict[Tuple[bool, Optional[ValueType]], Label] = {}
+            for label in labels:
+                kept.setdefault(value_key(label.value), label)
+            for index in indexes:
+                self._check_duplicate(
+                    path, kept[value_key(labels[index].value)], labels[index]
+                )
+            to_drop.append((labels, set(indexes)))
+
+        for labels, dropped in to_drop:
+            labels[:] = [label for i, label in enumerate(labels) if i not in dropped]
+        return sum(len(dropped) for _, dropped in to_drop)
+
+
 class LabelFeedback(Label):
     """
     Feedback on a label value. See ``Feedback`` for more information.
@@ -188,7 +298,7 @@ class PredictionResultType(BaseModel):
 PredictionResultType.update_forward_refs()
 
 
-class Prediction(BaseModel):
+class Prediction(UniqueValuesMixin, BaseModel):
     """
     AI-models prediction attached to a ``Target`` document.
 
@@ -297,7 +407,7 @@ class FeedbackResultType(BaseModel):
 FeedbackResultType.update_forward_refs()
 
 
-class Feedback(BaseModel):
+class Feedback(UniqueValuesMixin, BaseModel):
     """
     Contain aggregated confirmations, deletions or modifications for a ``Prediction`` values.
 
@@ -343,3 +453,11 @@ class Feedback(BaseModel):
     result: FeedbackResultType = (
         FeedbackResultType()
     )  # may be a list for type multi-class
+
+    def _check_duplicate(self, path: str, kept: Label, duplicate: Label) -> None:
+        """Votes on the same value must agree, so that none is silently lost."""
+        if getattr(kept, "vote", None) != getattr(duplicate, "vote", None):
+            raise ValueError(
+                f"Conflicting votes on value {duplicate.value!r} of '{path}': "
+                f"{getattr(kept, 'vote', None)} and {getattr(duplicate, 'vote', None)}"
+            )
@@ -0,0 +1,95 @@
+"""
+Sequence of `Page` objects loaded on first access.
+
+Example:
+    pages of a long document stored in a `letxbe.page_store.PageStore`, of which
+    only the pages referenced by clues are read
+"""
+
+from collections import OrderedDict
+from typing import Callable, Iterator, List, Optional, Sequence, Union, overload
+
+from .page import Page
+
+
+class LazyPages(Sequence[Page]):
+    """Read-only list of pages, loaded when accessed.
+
+    Loaded pages are kept in a bounded cache, from which the least recently used
+    pages are evicted. Use it where a `List[Page]` is only read.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[int], Page],
+        length: int,
+        max_cached: int = 16,
+        page_indexes: Optional[Sequence[int]] = None,
+    ):
+        """
+        Args:
+            load (Callable[[int], Page]): Load the page at a position, from 0 to
+                `length - 1`.
+            length (int): Number of pages.
+            max_cached (int): Maximum number of pages kept in memory.
+            page_indexes (Sequence[int], optional): `Page.page_idx` of the page at
+                each position, when known without loading the pages.
+        """
+        self.__load = load
+        self.__length = length
+        self.max_cached = max_cached
+        self.page_indexes = None if page_indexes is None else list(page_indexes)
+        self.__cache: "OrderedDict[int, Page]" = OrderedDict()
+
+    @classmethod
+    def from_files(cls, paths: Sequence[str], max_cached: int = 16) -> "LazyPages":
+        """Pages stored as JSON files, one per page, validated when loaded.
+
+        Args:
+            paths (Sequence[str]): Path of the file of each page.
+            max_cached (int): Maximum number of pages kept in memory.
+        """
+        path_list = list(paths)
+        return cls(
+            lambda position: Page.parse_file(path_list[position]),
+            len(path_list),
+            max_cached,
+        )
+
+    def __len__(self) -> int:
+        return self.__length
+
+    @overload
+    def __getitem__(self, index: int) -> Page: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Page]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Page, List[Page]]:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+
+        if not -len(self) <= index < len(self):
+            raise IndexError("Page index out of range.")
+        index %= len(self)
+
+        page = self.__cache.get(index)
+        if page is None:
+            page = self.__load(index)
+            self.__cache[index] = page
+            if len(self.__cache) > self.max_cached:
+                self.__cache.popitem(last=False)
+        else:
+            self.__cache.move_to_end(index)
+        return page
+
+    def __iter__(self) -> Iterator[Page]:
+        return (self[position] for position in range(len(self)))
+
+    def __repr__(self) -> str:
+        return f"LazyPages(length={len(self)}, cached={list(self.__cache)})"
+
+    @property
+    def cached(self) -> List[int]:
+        """Positions of the pages in memory, from the least recently used."""
+        return list(self.__cache)
@@ -1,6 +1,8 @@
-from typing import Any, Dict, List, Optional, Union
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from pydantic import BaseModel, root_validator
+from pydantic import BaseModel, PrivateAttr, root_validator
 
 from letxbe.type.base import ValueType
 
@@ -11,7 +13,7 @@ class __ProjectionBase(BaseModel):
 
     Related to:
 
-    Projection: Uses `Projection.calculate_projection_entry` to set projection_entry.
+    Projection: Uses `ProjectionRoot.calculate_projection_entry` to set projection_entry.
 
     Prediction: Use `projection_entry` to associate a ProjectionMap to a prediction using a ProjectionClue.
     Use `extract_remaining_projection_structure_from_entry_point` in flow.service.projection to find ProjectionMap based on projection_entry stored in a clue.
@@ -61,6 +63,69 @@ ProjectionMapValueType = Union[
 ProjectionMap.update_forward_refs()
 
 
+ProjectionNodeType = Union[ProjectionMap, ProjectionField]
+
+_lazy_projection_entries: ContextVar[bool] = ContextVar(
+    "_lazy_projection_entries", default=False
+)
+
+
+@contextmanager
+def lazy_projection_entries() -> Iterator[None]:
+    """Do not calculate `projection_entry` when creating `ProjectionRoot` objects,
+    but on the first access to their `result` or `projection_index`, or when they
+    are serialized with `dict` or `json`.
+
+    Example:
+
+        ::
+
+            with lazy_projection_entries():
+                roots = parse_obj_as(List[ProjectionRoot], rows)
+    """
+    token = _lazy_projection_entries.set(True)
+    try:
+        yield
+    finally:
+        _lazy_projection_entries.reset(token)
+
+
+def index_projection_entries(
+    projection_map_result: Dict[str, ProjectionMapValueType],
+) -> Dict[str, ProjectionNodeType]:
+    """Set `projection_entry` of every element of a `ProjectionMap.result`, at any
+    depth, and index the elements by it.
+
+    The structure is walked iteratively, so that its size and depth are not limited
+    by the recursion limit.
+    """
+    index: Dict[str, ProjectionNodeType] = {}
+    stack: List[Tuple[Dict[str, ProjectionMapValueType], str]] = [
+        (projection_map_result, "")
+    ]
+    while stack:
+        result, prefix = stack.pop()
+        for key, projection in result.items():
+            location = prefix + key
+            pairs: Iterable[Tuple[str, ProjectionNodeType]]
+            if isinstance(projection, list):
+                pairs = zip(
+                    [f"{location}[{position}]" for position in range(len(projection))],
+                    projection,
+                )
+            else:
+                pairs = ((location, projection),)
+
+            for entry, element in pairs:
+                # same as an assignment, without the checks of `BaseModel.__setattr__`
+                element.__dict__["projection_entry"] = entry
+                element.__fields_set__.add("projection_entry")
+                index[entry] = element
+                if isinstance(element, ProjectionMap):
+                    stack.append((element.result, entry + "."))
+    return index
+
+
 class ProjectionRoot(ProjectionMap):
     """
     Defines the content of Target or Artefact that corresponds to a line in a table or flat JSON form.
@@ -77,35 +142,51 @@ class ProjectionRoot(ProjectionMap):
 
     xid: str
 
-    @root_validator
-    def calculate_projection_entry(cls: Any, values: Dict) -> Dict:
-        """
-        Calculate `projection_entry` recursively for ProjectionMaps in object.result.
+    _projection_index: Optional[Dict[str, ProjectionNodeType]] = PrivateAttr(None)
+
+    def __init__(self, **data: Any):
+        super().__init__(**data)
+        if not _lazy_projection_entries.get():
+            self.calculate_projection_entry()
+
+    def __getattribute__(self, name: str) -> Any:
+        # `result` of a lazy root, see `lazy_projection_entries`
+        if (
+            name == "result"
+            and object.__getattribute__(self, "_projection_index") is None
+        ):
+            object.__getattribute__(self, "calculate_projection_entry")()
+        return super().__getattribute__(name)
+
+    def calculate_projection_entry(self) -> Dict[str, ProjectionNodeType]:
         """
+        Calculate `projection_entry` for the elements of `result`, and index them.
 
-        def _recurse(
-            projection_map_result: Dict[str, ProjectionMapValueType],
-            projection_location: Optional[str],
-        ) -> None:
-            for key, projection in projection_map_result.items():
-                if isinstance(projection, list):
-                    for index, element in enumerate(projection):
-                        if projection_location is None:
-                            location = f"{key}[{index}]"
-                        else:
-                            location = f"{projection_location}.{key}[{index}]"
-                        element.projection_entry = location
-                        if isinstance(element, ProjectionMap):
-                            _recurse(element.result, location)
-                else:
-                    if projection_location is None:
-                        location = f"{key}"
-                    else:
-                        location = f"{projection_location}.{key}"
-                    projection.projection_entry = location
-                    if isinstance(projection, ProjectionMap):
-                        _recurse(projection.result, location)
-
-        _recurse(values.get("result", {}), None)
+        Call it again after modifying `result`.
+        """
+        self._projection_index = index_projection_entries(self.__dict__["result"])
+        return self._projection_index
 
-        return values
+    @property
+    def projection_index(self) -> Dict[str, ProjectionNodeType]:
+        """
+        Elements of `result` by `projection_entry`, calculated on first access.
+        """
+        if self._projection_index is None:
+            return self.calculate_projection_entry()
+        return self._projection_index
+
+    def dict(self, **kwargs: Any) -> Dict[str, Any]:
+        # serialize the entries of a lazy root
+        self.projection_index
+        return super().dict(**kwargs)
+
+    def json(self, **kwargs: Any) -> str:
+        self.projection_index
+        return super().json(**kwargs)
+
+    def copy(self, **kwargs: Any) -> "ProjectionRoot":
+        projection_root = super().copy(**kwargs)
+        # the elements of the copy may be new objects
+        projection_root._projection_index = None
+        return projection_root
@@ -1,7 +1,12 @@
 import pytest
 from pydantic import ValidationError, parse_obj_as
 
-from letxbe.type.base import CreatedMixin, ValueType, assert_type_and_value_equality
+from letxbe.type.base import (
+    CreatedMixin,
+    ValueType,
+    assert_type_and_value_equality,
+    value_key,
+)
 
 
 @pytest.mark.parametrize("value", [True, False])
@@ -63,3 +68,19 @@ def test_read_created_at_and_updated_at():
     dated_1 = CreatedMixin(created_at=1)
 
     assert dated_1.created_at == 1
+
+
+@pytest.mark.parametrize(
+    "value_1,value_2,equal",
+    [
+        ("test", "test", True),
+        (1, 1.0, True),
+        (True, True, True),
+        (True, 1, False),
+        (0, False, False),
+        ("1", 1, False),
+    ],
+)
+def test_value_key(value_1, value_2, equal):
+    assert (value_key(value_1) == value_key(value_2)) is equal
+    assert len({value_key(value_1), value_key(value_2)}) == (1 if equal else 2)
@@ -1,6 +1,7 @@
 import pytest
 from pydantic import ValidationError
 
+from letxbe.type.enum import FeedbackVote
 from letxbe.type.label import (
     Current,
     CurrentResultType,
@@ -256,3 +257,67 @@ def test_prediction__has_no_enum_values():
             }
         },
     }
+
+
+def test_prediction__duplicate_values():
+    # Given
+    prediction = Prediction(
+        result={
+            "name": LabelPrediction(value="Bohr"),
+            "ids": [
+                LabelPrediction(value=1),
+                LabelPrediction(value=True),
+                LabelPrediction(value=1),
+            ],
+            "table": [
+                {"names": [LabelPrediction(value="a"), LabelPrediction(value="a")]}
+            ],
+        }
+    )
+
+    # Then
+    assert prediction.duplicate_values() == {"ids": [1], "table[0].names": ["a"]}
+    with pytest.raises(ValueError):
+        prediction.assert_unique_values()
+
+    # When
+    removed = prediction.drop_duplicate_values()
+
+    # Then
+    assert removed == 2
+    assert [label.value for label in prediction.result.__root__["ids"]] == [1, True]
+    assert len(prediction.result.__root__["table"][0].__root__["names"]) == 1
+    prediction.assert_unique_values()
+
+
+def test_feedback__unique_values(feedback_dict):
+    feedback = Feedback(**feedback_dict)
+
+    assert feedback.duplicate_values() == {}
+    assert feedback.drop_duplicate_values() == 0
+
+
+def test_feedback__drop_duplicate_values():
+    # Given
+    feedback = Feedback(
+        result={
+            "names": [
+                LabelFeedback(value="Bohr", vote=FeedbackVote.VALID),
+                LabelFeedback(value="Bohr", vote=FeedbackVote.VALID),
+            ]
+        }
+    )
+    conflicting = Feedback(
+        result={
+            "names": [
+                LabelFeedback(value="Bohr", vote=FeedbackVote.VALID),
+                LabelFeedback(value="Bohr", vote=FeedbackVote.INVALID),
+            ]
+        }
+    )
+
+    # Then
+    assert feedback.drop_duplicate_values() == 1
+    with pytest.raises(ValueError):
+        conflicting.drop_duplicate_values()
+    assert len(conflicting.result.__root__["names"]) == 2
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from letxbe.type.lazy_page import LazyPages
+from letxbe.type.page import Page
+
+
+def test_lazy_pages(page_dict):
+    # Given
+    loaded = []
+
+    def _load(position):
+        loaded.append(position)
+        return Page(**dict(page_dict, page_idx=position))
+
+    pages = LazyPages(_load, 5, max_cached=2)
+
+    # When
+    first = pages[0]
+    _ = pages[-1], pages[0], pages[2], pages[0]
+
+    # Then
+    assert len(pages) == 5
+    assert first.page_idx == 0
+    assert loaded == [0, 4, 2]
+    assert pages.cached == [2, 0]
+    assert [page.page_idx for page in pages[1:3]] == [1, 2]
+    assert [page.page_idx for page in pages] == [0, 1, 2, 3, 4]
+    with pytest.raises(IndexError):
+        _ = pages[5]
+
+
+def test_lazy_pages__from_files(page_dict, tmp_path):
+    # Given
+    path = tmp_path / "page.json"
+    path.write_text(json.dumps(page_dict))
+
+    # When
+    pages = LazyPages.from_files([str(path)])
+
+    # Then
+    assert list(pages) == [Page(**page_dict)]
@@ -0,0 +1,130 @@
+import sys
+
+import pytest
+
+from letxbe.type.projection import (
+    ProjectionField,
+    ProjectionMap,
+    ProjectionRoot,
+    lazy_projection_entries,
+)
+
+
+@pytest.fixture
+def projection_root_dict():
+    return {
+        "xid": "row-0",
+        "result": {
+            "name": {"value": "Niels Bohr"},
+            "prizes": [{"value": "Nobel"}, {"value": "Copley"}],
+            "address": {
+                "result": {
+                    "city": {"value": "Copenhagen"},
+                    "lines": [{"result": {"street": {"value": "Blegdamsvej"}}}],
+                }
+            },
+        },
+    }
+
+
+def test_projection_root__projection_entry(projection_root_dict):
+    # When
+    root = ProjectionRoot.parse_obj(projection_root_dict)
+
+    # Then
+    assert root.result["name"].projection_entry == "name"
+    assert root.result["prizes"][1].projection_entry == "prizes[1]"
+    address = root.result["address"]
+    assert address.projection_entry == "address"
+    assert address.result["lines"][0].projection_entry == "address.lines[0]"
+    street = address.result["lines"][0].result["street"]
+    assert street.projection_entry == "address.lines[0].street"
+
+    assert sorted(root.projection_index) == [
+        "address",
+        "address.city",
+        "address.lines[0]",
+        "address.lines[0].street",
+        "name",
+        "prizes[0]",
+        "prizes[1]",
+    ]
+    for entry, element in root.projection_index.items():
+        assert element.projection_entry == entry
+    assert root.projection_index["address.lines[0].street"] is street
+
+
+def test_projection_root__lazy(projection_root_dict):
+    # When
+    with lazy_projection_entries():
+        root = ProjectionRoot.parse_obj(projection_root_dict)
+
+    # Then
+    assert root._projection_index is None
+    assert root.projection_index["prizes[1]"].value == "Copley"
+    assert root.result["prizes"][1].projection_entry == "prizes[1]"
+    assert ProjectionRoot.parse_obj(projection_root_dict).projection_index
+
+
+def test_projection_root__lazy_result(projection_root_dict):
+    # When
+    with lazy_projection_entries():
+        root = ProjectionRoot.parse_obj(projection_root_dict)
+
+    # Then
+    assert root.result["prizes"][1].projection_entry == "prizes[1]"
+
+
+def test_projection_root__lazy_serialization(projection_root_dict):
+    # Given
+    eager = ProjectionRoot.parse_obj(projection_root_dict)
+
+    # When
+    with lazy_projection_entries():
+        lazy_dict = ProjectionRoot.parse_obj(projection_root_dict).dict()
+        lazy_json = ProjectionRoot.parse_obj(projection_root_dict).json()
+
+    # Then
+    assert lazy_dict == eager.dict()
+    assert lazy_json == eager.json()
+    assert lazy_dict["result"]["address"]["projection_entry"] == "address"
+
+
+def test_projection_root__copy(projection_root_dict):
+    # Given
+    root = ProjectionRoot.parse_obj(projection_root_dict)
+
+    # When
+    copy = root.copy(deep=True)
+
+    # Then
+    assert copy.projection_index["name"] is copy.result["name"]
+    assert copy.projection_index["name"] is not root.result["name"]
+
+
+def test_projection_root__deep_and_wide():
+    # Given a structure deeper than the recursion limit
+    depth = sys.getrecursionlimit() + 10
+    projection_map = ProjectionMap.construct(
+        result={"leaf": ProjectionField.construct(value=1, projection_entry="")},
+        projection_entry="",
+    )
+    for _ in range(depth):
+        projection_map = ProjectionMap.construct(
+            result={"child": projection_map}, projection_entry=""
+        )
+    rows = [
+        ProjectionField.construct(value=index, projection_entry="")
+        for index in range(10000)
+    ]
+    root = ProjectionRoot.construct(
+        xid="sheet", result={"nested": projection_map, "rows": rows}
+    )
+
+    # When
+    index = root.projection_index
+
+    # Then
+    assert len(index) == depth + 2 + len(rows)
+    assert index["rows[9999]"].value == 9999
+    assert "nested" + ".child" * depth + ".leaf" in index
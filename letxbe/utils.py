@@ -1,12 +1,21 @@
 import json
-import random
+import os
 import string
-from typing import cast
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterable, Iterator, List, Optional, Set, cast
 
 from pydantic import BaseModel
 
 ALPHABET = string.ascii_lowercase + string.digits
 
+SHORT_UNIQUE_ID_LENGTH = 12
+
+# random bytes above this limit are rejected, so that every character of `ALPHABET`
+# is drawn with the same probability
+_BYTE_LIMIT = 256 - 256 % len(ALPHABET)
+_BYTE_TO_CHAR = bytes(ALPHABET.encode()[i % len(ALPHABET)] for i in range(256))
+
 
 def pydantic_model_to_json(model: BaseModel) -> dict:
     """Convert any model to a json that can be used as a query parameter for arangodb.
@@ -25,5 +34,141 @@ def pydantic_model_to_json(model: BaseModel) -> dict:
     return cast(dict, json.loads(model.json()))
 
 
+def _random_chars(count: int) -> str:
+    """Draw `count` characters of `ALPHABET` from `os.urandom`."""
+    chars = b""
+    while len(chars) < count:
+        # draw a few more bytes than needed to make up for the rejected ones
+        missing = count - len(chars)
+        raw = os.urandom(missing + missing // 8 + 16)
+        chars += bytes(b for b in raw if b < _BYTE_LIMIT)
+    return chars[:count].translate(_BYTE_TO_CHAR).decode()
+
+
+def generate_short_unique_ids(count: int, exclude: Iterable[str] = ()) -> List[str]:
+    """Generate `count` distinct ids at once, with the format of
+    `generate_short_unique_id`.
+
+    Args:
+        count (int): Number of ids to generate.
+        exclude (Iterable[str]): Ids already in use, e.g. the lids of a document,
+            that are not generated again.
+
+    Returns:
+        List[str]: The generated ids.
+    """
+    issued = set(exclude)
+    ids: List[str] = []
+    while len(ids) < count:
+        missing = count - len(ids)
+        chars = _random_chars(missing * SHORT_UNIQUE_ID_LENGTH)
+        for start in range(0, len(chars), SHORT_UNIQUE_ID_LENGTH):
+            short_id = chars[start : start + SHORT_UNIQUE_ID_LENGTH]
+            if short_id not in issued:
+                issued.add(short_id)
+                ids.append(short_id)
+    return ids
+
+
+class ShortUniqueIdGenerator:
+    """Generator of ids that are unique within a document.
+
+    Ids are drawn from `os.urandom` by batches, and checked against every id
+    issued by the generator. Use one generator per document, e.g. with
+    `unique_lids` while creating the labels of a `Prediction`.
+    """
+
+    def __init__(self, exclude: Iterable[str] = (), batch_size: int = 1024):
+        """
+        Args:
+            exclude (Iterable[str]): Ids already in use in the document.
+            batch_size (int): Number of ids drawn at once.
+        """
+        self.issued: Set[str] = set(exclude)
+        self.batch_size = batch_size
+        self.__batch: List[str] = []
+
+    def __call__(self) -> str:
+        """Generate a new id."""
+        while True:
+            if not self.__batch:
+                self.__batch = generate_short_unique_ids(self.batch_size)
+                self.__batch.reverse()
+            short_id = self.__batch.pop()
+            if short_id not in self.issued:
+                self.issued.add(short_id)
+                return short_id
+
+    def generate(self, count: int) -> List[str]:
+        """Generate `count` new ids at once.
+
+        Args:
+            count (int): Number of ids to generate.
+
+        Returns:
+            List[str]: The generated ids.
+        """
+        ids = generate_short_unique_ids(count, exclude=self.issued)
+        self.issued.update(ids)
+        return ids
+
+
+_id_generator: ContextVar[Optional[Callable[[], str]]] = ContextVar(
+    "_id_generator", default=None
+)
+
+
+@contextmanager
+def unique_lids(
+    generator: Optional[Callable[[], str]] = None,
+) -> Iterator[Callable[[], str]]:
+    """Use `generator` for every id generated with `generate_short_unique_id` in
+    the context, in particular for the default `lid` of labels.
+
+    Example:
+
+        ::
+
+            with unique_lids():
+                prediction = Prediction(result=...)
+
+    Args:
+        generator (Callable[[], str], optional): Id generator, a new
+            `ShortUniqueIdGenerator` by default so that the lids created in the
+            context are distinct.
+
+    Yields:
+        Callable[[], str]: The generator in use.
+    """
+    if generator is None:
+        generator = ShortUniqueIdGenerator()
+    token = _id_generator.set(generator)
+    try:
+        yield generator
+    finally:
+        _id_generator.reset(token)
+
+
+_ID_POOL_SIZE = 1024
+_id_pool: List[str] = []
+# a forked process would otherwise issue the same ids as its parent
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_id_pool.clear)
+
+
 def generate_short_unique_id() -> str:
-    return "".join(random.choices(ALPHABET, k=12))
+    """Generate a random id of `SHORT_UNIQUE_ID_LENGTH` characters of `ALPHABET`.
+
+    Uses the generator set with `unique_lids` if any. Otherwise ids are drawn by
+    batches but not tracked, so that long-running processes do not keep them all.
+    """
+    generator = _id_generator.get()
+    if generator is not None:
+        return generator()
+    try:
+        return _id_pool.pop()
+    except IndexError:
+        ids = generate_short_unique_ids(_ID_POOL_SIZE)
+        short_id = ids.pop()
+        _id_pool.extend(ids)
+        return short_id
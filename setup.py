@@ -7,6 +7,7 @@ requires = [
     "requests",
     "pydantic==1.*",
     "pillow",
+    "numpy",
     "setuptools==63.4.3",  # see https://github.com/python/mypy/issues/13392
 ]
 